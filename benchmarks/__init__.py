@@ -0,0 +1,3 @@
+# import
+from benchmarks.synthetic import synthetic_frame, synthetic_ohlcv
+from benchmarks.suite import CASES, Benchmark, compare, load, save
@@ -0,0 +1,48 @@
+# import
+import argparse
+import sys
+import numpy as np
+from benchmarks.suite import CASES, Benchmark, compare, load, save
+
+
+def main(argv: list or None = None) -> int:
+    """
+    function to run the benchmarks from the command line, e.g.
+    python -m benchmarks --sizes 1e3 1e5 --output results.json --baseline baseline.json --threshold 0.2
+    :param argv: list or None: arguments, None reads sys.argv
+    :return: int: exit code, 1 if a case regressed against the baseline
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog='python -m benchmarks', description='time and memory of the techan entry points on synthetic frames')
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e3, 1e4, 1e5], help='numbers of bars')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=None, help='cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case and size')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic frames')
+    parser.add_argument('--float32', action='store_true', help='float32 frames')
+    parser.add_argument('--no-memory', action='store_true', help='skip the memory profile')
+    parser.add_argument('--output', default=None, help='JSON file of the results')
+    parser.add_argument('--baseline', default=None, help='JSON file of earlier results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown')
+    parser.add_argument('--memory-threshold', type=float, default=None, help='allowed relative growth of the memory')
+    parser.add_argument('--update-baseline', action='store_true', help='write the results to the baseline file')
+    args: argparse.Namespace = parser.parse_args(argv)
+    benchmark: Benchmark = Benchmark([int(size) for size in args.sizes], args.cases, args.repeat, args.seed,
+                                     np.float32 if args.float32 else np.float64, not args.no_memory)
+    results: dict = benchmark.run(verbose=True)
+    if args.output:
+        save(results, args.output)
+    code: int = 0
+    if args.baseline and not args.update_baseline:
+        report = compare(results, load(args.baseline), args.threshold, args.memory_threshold)
+        print(report.to_string(index=False))
+        if report['regression'].any():
+            print('regressions: {}'.format(', '.join(f'{case}/{size}' for case, size in
+                                                     report.loc[report['regression'], ['case', 'size']].values)))
+            code = 1
+    if args.baseline and args.update_baseline:
+        save(results, args.baseline)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
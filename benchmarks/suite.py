@@ -0,0 +1,222 @@
+# import
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import synthetic_frame, synthetic_ohlcv
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.feature.feature_builder import FeatureBuilder
+from techan.indicator.atr import atr
+from techan.indicator.graph import IndicatorGraph
+from techan.indicator.p_change import p_change
+from techan.indicator.time import Time
+from techan.indicator.trend import trend
+from techan.pattern.backtester import Backtester
+from techan.pattern.candle_stick_pattern import CandleStickPattern
+from techan.pattern.pattern_validator import PatternValidator
+from techan.pattern.triple_barrier_labeler import TripleBarrierLabeler
+
+
+def _fresh(frame: CandleStickFrame) -> CandleStickFrame:
+    # a view of all bars shares the columns but none of the caches of the frame (indicators, fingerprint, ...)
+    return frame[0:len(frame)]
+
+
+def _hits(frame: CandleStickFrame) -> tuple:
+    # frame and pattern objects of find, validate marks the objects, so every run searches them again
+    frame = _fresh(frame)
+    return frame, CandleStickPattern(frame).find()
+
+
+def _minutes(frame: CandleStickFrame) -> CandleStickFrame:
+    # Time scales every unit by its maximum, the minutes of hourly bars are all 0
+    return synthetic_frame(len(frame), dtype=frame.dtype, freq='min')
+
+
+# name -> (setup of the frame before every run (not timed), timed function of the setup, largest number of bars)
+# the object based entry points loop over the bars in python and are limited to smaller frames
+CASES: dict = {
+    'frame': (lambda frame: ([list(frame.date_time)] + [column.copy() for column in frame.values], frame.dtype),
+              lambda data: CandleStickFrame(*data[0], dtype=data[1]), 10 ** 7),
+    'atr': (_fresh, lambda frame: atr(frame), 10 ** 7),
+    'p_change': (_fresh, lambda frame: p_change(frame), 10 ** 7),
+    'trend': (_fresh, lambda frame: trend(frame), 10 ** 7),
+    'time': (_minutes, lambda frame: Time(frame, 'YYYY%MM%DD%hh%mm').transform_all(), 10 ** 4),
+    'find_boolean': (_fresh, lambda frame: CandleStickPattern(frame).find(is_boolean=True), 10 ** 5),
+    'find': (_fresh, lambda frame: CandleStickPattern(frame).find(), 10 ** 5),
+    'validate': (_hits, lambda hits: PatternValidator(*hits).validate(), 10 ** 4),
+    'validate_grid': (_hits, lambda hits: PatternValidator(*hits).validate_grid([1.0, 1.618, 2.0]), 10 ** 5),
+    'triple_barrier': (_fresh, lambda frame: TripleBarrierLabeler(frame, max_holding=100).label(), 10 ** 7),
+    'backtest': (lambda frame: (_fresh(frame), CandleStickPattern(frame).find(is_boolean=True)),
+                 lambda hits: Backtester(*hits, max_holding=100).run(), 10 ** 5),
+    'indicators': (_fresh, lambda frame: IndicatorGraph(frame).compute(
+        ['atr', 'macd', 'rsi', 'bollinger_bands', 'keltner', 'stochastic', 'vwap']), 10 ** 7),
+    'feature_builder': (_fresh, lambda frame: FeatureBuilder(
+        frame, ['close', 'body_size', 'cs_body_ratio', 'p_change', ('atr', {}), ('trend', {}), 'hammer']).build(),
+                        10 ** 7),
+}
+
+
+class Benchmark:
+    def __init__(
+            self,
+            sizes: list or None = None,
+            cases: list or None = None,
+            repeat: int = 3,
+            seed: int = 0,
+            dtype: type = np.float64,
+            memory: bool = True
+    ):
+        """
+        time and memory of the public entry points on synthetic frames (see synthetic_ohlcv) of several sizes
+        :param sizes: list or None: numbers of bars, None is 1e3, 1e4 and 1e5 (up to 1e7 is supported), every case runs
+                      on the sizes up to its limit (see CASES)
+        :param cases: list or None: names of CASES, None runs all
+        :param repeat: int: timed runs per case and size, the fastest and the median are reported
+        :param seed: int: seed of the synthetic frames
+        :param dtype: type: dtype of the frames
+        :param memory: bool: measure the peak memory of one extra run with tracemalloc (numpy allocations included)
+        """
+        cases = list(CASES) if cases is None else list(cases)
+        unknown: set = set(cases) - set(CASES)
+        if unknown:
+            raise ValueError("unknown cases {}, choose from {}".format(sorted(unknown), list(CASES)))
+        if repeat < 1:
+            raise ValueError("repeat must be greater than 0")
+        self.sizes: list = sorted(int(size) for size in (sizes or [10 ** 3, 10 ** 4, 10 ** 5]))
+        self.cases: list = cases
+        self.repeat: int = repeat
+        self.seed: int = seed
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.memory: bool = memory
+
+    def __repr__(self):
+        return f'Benchmark(sizes={self.sizes}, cases={self.cases}, repeat={self.repeat}, seed={self.seed})'
+
+    def _meta(self) -> dict:
+        """
+        method to describe the environment of the results
+        :return: dict: settings and versions
+        """
+        return dict(created=datetime.now(timezone.utc).isoformat(timespec='seconds'), python=platform.python_version(),
+                    numpy=np.__version__, pandas=pd.__version__, machine=platform.machine(),
+                    processor=platform.processor(), system=platform.system(), repeat=self.repeat, seed=self.seed,
+                    dtype=str(self.dtype))
+
+    @staticmethod
+    def _peak(setup: callable, function: callable, frame: CandleStickFrame) -> int:
+        """
+        method to measure the peak memory allocated by one run
+        :return: int: bytes
+        """
+        state: any = setup(frame)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            function(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak - start
+
+    def run(self, verbose: bool = False) -> dict:
+        """
+        method to run the cases
+        :param verbose: bool: print every result
+        :return: dict: meta (settings and versions) and results, '<case>/<size>' -> case, size, seconds (fastest run),
+                       median, peak_bytes (or None)
+        """
+        results: dict = dict()
+        for size in self.sizes:
+            cases: list = [name for name in self.cases if size <= CASES[name][2]]
+            if not cases:
+                continue
+            data: dict = synthetic_ohlcv(size, self.seed)
+            frame: CandleStickFrame = CandleStickFrame(data['date_time'], data['open'], data['high'], data['low'],
+                                                       data['close'], data['volume'], data['spread'], dtype=self.dtype)
+            del data
+            for name in cases:
+                setup, function, _ = CASES[name]
+                timings: list = []
+                for _ in range(self.repeat):
+                    state: any = setup(frame)
+                    gc.collect()
+                    begin: float = time.perf_counter()
+                    function(state)
+                    timings.append(time.perf_counter() - begin)
+                    del state
+                peak: int or None = self._peak(setup, function, frame) if self.memory else None
+                results[f'{name}/{size}'] = dict(case=name, size=size, seconds=min(timings),
+                                                 median=statistics.median(timings), peak_bytes=peak)
+                if verbose:
+                    print('{:<16} {:>9} {:>10.4f} s {:>10} MB'.format(
+                        name, size, min(timings), '-' if peak is None else round(peak / 2 ** 20, 1)), flush=True)
+        return dict(meta=self._meta(), results=results)
+
+
+def save(results: dict, path: str) -> None:
+    """
+    function to save the results of Benchmark.run as JSON
+    :param results: dict: results
+    :param path: str: file
+    :return: None
+    """
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+    return None
+
+
+def load(path: str) -> dict:
+    """
+    function to load results saved with save
+    :param path: str: file
+    :return: dict: results
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(
+        results: dict,
+        baseline: dict,
+        threshold: float = 0.2,
+        memory_threshold: float or None = None,
+        min_seconds: float = 1e-3
+) -> pd.DataFrame:
+    """
+    function to compare results with a baseline, a case is a regression if it is more than threshold slower (or uses
+    more than memory_threshold more memory) than in the baseline
+    :param results: dict: results of Benchmark.run
+    :param baseline: dict: results of an earlier run, e.g. of the last release on the same machine
+    :param threshold: float: allowed relative slowdown, 0.2 is 20 %
+    :param memory_threshold: float or None: allowed relative growth of the peak memory, None ignores the memory
+    :param min_seconds: float: cases faster than this in the baseline are too noisy and never regressions
+    :return: pd.DataFrame: case, size, baseline and current seconds / peak_bytes, time and memory ratio, regression of
+                           every case in both results
+    """
+    rows: list = []
+    for key, current in results['results'].items():
+        before: dict or None = baseline['results'].get(key)
+        if before is None:
+            continue
+        time_ratio: float = current['seconds'] / before['seconds'] if before['seconds'] > 0 else np.nan
+        memory_ratio: float = np.nan
+        if current.get('peak_bytes') and before.get('peak_bytes'):
+            memory_ratio = current['peak_bytes'] / before['peak_bytes']
+        regression: bool = before['seconds'] >= min_seconds and time_ratio > 1 + threshold
+        if memory_threshold is not None and memory_ratio > 1 + memory_threshold:
+            regression = True
+        rows.append(dict(case=current['case'], size=current['size'], baseline_seconds=before['seconds'],
+                         seconds=current['seconds'], time_ratio=time_ratio,
+                         baseline_peak_bytes=before.get('peak_bytes'), peak_bytes=current.get('peak_bytes'),
+                         memory_ratio=memory_ratio, regression=regression))
+    columns: list = ['case', 'size', 'baseline_seconds', 'seconds', 'time_ratio', 'baseline_peak_bytes', 'peak_bytes',
+                     'memory_ratio', 'regression']
+    return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,80 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick_frame import CandleStickFrame
+
+
+def synthetic_ohlcv(
+        n: int,
+        seed: int = 0,
+        price: float = 100.0,
+        drift: float = 0.0,
+        volatility: float = 0.2,
+        bars_per_year: int = 24 * 252,
+        steps: int = 4,
+        tick: float or None = 0.01,
+        start: str = '2000-01-01',
+        freq: str = 'h',
+        chunk_size: int = 1 << 20
+) -> dict:
+    """
+    function to generate candle sticks from a geometric brownian motion, every bar is a path of steps prices that
+    starts at the close of the previous bar, its high / low are the extremes of the path
+    :param n: int: number of bars
+    :param seed: int: seed of the random generator, equal seeds give equal bars
+    :param price: float: first open
+    :param drift: float: annual drift of the log prices
+    :param volatility: float: annual volatility of the log prices
+    :param bars_per_year: int: bars per year, scales drift and volatility to one bar
+    :param steps: int: prices per bar
+    :param tick: float or None: tick size the prices are rounded to (rounding keeps open / close within high / low and
+                 produces doji), None keeps the raw prices
+    :param start: str: date_time of the first bar
+    :param freq: str: pandas frequency of the bars
+    :param chunk_size: int: bars generated at once, limits the memory of the paths
+    :return: dict: date_time (list of str 'YYYY-MM-DD hh:mm'), open, high, low, close, volume and spread (np.ndarray)
+    """
+    if n < 1:
+        raise ValueError("n must be greater than 0")
+    if steps < 1:
+        raise ValueError("steps must be greater than 0")
+    rng: np.random.Generator = np.random.default_rng(seed)
+    dt: float = 1 / (bars_per_year * steps)
+    mean: float = (drift - volatility ** 2 / 2) * dt
+    scale: float = volatility * np.sqrt(dt)
+    columns: dict = {name: np.empty(n) for name in ('open', 'high', 'low', 'close')}
+    last: float = np.log(price)
+    for begin in range(0, n, chunk_size):
+        end: int = min(n, begin + chunk_size)
+        paths: np.ndarray = last + np.cumsum(rng.normal(mean, scale, (end - begin) * steps)).reshape(-1, steps)
+        opens: np.ndarray = np.empty(end - begin)
+        opens[0] = last
+        opens[1:] = paths[:-1, -1]
+        columns['open'][begin:end] = opens
+        columns['high'][begin:end] = np.maximum(opens, paths.max(axis=1))
+        columns['low'][begin:end] = np.minimum(opens, paths.min(axis=1))
+        columns['close'][begin:end] = paths[:, -1]
+        last = paths[-1, -1]
+    for name in columns:
+        np.exp(columns[name], out=columns[name])
+        if tick:
+            columns[name] = np.maximum(np.round(columns[name] / tick) * tick, tick)
+    index: np.ndarray = pd.date_range(start, periods=n, freq=freq).to_numpy().astype('datetime64[m]')
+    date_time: list = [value.replace('T', ' ') for value in np.datetime_as_string(index).tolist()]
+    volume: np.ndarray = np.round(rng.lognormal(6.0, 1.0, n))
+    spread: np.ndarray = rng.integers(0, 5, n).astype(np.float64)
+    return dict(date_time=date_time, volume=volume, spread=spread, **columns)
+
+
+def synthetic_frame(n: int, seed: int = 0, dtype: type = np.float64, **kwargs) -> CandleStickFrame:
+    """
+    function to generate a CandleStickFrame of synthetic_ohlcv
+    :param n: int: number of bars
+    :param seed: int: seed of the random generator
+    :param dtype: type: dtype of the frame
+    :param kwargs: any: see synthetic_ohlcv
+    :return: CandleStickFrame: candle sticks
+    """
+    data: dict = synthetic_ohlcv(n, seed, **kwargs)
+    return CandleStickFrame(data['date_time'], data['open'], data['high'], data['low'], data['close'], data['volume'],
+                            data['spread'], dtype=dtype)
@@ -9,7 +9,7 @@ setup(
     url='https://github.com/XO30/techan',
     author='Stefan Siegler',
     author_email='dev@siegler.one',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     classifiers=[
             'Intended Audience :: Data Scientists',
             'Programming Language :: Python',
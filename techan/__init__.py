@@ -1,3 +1,5 @@
 # import
 from techan.core.candle_stick import CandleStick
 from techan.core.candle_stick_frame import CandleStickFrame
+from techan.core.bar_builder import BarBuilder
+from techan.core.candle_stick_panel import CandleStickPanel
@@ -0,0 +1,155 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick import CandleStick
+from techan.core.candle_stick_frame import CandleStickFrame
+
+
+class BarBuilder:
+    def __init__(
+            self,
+            rule: str = 'time',
+            size: str or int or float = '1min',
+            candle_stick_frame: CandleStickFrame or None = None
+    ):
+        """
+        builder that aggregates batches of ticks (trades or quotes) into CandleSticks
+        :param rule: str: 'time', 'tick' or 'volume'
+        :param size: str, int or float: timeframe understood by pd.Timedelta for 'time' (e.g. '1min'),
+                     ticks per bar for 'tick', volume per bar for 'volume'
+        :param candle_stick_frame: CandleStickFrame or None: frame the finished bars are appended to
+        """
+        if rule not in ['time', 'tick', 'volume']:
+            raise ValueError('Invalid rule: rule must be "time", "tick" or "volume"')
+        self.rule: str = rule
+        self.size: int or float = pd.Timedelta(size).value if rule == 'time' else size
+        if self.size <= 0:
+            raise ValueError("size must be positive not {}".format(size))
+        if candle_stick_frame is None:
+            candle_stick_frame = CandleStickFrame([], [], [], [], [])
+        self.candle_stick_frame: CandleStickFrame = candle_stick_frame
+        self._tick_count: int = 0  # ticks consumed so far, clock of the 'tick' rule
+        self._volume_count: float = 0.0  # volume consumed so far, clock of the 'volume' rule
+        self._last_ns: int or None = None
+        self._bar: list or None = None  # open bar: [bar id, start ns, open, high, low, close, volume, spread]
+
+    def __repr__(self):
+        return f'BarBuilder(rule={self.rule}, size={self.size}, open_bar={self._bar})'
+
+    def _bar_ids(self, date_time_ns: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """
+        method to assign every tick of a batch to a bar id of the active rule, ids never decrease
+        :param date_time_ns: np.ndarray: int64 timestamps of the ticks
+        :param volume: np.ndarray: volume of the ticks (nan if unknown)
+        :return: np.ndarray: int64 bar ids
+        """
+        if self.rule == 'time':
+            return date_time_ns // self.size
+        if self.rule == 'tick':
+            return (self._tick_count + np.arange(len(date_time_ns))) // self.size
+        # volume clock: a tick belongs to the bar in which its volume starts
+        volume_before: np.ndarray = self._volume_count + np.cumsum(volume) - volume
+        return np.floor(volume_before / self.size).astype(np.int64)
+
+    def _is_complete(self, bar: list) -> bool:
+        """
+        method to check if the open bar is finished without waiting for the next tick
+        :param bar: list: open bar
+        :return: bool: True if the bar is finished
+        """
+        if self.rule == 'tick':
+            return self._tick_count >= (bar[0] + 1) * self.size
+        if self.rule == 'volume':
+            return self._volume_count >= (bar[0] + 1) * self.size
+        return False
+
+    @staticmethod
+    def _to_candle_stick(bar: list) -> CandleStick:
+        """
+        method to convert a bar to a CandleStick
+        :param bar: list: bar
+        :return: CandleStick: finished candlestick
+        """
+        _, start_ns, open, high, low, close, volume, spread = bar
+        return CandleStick(
+            pd.Timestamp(start_ns),
+            float(open),
+            float(high),
+            float(low),
+            float(close),
+            None if np.isnan(volume) else float(volume),
+            None if np.isnan(spread) else float(spread)
+        )
+
+    def update(
+            self,
+            date_time: list or np.ndarray or pd.Series,
+            price: list or np.ndarray or pd.Series,
+            volume: list or np.ndarray or pd.Series or None = None,
+            spread: list or np.ndarray or pd.Series or None = None
+    ) -> list:
+        """
+        method to consume a batch of ticks, finished bars are appended to the candle_stick_frame
+        :param date_time: list, np.ndarray or pd.Series: sorted timestamps of the ticks
+        :param price: list, np.ndarray or pd.Series: trade or quote prices
+        :param volume: list, np.ndarray, pd.Series or None: traded volume (required for rule 'volume')
+        :param spread: list, np.ndarray, pd.Series or None: quoted spread, a bar keeps the widest one
+        :return: list: finished CandleSticks of this batch
+        """
+        date_time_ns: np.ndarray = pd.to_datetime(np.asarray(date_time)).values.astype('datetime64[ns]').view(np.int64)
+        price: np.ndarray = np.asarray(price, dtype=np.float64)
+        n: int = len(date_time_ns)
+        volume: np.ndarray = np.full(n, np.nan) if volume is None else np.asarray(volume, dtype=np.float64)
+        spread: np.ndarray = np.full(n, np.nan) if spread is None else np.asarray(spread, dtype=np.float64)
+        if not len(price) == len(volume) == len(spread) == n:
+            raise ValueError("date_time, price, volume and spread must be the same length")
+        if n == 0:
+            return []
+        if self.rule == 'volume' and np.isnan(volume).any():
+            raise ValueError("volume is required for rule 'volume'")
+        if np.any(date_time_ns[1:] < date_time_ns[:-1]) or (self._last_ns is not None and date_time_ns[0] < self._last_ns):
+            raise ValueError("ticks must be sorted by date_time")
+        ids: np.ndarray = self._bar_ids(date_time_ns, volume)
+        starts: np.ndarray = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        ends: np.ndarray = np.r_[starts[1:] - 1, n - 1]
+        start_ns: np.ndarray = ids[starts] * self.size if self.rule == 'time' else date_time_ns[starts]
+        bars: list = [list(bar) for bar in zip(
+            ids[starts].tolist(),
+            start_ns.tolist(),
+            price[starts],
+            np.maximum.reduceat(price, starts),
+            np.minimum.reduceat(price, starts),
+            price[ends],
+            np.add.reduceat(volume, starts),
+            np.fmax.reduceat(spread, starts)
+        )]
+        self._tick_count += n
+        self._volume_count += float(np.nansum(volume))
+        self._last_ns = int(date_time_ns[-1])
+        if self._bar is not None:
+            if self._bar[0] == bars[0][0]:
+                open_bar, first = self._bar, bars[0]
+                bars[0] = [open_bar[0], open_bar[1], open_bar[2], max(open_bar[3], first[3]),
+                           min(open_bar[4], first[4]), first[5], open_bar[6] + first[6],
+                           np.fmax(open_bar[7], first[7])]
+            else:
+                bars.insert(0, self._bar)
+        self._bar = bars.pop()
+        if self._is_complete(self._bar):
+            bars.append(self._bar)
+            self._bar = None
+        candle_sticks: list = [self._to_candle_stick(bar) for bar in bars]
+        self.candle_stick_frame.extend(candle_sticks)
+        return candle_sticks
+
+    def flush(self) -> list:
+        """
+        method to finish the open bar, e.g. at the end of a session
+        :return: list: finished CandleSticks
+        """
+        if self._bar is None:
+            return []
+        candle_sticks: list = [self._to_candle_stick(self._bar)]
+        self._bar = None
+        self.candle_stick_frame.extend(candle_sticks)
+        return candle_sticks
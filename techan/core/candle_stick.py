@@ -5,6 +5,8 @@ from datetime import datetime
 
 # noinspection PyPropertyDefinition
 class CandleStick:
+    __slots__ = ('_date_time', '_open', '_high', '_low', '_close', '_volume', '_spread')
+
     def __init__(
             self,
             date_time: str,
@@ -24,6 +26,37 @@ class CandleStick:
         self.spread: int or None = spread
         self._validate_candle()
 
+    @classmethod
+    def _trusted(
+            cls,
+            date_time: str,
+            open: float,
+            high: float,
+            low: float,
+            close: float,
+            volume: int or None = None,
+            spread: int or None = None
+    ):
+        """
+        method to create a candlestick from values that are already validated, e.g. in bulk by CandleStickFrame
+        skips the type and value checks of the setters
+        :return: CandleStick: candlestick
+        """
+        candle_stick: CandleStick = cls.__new__(cls)
+        candle_stick._date_time = date_time
+        candle_stick._open = open
+        candle_stick._high = high
+        candle_stick._low = low
+        candle_stick._close = close
+        candle_stick._volume = volume
+        candle_stick._spread = spread
+        return candle_stick
+
+    def __reduce__(self):
+        # compact pickles, e.g. of cached pattern results, the values were validated when the candlestick was created
+        return CandleStick._trusted, (self._date_time, self._open, self._high, self._low, self._close, self._volume,
+                                      self._spread)
+
     def __repr__(self):
         return f"Candle({self.date_time}, {self.open}, {self.high}, {self.low}, {self.close}, {self.volume})"
 
@@ -0,0 +1,189 @@
+# import
+import numpy as np
+
+
+class CandleStickArray:
+    def __init__(
+            self,
+            open: np.ndarray,
+            high: np.ndarray,
+            low: np.ndarray,
+            close: np.ndarray,
+            scaler: any = None
+    ):
+        # vectorized counterpart of CandleStick, time is the last axis, nan marks missing candles
+        self.open: np.ndarray = open
+        self.high: np.ndarray = high
+        self.low: np.ndarray = low
+        self.close: np.ndarray = close
+        self.scaler: any = scaler
+        self._cache: dict = dict()
+        self._lags: dict = dict()
+
+    def __repr__(self):
+        return f"CandleStickArray(shape={np.shape(self.close)})"
+
+    def __len__(self):
+        return np.shape(self.close)[-1]
+
+    def _memo(self, name: str, compute: callable) -> np.ndarray:
+        """
+        method to compute a series once and keep it for the next call
+        :param name: str: name of the series
+        :param compute: callable: function computing the series
+        :return: np.ndarray: series
+        """
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def lag(self, steps: int):
+        """
+        method to look at the candlestick steps bars before every bar
+        like negative list indices the first bars wrap around to the end of the array
+        :param steps: int: number of bars to look back
+        :return: CandleStickArray: lagged candlesticks sharing the computed series
+        """
+        if steps == 0:
+            return self
+        if steps not in self._lags:
+            self._lags[steps] = _LaggedCandleStickArray(self, steps)
+        return self._lags[steps]
+
+    def is_valid(self) -> np.ndarray:
+        """
+        method to determine which candlesticks are present
+        :return: np.ndarray: bool, False for missing candlesticks
+        """
+        return self._memo('is_valid', lambda: ~(np.isnan(self.open) | np.isnan(self.high) |
+                                                np.isnan(self.low) | np.isnan(self.close)))
+
+    def is_bullish(self) -> np.ndarray:
+        """
+        method to determine which candlesticks are bullish
+        :return: np.ndarray: bool, True if bullish
+        """
+        return self._memo('is_bullish', lambda: self.open < self.close)
+
+    def is_bearish(self) -> np.ndarray:
+        """
+        method to determine which candlesticks are bearish
+        :return: np.ndarray: bool, True if bearish
+        """
+        return self._memo('is_bearish', lambda: self.open > self.close)
+
+    def is_doji(self) -> np.ndarray:
+        """
+        method to determine which candlesticks are doji
+        :return: np.ndarray: bool, True if doji
+        """
+        return self._memo('is_doji', lambda: self.open == self.close)
+
+    def cs_size(self) -> np.ndarray:
+        """
+        method to determine the size of the candlesticks
+        :return: np.ndarray: size of the candlesticks
+        """
+        return self._memo('cs_size', lambda: np.abs(self.high - self.low))
+
+    def upper_shadow_size(self) -> np.ndarray:
+        """
+        method to determine the size of the upper shadows
+        :return: np.ndarray: size of the upper shadows
+        """
+        return self._memo('upper_shadow_size', lambda: self.high - np.maximum(self.open, self.close))
+
+    def lower_shadow_size(self) -> np.ndarray:
+        """
+        method to determine the size of the lower shadows
+        :return: np.ndarray: size of the lower shadows
+        """
+        return self._memo('lower_shadow_size', lambda: np.minimum(self.open, self.close) - self.low)
+
+    def body_size(self) -> np.ndarray:
+        """
+        method to determine the size of the bodies
+        :return: np.ndarray: size of the bodies
+        """
+        return self._memo('body_size', lambda: np.abs(self.close - self.open))
+
+    def cs_body_ratio(self) -> np.ndarray:
+        """
+        method to determine the ratio of the body to the candlestick
+        :return: np.ndarray: ratio of the body to the candlestick, range [0, 1]
+        """
+        def compute() -> np.ndarray:
+            cs_size: np.ndarray = self.cs_size()
+            return np.divide(self.body_size(), cs_size, out=np.zeros_like(cs_size), where=cs_size > 0)
+        return self._memo('cs_body_ratio', compute)
+
+    def body_upper_shadow_ratio(self) -> np.ndarray:
+        """
+        method to determine the ratio of the upper shadow to the body, inf if the body is 0 (doji)
+        :return: np.ndarray: ratio of the upper shadow to the body, range [0, ∞]
+        """
+        def compute() -> np.ndarray:
+            body_size: np.ndarray = self.body_size()
+            return np.divide(self.upper_shadow_size(), body_size, out=np.full_like(body_size, np.inf),
+                             where=body_size > 0)
+        return self._memo('body_upper_shadow_ratio', compute)
+
+    def body_lower_shadow_ratio(self) -> np.ndarray:
+        """
+        method to determine the ratio of the lower shadow to the body, inf if the body is 0 (doji)
+        :return: np.ndarray: ratio of the lower shadow to the body, range [0, ∞]
+        """
+        def compute() -> np.ndarray:
+            body_size: np.ndarray = self.body_size()
+            return np.divide(self.lower_shadow_size(), body_size, out=np.full_like(body_size, np.inf),
+                             where=body_size > 0)
+        return self._memo('body_lower_shadow_ratio', compute)
+
+    def body_position(self) -> np.ndarray:
+        """
+        method to determine the position of the bodies
+        -1 = body totally at the bottom of cs, 0 = middle, 1 = body totally at the top of cs
+        :return: np.ndarray: position of the bodies, range [-1, 1]
+        """
+        def compute() -> np.ndarray:
+            lower_shadow: np.ndarray = self.lower_shadow_size()
+            shadows: np.ndarray = self.upper_shadow_size() + lower_shadow
+            position: np.ndarray = np.divide(2 * lower_shadow, shadows, out=np.ones_like(shadows), where=shadows != 0)
+            return position - 1
+        return self._memo('body_position', compute)
+
+    def relative_size(self) -> np.ndarray:
+        """
+        method to scale the size of the candlesticks with the scaler
+        :return: np.ndarray: scaled size of the candlesticks
+        """
+        if self.scaler is None:
+            raise ValueError("relative_size needs a scaler")
+        return self._memo('relative_size', lambda: self.scaler.transform(self.cs_size()))
+
+
+class _LaggedCandleStickArray(CandleStickArray):
+    def __init__(self, source: CandleStickArray, steps: int):
+        self._source: CandleStickArray = source
+        self._steps: int = steps
+        super().__init__(
+            np.roll(source.open, steps, axis=-1),
+            np.roll(source.high, steps, axis=-1),
+            np.roll(source.low, steps, axis=-1),
+            np.roll(source.close, steps, axis=-1),
+            source.scaler
+        )
+
+    def _memo(self, name: str, compute: callable) -> np.ndarray:
+        """
+        method to lag a series of the source instead of computing it again
+        :param name: str: name of the series
+        :param compute: callable: unused
+        :return: np.ndarray: lagged series
+        """
+        if name not in self._cache:
+            self._cache[name] = np.roll(getattr(self._source, name)(), self._steps, axis=-1)
+        return self._cache[name]
+
+    def lag(self, steps: int) -> CandleStickArray:
+        return self._source.lag(self._steps + steps)
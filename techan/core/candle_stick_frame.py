@@ -2,11 +2,15 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from hashlib import blake2b
+from itertools import islice
 from techan.core.candle_stick import CandleStick
 import plotly.graph_objects as go
 
 
 class CandleStickFrame:
+    _fields: tuple = ('open', 'high', 'low', 'close', 'volume', 'spread')
+
     def __init__(
             self,
             date_time: list,
@@ -15,9 +19,13 @@ class CandleStickFrame:
             low: list,
             close: list,
             volume: list or None = None,
-            spread: list or None = None
+            spread: list or None = None,
+            dtype: type = np.float64
     ):
-        date_time, open, high, low, close, volume, spread = self._validate_input(
+        # dtype of the columns, float32 halves the memory of the frame and of the series derived from it
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise TypeError("dtype must be np.float32 or np.float64 not {}".format(dtype))
+        date_time, values = self._validate_input(
             date_time,
             open,
             high,
@@ -26,18 +34,25 @@ class CandleStickFrame:
             volume,
             spread
         )
-        self.candle_sticks = [CandleStick(dt, o, h, l, c, v, s) for dt, o, h, l, c, v, s in
-                              zip(date_time, open, high, low, close, volume, spread)]
-        self.df: pd.DataFrame = pd.DataFrame({
-            "date_time": date_time,
-            "open": open,
-            "high": high,
-            "low": low,
-            "close": close,
-            "volume": volume,
-            "spread": spread
-        })
-        self._bullish_count, self._bearish_count, self._doji_count = self._type_count()
+        # CandleStick objects are created on first access from the validated columns
+        self._candles: list = [None] * len(date_time)
+        self._positions: range or np.ndarray = range(len(date_time))
+        # buffers with spare capacity for append / extend, only the root frame owns them
+        self._date_time_buffer: np.ndarray or None = np.empty(len(date_time), dtype=object)
+        self._date_time_buffer[:] = date_time
+        # one row per field, missing volume / spread are stored as nan
+        self._buffer: np.ndarray or None = values.astype(dtype, copy=False)
+        self._date_time: np.ndarray = self._date_time_buffer
+        self._values: np.ndarray = self._buffer.view()
+        self._values.flags.writeable = False
+        # datetime64 index, parsed once on first use and kept in step with extend
+        self._index_buffer: np.ndarray or None = None
+        self._index: np.ndarray or None = None
+        self._sorted: bool or None = None
+        self._type_counts: tuple or None = None
+        self._df: pd.DataFrame or None = None
+        self._fingerprint: str or None = None
+        self._indicators: any = None  # IndicatorGraph of the frame, see IndicatorGraph.of
 
     def __repr__(self):
         return f"CandleFrame({self.df})"
@@ -46,16 +61,386 @@ class CandleStickFrame:
         return f"{self.df}"
 
     def __len__(self):
-        return len(self.candle_sticks)
+        return len(self._positions)
 
     def __getitem__(self, index):
-        return self.candle_sticks[index]
+        if isinstance(index, (int, np.integer)):
+            return self._candle(index)
+        if isinstance(index, slice):
+            return self._view(self._values[:, index], self._date_time[index], self._candles, self._positions[index],
+                              None if self._index is None else self._index[index])
+        selection: np.ndarray = np.asarray(index)
+        if selection.dtype == bool:
+            if selection.shape != (len(self),):
+                raise IndexError("boolean mask must have the same length as the frame ({}) not {}".format(
+                    len(self), selection.shape))
+        elif not np.issubdtype(selection.dtype, np.integer):
+            raise TypeError("index must be int, slice, boolean mask or array of int not {}".format(type(index)))
+        return self._view(self._values[:, selection], self._date_time[selection], self._candles,
+                          np.asarray(self._positions)[selection], None if self._index is None else self._index[selection])
 
     def __iter__(self):
-        return iter(self.candle_sticks)
+        self._materialize()
+        if isinstance(self._positions, range) and self._positions.step == 1:
+            return islice(self._candles, self._positions.start, self._positions.stop)
+        return (self._candles[position] for position in self._positions)
 
     def __reversed__(self):
-        return reversed(self.candle_sticks)
+        self._materialize()
+        return (self._candles[position] for position in reversed(self._positions))
+
+    def _materialize(self) -> None:
+        """
+        method to create all candlesticks of the frame not created yet in one pass over the columns
+        :return: None
+        """
+        missing: list = [index for index, position in enumerate(self._positions) if self._candles[position] is None]
+        if not missing:
+            return None
+        values: np.ndarray = self._values[:, missing]
+        volume: list = [None if v != v else v for v in values[4].tolist()]
+        spread: list = [None if s != s else s for s in values[5].tolist()]
+        trusted: callable = CandleStick._trusted
+        for index, dt, o, h, l, c, v, s in zip(missing, self._date_time[missing].tolist(), *values[:4].tolist(),
+                                               volume, spread):
+            self._candles[self._positions[index]] = trusted(dt, o, h, l, c, v, s)
+        return None
+
+    def _candle(self, index: int) -> CandleStick:
+        """
+        method to forward the candlestick at the given index, it is created from the columns on first access
+        :param index: int: index of the candlestick in the frame
+        :return: CandleStick: candlestick
+        """
+        position: int = self._positions[index]
+        candle_stick: CandleStick or None = self._candles[position]
+        if candle_stick is None:
+            open, high, low, close, volume, spread = self._values[:, index].tolist()
+            candle_stick = CandleStick._trusted(
+                self._date_time[index],
+                open,
+                high,
+                low,
+                close,
+                None if volume != volume else volume,
+                None if spread != spread else spread
+            )
+            self._candles[position] = candle_stick
+        return candle_stick
+
+    @classmethod
+    def _view(
+            cls,
+            values: np.ndarray,
+            date_time: np.ndarray,
+            candles: list,
+            positions: range or np.ndarray,
+            index: np.ndarray or None = None
+    ):
+        """
+        method to create a frame on top of existing column buffers without validating or copying them
+        :param values: np.ndarray: field rows of the frame (see _fields), shape (6, n)
+        :param date_time: np.ndarray: date_time of the candlesticks
+        :param candles: list: CandleStick objects of the root frame
+        :param positions: range or np.ndarray: positions of the candlesticks in candles
+        :param index: np.ndarray or None: parsed datetime64 index if already known
+        :return: CandleStickFrame: frame sharing the given buffers
+        """
+        frame: CandleStickFrame = cls.__new__(cls)
+        frame._candles = candles
+        frame._positions = positions
+        frame._date_time = date_time
+        frame._values = values
+        frame._date_time_buffer = None
+        frame._buffer = None
+        frame._index_buffer = None
+        frame._index = index
+        frame._sorted = None
+        frame._type_counts = None
+        frame._df = None
+        frame._fingerprint = None
+        frame._indicators = None
+        return frame
+
+    @classmethod
+    def _from_values(cls, date_time: list, values: np.ndarray):
+        """
+        method to create a frame from field rows, nan volume / spread become None
+        :param date_time: list: date_time of the candlesticks
+        :param values: np.ndarray: field rows (see _fields), shape (6, n), the frame keeps their dtype
+        :return: CandleStickFrame: new frame
+        """
+        open, high, low, close, volume, spread = values
+        return cls(date_time, open, high, low, close, volume, spread, dtype=values.dtype)
+
+    def _reserve(self, size: int) -> None:
+        """
+        method to grow the buffers of the frame to hold at least size candlesticks
+        :param size: int: number of candlesticks
+        :return: None
+        """
+        capacity: int = self._buffer.shape[1]
+        if size <= capacity:
+            return None
+        capacity = max(size, 2 * capacity, 16)
+        buffer: np.ndarray = np.full((len(self._fields), capacity), np.nan, dtype=self._buffer.dtype)
+        buffer[:, :len(self)] = self._values
+        date_time_buffer: np.ndarray = np.empty(capacity, dtype=object)
+        date_time_buffer[:len(self)] = self._date_time
+        self._buffer, self._date_time_buffer = buffer, date_time_buffer
+        if self._index_buffer is not None:
+            index_buffer: np.ndarray = np.empty(capacity, dtype='datetime64[ns]')
+            index_buffer[:len(self)] = self._index
+            self._index_buffer = index_buffer
+        return None
+
+    def append(self, candle_stick: CandleStick) -> None:
+        """
+        method to append a candlestick to the end of the frame
+        :param candle_stick: CandleStick: candlestick to append
+        :return: None
+        """
+        self.extend([candle_stick])
+        return None
+
+    def extend(self, candle_sticks) -> None:
+        """
+        method to append candlesticks to the end of the frame, views taken before stay unchanged
+        :param candle_sticks: list of CandleStick or CandleStickFrame: candlesticks to append
+        :return: None
+        """
+        if self._buffer is None:
+            raise TypeError("cannot extend a slice or selection of a CandleStickFrame")
+        if isinstance(candle_sticks, CandleStickFrame):
+            # candlesticks not created yet in the other frame are created lazily here as well
+            candles: list = [candle_sticks._candles[position] for position in candle_sticks._positions]
+            values: np.ndarray = candle_sticks._values
+            date_time: np.ndarray = candle_sticks.date_time
+        else:
+            candles: list = list(candle_sticks)
+            if not all(isinstance(cs, CandleStick) for cs in candles):
+                raise TypeError("candle_sticks must be CandleStickFrame or list of CandleStick")
+            values: np.ndarray = np.array(
+                [[cs.open, cs.high, cs.low, cs.close, cs.volume, cs.spread] for cs in candles], dtype=np.float64
+            ).reshape(-1, len(self._fields)).T
+            date_time: list = [cs.date_time for cs in candles]
+        start: int = len(self)
+        stop: int = start + len(candles)
+        self._reserve(stop)
+        self._buffer[:, start:stop] = values
+        self._date_time_buffer[start:stop] = date_time
+        self._candles.extend(candles)
+        self._positions = range(stop)
+        self._date_time = self._date_time_buffer[:stop]
+        self._values = self._buffer[:, :stop]
+        self._values.flags.writeable = False
+        if self._index_buffer is not None:
+            index: np.ndarray = self._parse_date_time(self._date_time[start:stop])
+            self._index_buffer[start:stop] = index
+            self._sorted = self._sorted and bool(np.all(index[1:] >= index[:-1])) and (
+                start == 0 or stop == start or index[0] >= self._index[-1])
+            self._index = self._index_buffer[:stop]
+            self._index.flags.writeable = False
+        self._type_counts = None
+        self._df = None
+        self._fingerprint = None
+        self._indicators = None
+        return None
+
+    def fingerprint(self) -> str:
+        """
+        method to hash the content of the frame, equal for frames with the same candlesticks and dtype
+        used as part of the keys of ResultCache
+        :return: str: hex digest
+        """
+        if self._fingerprint is None:
+            digest: blake2b = blake2b(digest_size=20)
+            digest.update(str(self.dtype).encode())
+            digest.update(np.ascontiguousarray(self._values).tobytes())
+            digest.update('\x1f'.join(map(str, self._date_time)).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        forwards the dtype of the columns
+        :return: np.dtype: float32 or float64
+        """
+        return self._values.dtype
+
+    @property
+    def candle_sticks(self) -> list:
+        """
+        forwards the candlesticks of the frame
+        :return: list: list of CandleStick
+        """
+        return list(self)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        forwards the frame as read-only pd.DataFrame, built on first access on top of the column buffers
+        :return: pd.DataFrame: date_time, open, high, low, close, volume and spread (missing values are nan)
+        """
+        if self._df is None:
+            # the transposed field rows become a single float block of the DataFrame without a copy
+            df: pd.DataFrame = pd.DataFrame(self._values.T, columns=list(self._fields), copy=False)
+            df.insert(0, "date_time", self._date_time)
+            self._df = df
+        return self._df
+
+    @staticmethod
+    def _parse_date_time(date_time: np.ndarray) -> np.ndarray:
+        """
+        method to parse str / datetime values into datetime64
+        :param date_time: np.ndarray: date_time values
+        :return: np.ndarray: datetime64[ns] values
+        """
+        return pd.to_datetime(date_time).values.astype('datetime64[ns]')
+
+    @property
+    def index(self) -> np.ndarray:
+        """
+        forwards the date_time column parsed to datetime64, the sortedness is checked when parsing
+        :return: np.ndarray: datetime64[ns] index (read-only)
+        """
+        if self._index is None:
+            index: np.ndarray = self._parse_date_time(self._date_time)
+            if self._buffer is not None:
+                self._index_buffer = np.empty(self._buffer.shape[1], dtype='datetime64[ns]')
+                self._index_buffer[:len(index)] = index
+                index = self._index_buffer[:len(index)]
+            index.flags.writeable = False
+            self._index = index
+        if self._sorted is None:
+            self._sorted = bool(np.all(self._index[1:] >= self._index[:-1]))
+        return self._index
+
+    @property
+    def is_sorted(self) -> bool:
+        """
+        forwards if the date_time of the candlesticks is in ascending order
+        :return: bool: True if sorted
+        """
+        self.index
+        return self._sorted
+
+    def _sorted_index(self) -> np.ndarray:
+        """
+        method to forward the index for binary searches
+        :return: np.ndarray: datetime64[ns] index
+        """
+        if not self.is_sorted:
+            raise ValueError("date_time must be sorted to search the frame by time")
+        return self.index
+
+    def between(self, start: str or datetime or None = None, end: str or datetime or None = None):
+        """
+        method to select the candlesticks with start <= date_time <= end by binary search
+        :param start: str, datetime or None: first date_time (None: from the beginning)
+        :param end: str, datetime or None: last date_time (None: until the end)
+        :return: CandleStickFrame: view of the selected candlesticks
+        """
+        index: np.ndarray = self._sorted_index()
+        first: int = 0 if start is None else int(np.searchsorted(index, np.datetime64(pd.Timestamp(start), 'ns'), 'left'))
+        last: int = len(index) if end is None else int(np.searchsorted(index, np.datetime64(pd.Timestamp(end), 'ns'), 'right'))
+        return self[first:max(first, last)]
+
+    def at(self, date_time: str or datetime) -> CandleStick:
+        """
+        method to look up the candlestick at date_time by binary search
+        :param date_time: str or datetime: date_time of the candlestick
+        :return: CandleStick: first candlestick at date_time
+        """
+        index: np.ndarray = self._sorted_index()
+        timestamp: np.datetime64 = np.datetime64(pd.Timestamp(date_time), 'ns')
+        position: int = int(np.searchsorted(index, timestamp, 'left'))
+        if position == len(index) or index[position] != timestamp:
+            raise KeyError("no candlestick at {}".format(date_time))
+        return self[position]
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        forwards the field rows of the frame (read-only view), see _fields
+        :return: np.ndarray: open, high, low, close, volume and spread, shape (6, n)
+        """
+        return self._values
+
+    @property
+    def date_time(self) -> np.ndarray:
+        """
+        forwards the date_time column
+        :return: np.ndarray: date_time of the candlesticks
+        """
+        return self._date_time
+
+    @property
+    def open(self) -> np.ndarray:
+        """
+        forwards the open column (read-only view)
+        :return: np.ndarray: open prices
+        """
+        return self._values[0]
+
+    @property
+    def high(self) -> np.ndarray:
+        """
+        forwards the high column (read-only view)
+        :return: np.ndarray: highs
+        """
+        return self._values[1]
+
+    @property
+    def low(self) -> np.ndarray:
+        """
+        forwards the low column (read-only view)
+        :return: np.ndarray: lows
+        """
+        return self._values[2]
+
+    @property
+    def close(self) -> np.ndarray:
+        """
+        forwards the close column (read-only view)
+        :return: np.ndarray: close prices
+        """
+        return self._values[3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        """
+        forwards the volume column (read-only view), missing volumes are nan
+        :return: np.ndarray: volumes
+        """
+        return self._values[4]
+
+    @property
+    def spread(self) -> np.ndarray:
+        """
+        forwards the spread column (read-only view), missing spreads are nan
+        :return: np.ndarray: spreads
+        """
+        return self._values[5]
+
+    @staticmethod
+    def _validate_column(name: str, values: list or np.ndarray or pd.Series, optional: bool = False) -> np.ndarray:
+        """
+        method to validate the type of a price or volume column and convert it to float64, None becomes nan
+        :param name: str: name of the column
+        :param values: list, np.ndarray, or pd.Series: values of the column
+        :param optional: bool: True if the values may be None
+        :return: np.ndarray: float64 column
+        """
+        if isinstance(values, (np.ndarray, pd.Series)) and np.asarray(values).dtype.kind in 'iuf':
+            return np.asarray(values, dtype=np.float64)
+        if optional:
+            if not all(isinstance(x, (int, float, type(None))) for x in values):
+                raise TypeError("{} must be list of int, float or None not {}".format(name, type(values)))
+        elif not all(isinstance(x, (int, float)) for x in values):
+            raise TypeError("{} must be list of int or float not {}".format(name, type(values)))
+        return np.array(list(values), dtype=np.float64)
 
     @staticmethod
     def _validate_input(
@@ -68,7 +453,7 @@ class CandleStickFrame:
             spread: list or None
     ) -> tuple:
         """
-        method to validate the input
+        method to validate the input in bulk, the same checks as CandleStick on whole columns
         :param date_time: list, np.ndarray, or pd.Series of date_time of the candlesticks
         :param open: list, np.ndarray, or pd.pd.Series of open of the candlesticks
         :param high: list, np.ndarray, or pd.pd.Series of high of the candlesticks
@@ -76,7 +461,7 @@ class CandleStickFrame:
         :param close: list, np.ndarray, or pd.Series of close of the candlesticks
         :param volume: list, np.ndarray, or pd.Series of volume of the candlesticks or None
         :param spread: list, np.ndarray, or pd.Series of spread of the candlesticks or None
-        :return: tuple: date_time, open, high, low, close, volume
+        :return: tuple: date_time (list), values (np.ndarray, field rows see _fields)
         """
         if not isinstance(date_time, (list, np.ndarray, pd.Series)):
             raise TypeError("date_time must be list, np.ndarry, pd.Series not {}".format(type(date_time)))
@@ -90,68 +475,79 @@ class CandleStickFrame:
             raise TypeError("close must be list, np.ndarry, or pd.Series not {}".format(type(close)))
         if not isinstance(volume, (list, np.ndarray, pd.Series, type(None))):
             raise TypeError("volume must be list, np.ndarry, pd.Series or NoneType not {}".format(type(volume)))
+        if not isinstance(spread, (list, np.ndarray, pd.Series, type(None))):
+            raise TypeError("spread must be list, np.ndarry, pd.Series or NoneType not {}".format(type(spread)))
         date_time = list(date_time)
-        open = list(open)
-        high = list(high)
-        low = list(low)
-        close = list(close)
-        volume = list(volume) if volume is not None else [None] * len(date_time)
-        spread = list(spread) if spread is not None else [None] * len(date_time)
-        if len(date_time) != len(open) != len(high) or len(open) != len(low) or len(open) != len(close):
+        n: int = len(date_time)
+        if not len(open) == len(high) == len(low) == len(close) == n:
             raise ValueError("date_time, open, high, low, and close must be the same length")
+        if (volume is not None and len(volume) != n) or (spread is not None and len(spread) != n):
+            raise ValueError("volume and spread must have the same length as date_time")
         if not all(isinstance(x, (str, datetime)) for x in date_time):
             raise TypeError("date_time must be list of str or time.datetime not {}".format(type(date_time)))
-        if not all(isinstance(x, (int, float)) for x in open):
-            raise TypeError("open must be list of int or float not {}".format(type(open)))
-        if not all(isinstance(x, (int, float)) for x in high):
-            raise TypeError("high must be list of int or float not {}".format(type(high)))
-        if not all(isinstance(x, (int, float)) for x in low):
-            raise TypeError("low must be list of int or float not {}".format(type(low)))
-        if not all(isinstance(x, (int, float)) for x in close):
-            raise TypeError("close must be list of int or float not {}".format(type(close)))
-        if not all(isinstance(x, (int, float, type(None))) for x in volume):
-            raise TypeError("volume must be list of int, float or None not {}".format(type(volume)))
-        if not all(isinstance(x, (int, float, type(None))) for x in spread):
-            raise TypeError("spread must be list of int, float or None not {}".format(type(spread)))
-        return date_time, open, high, low, close, volume, spread
+        values: np.ndarray = np.full((len(CandleStickFrame._fields), n), np.nan, dtype=np.float64)
+        values[0] = CandleStickFrame._validate_column('open', open)
+        values[1] = CandleStickFrame._validate_column('high', high)
+        values[2] = CandleStickFrame._validate_column('low', low)
+        values[3] = CandleStickFrame._validate_column('close', close)
+        if volume is not None:
+            values[4] = CandleStickFrame._validate_column('volume', volume, optional=True)
+        if spread is not None:
+            values[5] = CandleStickFrame._validate_column('spread', spread, optional=True)
+        open, high, low, close, volume, spread = values
+        if (open < 0).any():
+            raise ValueError("open must be positive")
+        if (high < 0).any():
+            raise ValueError("high must be positive")
+        if (low < 0).any():
+            raise ValueError("Low must be positive")
+        if (close < 0).any():
+            raise ValueError("close must be positive")
+        if (volume < 0).any():
+            raise ValueError("volume must be positive")
+        if (spread < 0).any():
+            raise ValueError("spread must be positive")
+        if (open > high).any():
+            raise ValueError("open cannot be greater than high")
+        if (open < low).any():
+            raise ValueError("open cannot be less than low")
+        if (close > high).any():
+            raise ValueError("close cannot be greater than high")
+        if (close < low).any():
+            raise ValueError("close cannot be less than low")
+        return date_time, values
 
     def _type_count(self) -> tuple:
         """
         method to count the number of bullish, bearish, and doji candlesticks
         :return: tuple: bullish, bearish, doji count
         """
-        bullish: int = 0
-        bearish: int = 0
-        doji: int = 0
-        for candle in self.candle_sticks:
-            if candle.type() == 'bullish':
-                bullish += 1
-            elif candle.type() == 'bearish':
-                bearish += 1
-            elif candle.type() == 'doji':
-                doji += 1
-        return bullish, bearish, doji
+        if self._type_counts is None:
+            bullish: int = int(np.count_nonzero(self.open < self.close))
+            bearish: int = int(np.count_nonzero(self.open > self.close))
+            self._type_counts = bullish, bearish, len(self) - bullish - bearish
+        return self._type_counts
 
     def _bullish_ratio(self) -> float:
         """
         method to calculate the ratio of bullish candlesticks
         :return: float: bullish ratio range [0, 1]
         """
-        return self._bullish_count / len(self.candle_sticks)
+        return self._type_count()[0] / len(self)
 
     def _bearish_ratio(self) -> float:
         """
         method to calculate the ratio of bearish candlesticks
         :return: float: bearish ratio range [0, 1]
         """
-        return self._bearish_count / len(self.candle_sticks)
+        return self._type_count()[1] / len(self)
 
     def _doji_ratio(self) -> float:
         """
         method to calculate the ratio of doji candlesticks
         :return: float: doji ratio range [0, 1]
         """
-        return self._doji_count / len(self.candle_sticks)
+        return self._type_count()[2] / len(self)
 
     def type_ratio(self) -> str:
         """
@@ -163,6 +559,71 @@ class CandleStickFrame:
                                                                        self._doji_ratio()
                                                                        )
 
+    def _date_time_ns(self) -> np.ndarray:
+        """
+        method to parse the date_time column into nanoseconds since epoch
+        :return: np.ndarray: int64 timestamps
+        """
+        return self.index.view(np.int64)
+
+    @staticmethod
+    def _aggregate(date_time_ns: np.ndarray, values: np.ndarray, step: int) -> (np.ndarray, np.ndarray):
+        """
+        method to aggregate sorted field rows into buckets of step nanoseconds (aligned to epoch)
+        open: first, high: max, low: min, close: last, volume: sum, spread: max
+        :param date_time_ns: np.ndarray: sorted int64 timestamps
+        :param values: np.ndarray: field rows (see _fields), shape (6, n)
+        :param step: int: bucket size in nanoseconds
+        :return: tuple: bucket start timestamps, aggregated field rows
+        """
+        buckets: np.ndarray = date_time_ns // step
+        if len(buckets) == 0:
+            # an empty frame has no buckets
+            return buckets, values[:, :0].copy()
+        starts: np.ndarray = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends: np.ndarray = np.r_[starts[1:] - 1, len(buckets) - 1]
+        aggregated: np.ndarray = np.empty((len(values), len(starts)), dtype=values.dtype)
+        aggregated[0] = values[0][starts]
+        aggregated[1] = np.maximum.reduceat(values[1], starts)
+        aggregated[2] = np.minimum.reduceat(values[2], starts)
+        aggregated[3] = values[3][ends]
+        aggregated[4] = np.add.reduceat(values[4], starts)
+        aggregated[5] = np.fmax.reduceat(values[5], starts)
+        return buckets[starts] * step, aggregated
+
+    def resample(self, rule: str):
+        """
+        method to resample the frame to a coarser fixed timeframe
+        :param rule: str: timeframe understood by pd.Timedelta, e.g. '5min', '1h' or '1D'
+        :return: CandleStickFrame: resampled frame, date_time is the start of each bucket
+        """
+        return self.resample_many([rule])[rule]
+
+    def resample_many(self, rules: list) -> dict:
+        """
+        method to resample the frame to several fixed timeframes in one pass over the frame
+        a timeframe that is a multiple of a finer requested one is aggregated from that finer result
+        :param rules: list: timeframes understood by pd.Timedelta, e.g. ['5min', '15min', '1h']
+        :return: dict: rule -> resampled CandleStickFrame
+        """
+        steps: dict = {rule: pd.Timedelta(rule).value for rule in rules}
+        if any(step <= 0 for step in steps.values()):
+            raise ValueError("rules must be positive timeframes not {}".format(rules))
+        if not self.is_sorted:
+            raise ValueError("date_time must be sorted to resample the frame")
+        date_time_ns: np.ndarray = self._date_time_ns()
+        sources: list = [(1, date_time_ns, self._values)]
+        result: dict = dict()
+        for rule in sorted(steps, key=steps.get):
+            step: int = steps[rule]
+            _, source_ns, source_values = next(
+                source for source in reversed(sources) if step % source[0] == 0
+            )
+            bucket_ns, values = self._aggregate(source_ns, source_values, step)
+            sources.append((step, bucket_ns, values))
+            result[rule] = self._from_values(list(pd.to_datetime(bucket_ns).to_pydatetime()), values)
+        return result
+
     def plot(self) -> None:
         """
         method to plot a candlestick chart
@@ -0,0 +1,222 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick_array import CandleStickArray
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.atr import average_true_range
+from techan.indicator.trend import body_trend
+from techan.pattern.pattern_kernel import evaluate, parameter_grid, pattern_names, sweep
+from techan.util.param import Parameter
+from techan.util.scaler import StandardScaler
+
+
+class CandleStickPanel:
+    _fields: tuple = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(
+            self,
+            symbols: list,
+            date_time: list or np.ndarray,
+            open: np.ndarray,
+            high: np.ndarray,
+            low: np.ndarray,
+            close: np.ndarray,
+            volume: np.ndarray or None = None,
+            mask: np.ndarray or None = None,
+            dtype: type = np.float64
+    ):
+        # symbols x time matrix per field, bars outside the mask (ragged histories) are stored as nan
+        self.symbols: list = list(symbols)
+        self.date_time: np.ndarray = np.asarray(date_time)
+        shape: tuple = (len(self.symbols), len(self.date_time))
+        if volume is None:
+            volume = np.full(shape, np.nan)
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise TypeError("dtype must be np.float32 or np.float64 not {}".format(dtype))
+        self._values: np.ndarray = np.array([open, high, low, close, volume], dtype=dtype)
+        if self._values.shape[1:] != shape:
+            raise ValueError("open, high, low, close and volume must have the shape (symbols, date_time) {} not {}"
+                             .format(shape, self._values.shape[1:]))
+        if mask is None:
+            mask = ~np.isnan(self._values[:4]).any(axis=0)
+        self.mask: np.ndarray = np.asarray(mask, dtype=bool)
+        if self.mask.shape != shape:
+            raise ValueError("mask must have the shape (symbols, date_time) {} not {}".format(shape, self.mask.shape))
+        self._values[:, ~self.mask] = np.nan
+        self._validate_values()
+        self._values.flags.writeable = False
+        self._candle_stick_array: CandleStickArray or None = None
+        self._trends: dict = dict()
+        self._hits: dict = dict()  # (pattern name, parameter record) -> (hits, defined)
+
+    def __repr__(self):
+        return f"CandlePanel(symbols={len(self.symbols)}, date_time={len(self.date_time)})"
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, symbol: str) -> CandleStickFrame:
+        row: int = self.symbols.index(symbol)
+        valid: np.ndarray = self.mask[row]
+        values: np.ndarray = self._values[:, row, valid]
+        date_time: np.ndarray = self.date_time[valid]
+        if np.issubdtype(date_time.dtype, np.datetime64):
+            date_time = pd.DatetimeIndex(date_time)
+        return CandleStickFrame._from_values(
+            list(date_time),
+            np.vstack([values, np.full((1, values.shape[1]), np.nan, dtype=values.dtype)])
+        )
+
+    def _validate_values(self) -> None:
+        """
+        method to validate the bars inside the mask in bulk
+        :return: None
+        """
+        open, high, low, close, volume = self._values[:, self.mask]
+        if np.isnan(open).any() or np.isnan(high).any() or np.isnan(low).any() or np.isnan(close).any():
+            raise ValueError("open, high, low and close must not be nan inside the mask")
+        if (low < 0).any() or (volume < 0).any():
+            raise ValueError("prices and volume must be positive")
+        if (open > high).any() or (close > high).any():
+            raise ValueError("open and close cannot be greater than high")
+        if (open < low).any() or (close < low).any():
+            raise ValueError("open and close cannot be less than low")
+        return None
+
+    @classmethod
+    def from_frames(cls, frames: dict):
+        """
+        method to build a panel from one CandleStickFrame per symbol, aligned on the union of their date_time
+        :param frames: dict: symbol -> CandleStickFrame
+        :return: CandleStickPanel: panel of all symbols
+        """
+        date_time_ns: dict = {symbol: frame._date_time_ns() for symbol, frame in frames.items()}
+        index: np.ndarray = np.unique(np.concatenate(list(date_time_ns.values()))) if frames else np.array([], np.int64)
+        values: np.ndarray = np.full((len(cls._fields), len(frames), len(index)), np.nan)
+        for row, (symbol, frame) in enumerate(frames.items()):
+            columns: np.ndarray = np.searchsorted(index, date_time_ns[symbol])
+            values[:, row, columns] = frame._values[:len(cls._fields)]
+        return cls(list(frames), index.astype('datetime64[ns]'), *values)
+
+    @property
+    def shape(self) -> tuple:
+        """
+        forwards the shape of the panel
+        :return: tuple: symbols, date_time
+        """
+        return self.mask.shape
+
+    @property
+    def open(self) -> np.ndarray:
+        """
+        forwards the open matrix (read-only)
+        :return: np.ndarray: open prices, symbols x date_time
+        """
+        return self._values[0]
+
+    @property
+    def high(self) -> np.ndarray:
+        """
+        forwards the high matrix (read-only)
+        :return: np.ndarray: highs, symbols x date_time
+        """
+        return self._values[1]
+
+    @property
+    def low(self) -> np.ndarray:
+        """
+        forwards the low matrix (read-only)
+        :return: np.ndarray: lows, symbols x date_time
+        """
+        return self._values[2]
+
+    @property
+    def close(self) -> np.ndarray:
+        """
+        forwards the close matrix (read-only)
+        :return: np.ndarray: close prices, symbols x date_time
+        """
+        return self._values[3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        """
+        forwards the volume matrix (read-only)
+        :return: np.ndarray: volumes, symbols x date_time
+        """
+        return self._values[4]
+
+    def scaler(self) -> StandardScaler:
+        """
+        method to fit one StandardScaler per symbol on the size of its candle sticks
+        :return: StandardScaler: scaler with a mean and std per symbol
+        """
+        return StandardScaler(np.abs(self.high - self.low), axis=1)
+
+    def candle_stick_array(self) -> CandleStickArray:
+        """
+        method to forward the candle sticks of all symbols, scaled with the scaler of each symbol
+        :return: CandleStickArray: candle sticks, symbols x date_time
+        """
+        if self._candle_stick_array is None:
+            self._candle_stick_array = CandleStickArray(self.open, self.high, self.low, self.close, self.scaler())
+        return self._candle_stick_array
+
+    def trend(self, window: int = 10) -> np.ndarray:
+        """
+        method to calculate the trend before every bar of every symbol, see CandleStickPattern.trend
+        :param window: int: window to calculate the trend over
+        :return: np.ndarray: trend, symbols x date_time, nan where undefined
+        """
+        if window not in self._trends:
+            self._trends[window] = body_trend(self.open, self.close, window)
+        return self._trends[window]
+
+    def atr(self, time_steps: int = 15) -> np.ndarray:
+        """
+        method to compute the ATR of every symbol
+        :param time_steps: int: time_steps to consider
+        :return: np.ndarray: ATR, symbols x date_time, nan where undefined
+        """
+        return average_true_range(self.high, self.low, self.close, time_steps)
+
+    def find(self, type: str = 'all', param: dict or None = None) -> dict:
+        """
+        Method to search for candle stick pattern on all symbols at once
+        :param type: str: 'all', 'bullish' or 'bearish' (default: 'all')
+        :param param: dict or None: pattern name -> parameters (dict or record of Parameter.compile), missing patterns
+                      use Parameter.candle_stick_pattern
+        :return: dict: pattern name -> bool matrix of hits, symbols x date_time
+        """
+        if param is None:
+            param = dict()
+        result: dict = dict()
+        for name in pattern_names(type):
+            # the records are hashable, hits of parameters seen before are reused
+            key: tuple = (name, Parameter.compile(name, param.get(name)))
+            if key not in self._hits:
+                self._hits[key] = evaluate(name, self.candle_stick_array(), key[1], self._trends)
+            result[name] = self._hits[key][0]
+        return result
+
+    def sweep(self, name: str, grid: dict or list) -> (list, np.ndarray):
+        """
+        method to search a pattern with many parameter sets on all symbols at once, see pattern_kernel.sweep
+        :param name: str: pattern name, e.g. 'hammer'
+        :param grid: dict or list: parameter -> list of values (every combination is used) or list of parameters
+        :return: tuple: list of parameter records, bool array of hits (parameter sets x symbols x date_time)
+        """
+        records: list = parameter_grid(name, grid)
+        hits, _ = sweep(name, self.candle_stick_array(), records, self._trends)
+        return records, hits
+
+    def to_frame(self, pattern: np.ndarray) -> pd.DataFrame:
+        """
+        method to label a symbols x date_time matrix
+        :param pattern: np.ndarray: matrix, e.g. a result of find
+        :return: pd.DataFrame: date_time as index, symbols as columns
+        """
+        return pd.DataFrame(np.asarray(pattern).T, index=self.date_time, columns=self.symbols)
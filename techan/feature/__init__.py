@@ -0,0 +1,4 @@
+# import
+from techan.feature.feature_builder import FeatureBuilder
+from techan.feature.window import WindowDataset, sliding_windows
+from techan.feature.similarity import SimilaritySearch, distance_profile
@@ -0,0 +1,203 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick_array import CandleStickArray
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.atr import true_range
+from techan.indicator.kernel import rolling_sum
+from techan.indicator.p_change import percentage_change
+from techan.indicator.trend import body_trend
+from techan.pattern.candle_stick_pattern import CandleStickPattern
+from techan.pattern.pattern_kernel import PATTERNS, evaluate, pattern_names, pattern_type
+from techan.util.param import Parameter
+from techan.util.scaler import MinMaxScaler, StandardScaler
+
+
+class FeatureBuilder:
+    _columns: tuple = ('open', 'high', 'low', 'close', 'volume', 'spread')
+    _geometry: tuple = ('cs_size', 'body_size', 'upper_shadow_size', 'lower_shadow_size', 'cs_body_ratio',
+                        'body_upper_shadow_ratio', 'body_lower_shadow_ratio', 'body_position', 'relative_size', 'type')
+    _time_units: tuple = ('minute', 'hour', 'day', 'month', 'year')
+
+    def __init__(
+            self,
+            candle_stick_frame: CandleStickFrame,
+            features: list,
+            scaler: StandardScaler or MinMaxScaler or str or None = None,
+            dtype: type = np.float32
+    ):
+        """
+        feature matrix of a frame (one row per bar) built from a declarative feature list
+        every feature is a name or a tuple (name, options):
+        - 'open', 'high', 'low', 'close', 'volume', 'spread': columns of the frame
+        - 'cs_size', 'body_size', 'upper_shadow_size', 'lower_shadow_size', 'cs_body_ratio', 'body_upper_shadow_ratio',
+          'body_lower_shadow_ratio', 'body_position', 'relative_size': geometry like CandleStick,
+          'type': 1 bullish, -1 bearish, 0 doji
+        - ('trend', {'window': 10}): trend like CandleStickPattern.trend
+        - ('atr', {'time_steps': 15}): ATR like atr
+        - 'p_change': percentual change like p_change
+        - pattern name, e.g. ('hammer', {'trend_window': 5}): 1 hit, 0 no hit, nan undefined like find(is_boolean=True)
+        - ('time', {'unit': 'hour'}): sine and cosine of the unit like Time, without unit for all units
+        :param candle_stick_frame: CandleStickFrame: candle sticks
+        :param features: list: features in the column order of the matrix
+        :param scaler: StandardScaler, MinMaxScaler, str or None: scaler of relative_size and the patterns, see
+                       CandleStickPattern
+        :param dtype: type: dtype of the matrix, np.float32 or np.float64
+        """
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise TypeError("dtype must be np.float32 or np.float64 not {}".format(dtype))
+        self.candle_stick_frame: CandleStickFrame = candle_stick_frame
+        self.features: list = features
+        self.dtype: np.dtype = np.dtype(dtype)
+        self._scaler: StandardScaler or MinMaxScaler = CandleStickPattern(candle_stick_frame, scaler)._scaler
+        self._plan: list = [self._compile(feature) for feature in features]
+        self.columns: list = [name for _, _, names, _ in self._plan for name in names]
+        # bars before a chunk that its features look back on
+        self._warm_up: int = max([warm_up for _, _, _, warm_up in self._plan], default=0)
+        self._time_max: dict = dict()
+
+    def __repr__(self):
+        return f'FeatureBuilder(columns={self.columns}, dtype={self.dtype})'
+
+    def __len__(self):
+        return len(self.candle_stick_frame)
+
+    def _compile(self, feature: str or tuple) -> tuple:
+        """
+        method to validate a feature and to plan its columns
+        :param feature: str or tuple: name or (name, options)
+        :return: tuple: kind, options, column names and bars of warm up
+        """
+        name, options = (feature, dict()) if isinstance(feature, str) else feature
+        options = dict(options)
+        if name in self._columns or name in self._geometry:
+            return name, options, [name], 0
+        if name == 'trend':
+            window: int = options.setdefault('window', 10)
+            return name, options, [f'trend_{window}'], window + 1
+        if name == 'atr':
+            time_steps: int = options.setdefault('time_steps', 15)
+            return name, options, [f'atr_{time_steps}'], time_steps + 1
+        if name == 'p_change':
+            return name, options, [name], 1
+        if name == 'time':
+            units: list = [options['unit']] if 'unit' in options else list(self._time_units)
+            unknown: set = set(units) - set(self._time_units)
+            if unknown:
+                raise ValueError("unknown time units {}".format(sorted(unknown)))
+            options['units'] = units
+            return name, options, [f'{function}_{unit}' for unit in units for function in ('sin', 'cos')], 0
+        if name in pattern_names():
+            record: tuple = Parameter.compile(name, options)
+            _, length, offset = PATTERNS[pattern_type(name)][name]
+            return 'pattern', dict(name=name, param=record), [name], record.trend_window + offset + length
+        raise ValueError("unknown feature {}".format(name))
+
+    def _time_component(self, index: pd.DatetimeIndex, unit: str) -> np.ndarray:
+        """
+        method to extract a unit of the date_time
+        :param index: pd.DatetimeIndex: date_time
+        :param unit: str: 'minute', 'hour', 'day', 'month' or 'year'
+        :return: np.ndarray: values of the unit
+        """
+        return np.asarray(getattr(index, unit), dtype=np.float64)
+
+    def _time_scale(self, unit: str) -> float:
+        """
+        method to forward the maximum of a unit over the whole frame, Time normalizes with it
+        :param unit: str: time unit
+        :return: float: maximum
+        """
+        if unit not in self._time_max:
+            self._time_max[unit] = float(self._time_component(pd.DatetimeIndex(self.candle_stick_frame.index),
+                                                              unit).max())
+        return self._time_max[unit]
+
+    def _fill(self, start: int, stop: int, out: np.ndarray) -> np.ndarray:
+        """
+        method to compute the rows of the bars [start, stop), the features share the geometry, trends and true range
+        :param start: int: first bar
+        :param stop: int: bar after the last bar
+        :param out: np.ndarray: rows to fill, shape (stop - start, columns)
+        :return: np.ndarray: out
+        """
+        frame: CandleStickFrame = self.candle_stick_frame
+        begin: int = max(0, start - self._warm_up)
+        skip: int = start - begin
+        array: CandleStickArray = CandleStickArray(frame.open[begin:stop], frame.high[begin:stop],
+                                                   frame.low[begin:stop], frame.close[begin:stop], self._scaler)
+        trends: dict = dict()  # trend_window -> body_trend, shared with the patterns
+        ranges: list = []  # true range, shared by the ATRs
+        index: pd.DatetimeIndex or None = None
+        column: int = 0
+        for kind, options, names, _ in self._plan:
+            if kind in self._columns:
+                values: np.ndarray = getattr(frame, kind)[begin:stop]
+            elif kind == 'type':
+                values: np.ndarray = array.is_bullish().astype(np.int8) - array.is_bearish().astype(np.int8)
+            elif kind in self._geometry:
+                values: np.ndarray = getattr(array, kind)()
+            elif kind == 'trend':
+                if options['window'] not in trends:
+                    trends[options['window']] = body_trend(array.open, array.close, options['window'])
+                values: np.ndarray = trends[options['window']]
+            elif kind == 'atr':
+                if not ranges:
+                    ranges.append(true_range(array.high, array.low, array.close))
+                values: np.ndarray = rolling_sum(ranges[0], options['time_steps']) / options['time_steps']
+            elif kind == 'p_change':
+                values: np.ndarray = percentage_change(array.close)
+            elif kind == 'pattern':
+                hits, defined = evaluate(options['name'], array, options['param'], trends)
+                values: np.ndarray = np.where(defined, hits, np.nan)
+            else:
+                if index is None:
+                    index = pd.DatetimeIndex(frame.index[start:stop])
+                for unit in options['units']:
+                    scale: float = self._time_scale(unit)
+                    angle: np.ndarray = 2 * np.pi * self._time_component(index, unit) / scale if scale else \
+                        np.zeros(stop - start)
+                    out[:, column] = np.sin(angle)
+                    out[:, column + 1] = np.cos(angle)
+                    column += 2
+                continue
+            out[:, column] = values[skip:]
+            column += 1
+        # the lagged arrays reference their source, dropping them keeps streamed chunks from piling up until gc runs
+        array._lags.clear()
+        return out
+
+    def build(self, chunk_size: int or None = None) -> np.ndarray:
+        """
+        method to build the feature matrix
+        :param chunk_size: int or None: bars computed at once (see iter_chunks), None computes all bars in one pass
+        :return: np.ndarray: C-contiguous matrix, shape (bars, columns)
+        """
+        n: int = len(self.candle_stick_frame)
+        chunk_size = chunk_size or max(1, n)
+        out: np.ndarray = np.empty((n, len(self.columns)), dtype=self.dtype)
+        for start in range(0, n, chunk_size):
+            self._fill(start, min(n, start + chunk_size), out[start:start + chunk_size])
+        return out
+
+    def iter_chunks(self, chunk_size: int = 1 << 16):
+        """
+        method to stream the feature matrix in row chunks, only a chunk and its warm up bars are held in memory
+        chunks equal the rows of build up to the rounding of the rolling sums, which start at the warm up
+        :param chunk_size: int: bars per chunk
+        :return: generator: (first bar, matrix of the chunk)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+        n: int = len(self.candle_stick_frame)
+        for start in range(0, n, chunk_size):
+            stop: int = min(n, start + chunk_size)
+            yield start, self._fill(start, stop, np.empty((stop - start, len(self.columns)), dtype=self.dtype))
+
+    def to_df(self, chunk_size: int or None = None) -> pd.DataFrame:
+        """
+        method to build the feature matrix as pd.DataFrame
+        :param chunk_size: int or None: see build
+        :return: pd.DataFrame: one column per feature column
+        """
+        return pd.DataFrame(self.build(chunk_size), columns=self.columns, copy=False)
@@ -0,0 +1,316 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.feature.feature_builder import FeatureBuilder
+from techan.indicator.kernel import rolling_sum
+from techan.pattern.validation_kernel import outcome
+
+
+def _moments(values: np.ndarray, window: int, bounds: np.ndarray or None = None) -> tuple:
+    """
+    function to compute the mean, the standard deviation and the segment means of every window in chunks of window
+    views, prefix sums would lose the variance of flat windows in long series
+    :param values: np.ndarray: series, shape (features, bars)
+    :param window: int: bars per window
+    :param bounds: np.ndarray or None: segment bounds within a window, None skips the segment means
+    :return: tuple: mean and standard deviation, shape (features, windows), and the segment means, shape
+                    (features, windows, segments) or None, window i starts at bar i, windows with nan are nan
+    """
+    windows: np.ndarray = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+    count: int = windows.shape[1]
+    mean: np.ndarray = np.empty((values.shape[0], count))
+    std: np.ndarray = np.empty((values.shape[0], count))
+    segments: np.ndarray or None = None
+    if bounds is not None:
+        segments = np.empty((values.shape[0], count, len(bounds) - 1))
+    chunk: int = max(1, (1 << 22) // (window * values.shape[0]))
+    for start in range(0, count, chunk):
+        block: np.ndarray = windows[:, start:start + chunk]
+        mean[:, start:start + chunk] = block.mean(axis=-1)
+        std[:, start:start + chunk] = block.std(axis=-1)
+        if bounds is not None:
+            segments[:, start:start + chunk] = np.add.reduceat(block, bounds[:-1], axis=-1) / np.diff(bounds)
+    return mean, std, segments
+
+
+def _znormalize(values: np.ndarray) -> np.ndarray:
+    """
+    function to z-normalize windows per feature, constant windows become 0
+    :param values: np.ndarray: windows, the window is the last axis
+    :return: np.ndarray: z-normalized windows (float64)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    centered: np.ndarray = values - values.mean(axis=-1, keepdims=True)
+    std: np.ndarray = centered.std(axis=-1, keepdims=True)
+    scale: np.ndarray = np.abs(values).max(axis=-1, keepdims=True)
+    constant: np.ndarray = std <= 1e-12 * scale
+    return np.where(constant, 0.0, centered / np.where(constant, 1.0, std))
+
+
+def distance_profile(query: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    function to compute the z-normalized euclidean distance of a query to every window of the same length with
+    sliding dot products via FFT (MASS), the distances of the features are added up like one long window
+    constant windows are z-normalized to 0, so they are sqrt(window) away from a non-constant query
+    :param query: np.ndarray: query, shape (window,) or (window, features)
+    :param values: np.ndarray: series, shape (bars,) or (bars, features)
+    :return: np.ndarray: distance of the window ending at every bar, nan for the first window - 1 bars and windows
+                         with missing bars
+    """
+    query, values = np.asarray(query, dtype=np.float64), np.asarray(values, dtype=np.float64)
+    if query.ndim == 1:
+        query = query[:, None]
+    if values.ndim == 1:
+        values = values[:, None]
+    window: int = query.shape[0]
+    if query.shape[1] != values.shape[1]:
+        raise ValueError("query has {} features, values {}".format(query.shape[1], values.shape[1]))
+    if not 1 <= window <= values.shape[0]:
+        raise ValueError("query must have 1 to {} bars not {}".format(values.shape[0], window))
+    series: np.ndarray = values.T - np.nanmean(values, axis=0)[:, None]
+    mean, std, _ = _moments(series, window)
+    z_query: np.ndarray = _znormalize(query.T)
+    size: int = 1 << int(np.ceil(np.log2(series.shape[1] + window)))
+    # correlation with the reversed query, the mean of the window drops out because the query sums to 0
+    products: np.ndarray = np.fft.irfft(
+        np.fft.rfft(np.nan_to_num(series), size) * np.fft.rfft(z_query[:, ::-1], size), size
+    )[:, window - 1:series.shape[1]]
+    scale: np.ndarray = np.nanmax(np.abs(series), axis=1, keepdims=True)
+    constant: np.ndarray = std <= 1e-12 * np.maximum(scale, np.abs(mean))
+    norm: np.ndarray = np.sum(z_query * z_query, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        squared: np.ndarray = np.where(constant, norm, norm + window - 2 * products / std)
+    squared = np.where(np.isnan(std), np.nan, np.maximum(squared, 0.0)).sum(axis=0)
+    result: np.ndarray = np.full(values.shape[0], np.nan)
+    result[window - 1:] = np.sqrt(squared)
+    return result
+
+
+class SimilaritySearch:
+    def __init__(self, values: np.ndarray, window: int, segments: int = 8):
+        """
+        search of the windows most similar to a query (z-normalized euclidean distance per feature, added up)
+        the index stores a piecewise aggregate approximation (PAA) of every z-normalized window, its distance is a
+        lower bound of the exact distance, so the top k are found by reranking the windows in the order of the lower
+        bound until no unchecked window can be closer
+        :param values: np.ndarray: series, shape (bars,) or (bars, features), e.g. columns of the frame or a matrix of
+                       FeatureBuilder.build
+        :param window: int: bars per window
+        :param segments: int: segments per window and feature of the index
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        if values.ndim != 2:
+            raise ValueError("values must have the shape (bars, features) not {}".format(values.shape))
+        if not 1 <= window <= values.shape[0]:
+            raise ValueError("window must be in [1, {}] not {}".format(values.shape[0], window))
+        if not 1 <= segments <= window:
+            raise ValueError("segments must be in [1, {}] not {}".format(window, segments))
+        self.window: int = window
+        self.segments: int = segments
+        self.candle_stick_frame: CandleStickFrame or None = None
+        self._values: np.ndarray = values
+        self._series: np.ndarray = np.ascontiguousarray(values.T - np.nanmean(values, axis=0)[:, None])
+        self._bounds: np.ndarray = np.linspace(0, window, segments + 1).round().astype(np.int64)
+        self._mean, self._std, means = _moments(self._series, window, self._bounds)
+        scale: np.ndarray = np.nanmax(np.abs(self._series), axis=1, keepdims=True)
+        self._constant: np.ndarray = self._std <= 1e-12 * np.maximum(scale, np.abs(self._mean))
+        self._embedding, self._norm = self._embed(means)
+
+    @classmethod
+    def from_frame(
+            cls,
+            candle_stick_frame: CandleStickFrame,
+            window: int,
+            features: list = None,
+            segments: int = 8,
+            scaler: any = None
+    ):
+        """
+        method to search the windows of features of a frame
+        :param candle_stick_frame: CandleStickFrame: candle sticks
+        :param window: int: bars per window
+        :param features: list: features of FeatureBuilder, e.g. ['close'] (default) or ['body_size', 'cs_body_ratio']
+        :param segments: int: see SimilaritySearch
+        :param scaler: scaler or None: see FeatureBuilder
+        :return: SimilaritySearch: search over the windows of the features
+        """
+        features = ['close'] if features is None else features
+        values: np.ndarray = FeatureBuilder(candle_stick_frame, features, scaler, np.float64).build()
+        search: SimilaritySearch = cls(values, window, segments)
+        search.candle_stick_frame = candle_stick_frame
+        return search
+
+    def __repr__(self):
+        return f'SimilaritySearch(windows={len(self)}, window={self.window}, segments={self.segments})'
+
+    def __len__(self):
+        return self._series.shape[1] - self.window + 1
+
+    def _embed(self, means: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        method to build the index, the mean of every segment of a z-normalized window scaled by the square root of the
+        segment length, so the distance of two embeddings never exceeds the distance of the windows
+        :param means: np.ndarray: segment means of the windows, shape (features, windows, segments)
+        :return: tuple: embeddings (float32), shape (windows, features * segments), and their squared norms (float64),
+                        nan for windows with missing bars
+        """
+        std: np.ndarray = np.where(self._constant, 1.0, self._std)[..., None]
+        value: np.ndarray = np.where(self._constant[..., None], 0.0, (means - self._mean[..., None]) / std)
+        value *= np.sqrt(np.diff(self._bounds))
+        embedding: np.ndarray = np.ascontiguousarray(value.transpose(1, 0, 2), dtype=np.float32).reshape(len(self), -1)
+        norm: np.ndarray = np.square(embedding, dtype=np.float64).sum(axis=1)
+        norm[np.isnan(self._std).any(axis=0)] = np.nan
+        return embedding, norm
+
+    def _query(self, query: np.ndarray or int) -> np.ndarray:
+        """
+        method to z-normalize a query
+        :param query: np.ndarray or int: query, shape (window,) or (window, features), or the bar its window ends at
+        :return: np.ndarray: z-normalized query, shape (features, window)
+        """
+        if isinstance(query, (int, np.integer)):
+            if not self.window - 1 <= query < self._series.shape[1]:
+                raise ValueError("query bar must be in [{}, {}) not {}".format(self.window - 1, self._series.shape[1],
+                                                                               query))
+            query = self._values[query - self.window + 1:query + 1]
+        query = np.asarray(query, dtype=np.float64)
+        if query.ndim == 1:
+            query = query[:, None]
+        if query.shape != (self.window, self._series.shape[0]):
+            raise ValueError("query must have the shape {} not {}".format((self.window, self._series.shape[0]),
+                                                                          query.shape))
+        if np.isnan(query).any():
+            raise ValueError("query must not contain nan")
+        return _znormalize(query.T)
+
+    def _exact(self, z_query: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """
+        method to compute the exact distance of the query to some windows
+        :param z_query: np.ndarray: z-normalized query, shape (features, window)
+        :param starts: np.ndarray: int first bars of the windows
+        :return: np.ndarray: distances
+        """
+        windows: np.ndarray = np.lib.stride_tricks.sliding_window_view(self._series, self.window, axis=1)[:, starts]
+        std: np.ndarray = np.where(self._constant[:, starts], 1.0, self._std[:, starts])[..., None]
+        z_windows: np.ndarray = np.where(self._constant[:, starts, None], 0.0,
+                                         (windows - self._mean[:, starts, None]) / std)
+        return np.sqrt(np.square(z_windows - z_query[:, None]).sum(axis=(0, 2)))
+
+    def _lower_bound(self, z_query: np.ndarray) -> np.ndarray:
+        """
+        method to compute the lower bound of the distance of the query to every window with the index
+        :param z_query: np.ndarray: z-normalized query, shape (features, window)
+        :return: np.ndarray: lower bounds, inf for windows with missing bars
+        """
+        segment: np.ndarray = np.stack([z_query[:, begin:end].sum(axis=1) / np.sqrt(end - begin)
+                                        for begin, end in zip(self._bounds[:-1], self._bounds[1:])], axis=1)
+        segment = segment.reshape(-1)
+        norm: float = float(segment @ segment)
+        squared: np.ndarray = self._norm - 2 * (self._embedding @ segment.astype(np.float32)) + norm
+        # the float32 embeddings are rounded, the lower bound is lowered by more than their rounding error
+        squared -= 1e-5 * (self._norm + norm) + 1e-9
+        return np.where(np.isnan(squared), np.inf, np.sqrt(np.maximum(squared, 0.0)))
+
+    def _select(self, lower: np.ndarray, exact: callable, k: int, exclusion: int) -> (np.ndarray, np.ndarray):
+        """
+        method to pick the k closest windows that are more than exclusion bars apart, the windows are checked in the
+        order of their lower bound until the k-th distance is not above the lower bound of every unchecked window
+        :param lower: np.ndarray: lower bound of every window, inf for excluded windows
+        :param exact: callable: int starts -> exact distances
+        :param k: int: number of windows
+        :param exclusion: int: minimal distance in bars of two picked windows
+        :return: tuple: starts and distances of the picked windows, sorted by distance
+        """
+        valid: int = int(np.isfinite(lower).sum())
+        size: int = min(valid, max(256, 8 * k))
+        while True:
+            if size < valid:
+                candidates: np.ndarray = np.argpartition(lower, size)[:size + 1]
+                candidates = candidates[np.argsort(lower[candidates], kind='stable')]
+                bound: float = float(lower[candidates[-1]])
+                candidates = candidates[:-1]
+            else:
+                candidates = np.argsort(lower, kind='stable')[:valid]
+                bound = np.inf
+            distances: np.ndarray = exact(candidates)
+            order: np.ndarray = np.argsort(distances, kind='stable')
+            starts: list = []
+            for i in order:
+                if np.isnan(distances[i]) or distances[i] > bound:
+                    break
+                if all(abs(candidates[i] - start) > exclusion for start in starts):
+                    starts.append(candidates[i])
+                    if len(starts) == k:
+                        break
+            picked: np.ndarray = np.array(starts, dtype=np.int64)
+            if len(starts) == k or size >= valid:
+                return picked, exact(picked) if len(picked) else np.empty(0)
+            size = min(valid, 4 * size)
+
+    def search(
+            self,
+            query: np.ndarray or int,
+            k: int = 10,
+            exclusion: int or None = None,
+            stop: int or None = None,
+            method: str = 'index'
+    ) -> pd.DataFrame:
+        """
+        method to find the windows most similar to a query
+        :param query: np.ndarray or int: query, shape (window,) or (window, features), or the bar the query window ends
+                      at, whose own neighbourhood (exclusion bars) is not returned
+        :param k: int: number of windows
+        :param exclusion: int or None: minimal distance in bars of two returned windows, None is window // 2
+        :param stop: int or None: only windows ending before this bar, e.g. the query bar to avoid looking ahead
+        :param method: str: 'index' (lower bound of the index and exact rerank) or 'exact' (distance profile via FFT),
+                       both return the same windows
+        :return: pd.DataFrame: bar (last bar of the window, the start of validation_kernel.outcome) and distance,
+                               sorted by distance
+        """
+        if method not in ['index', 'exact']:
+            raise ValueError('Invalid method: method must be "index" or "exact"')
+        if k < 1:
+            raise ValueError("k must be greater than 0")
+        exclusion = self.window // 2 if exclusion is None else exclusion
+        z_query: np.ndarray = self._query(query)
+        if method == 'exact':
+            profile: np.ndarray = distance_profile(z_query.T, self._values)[self.window - 1:]
+            lower: np.ndarray = np.where(np.isnan(profile), np.inf, profile)
+            exact: callable = lambda starts: profile[starts]
+        else:
+            lower: np.ndarray = self._lower_bound(z_query)
+            exact: callable = lambda starts: self._exact(z_query, starts)
+        if stop is not None:
+            lower[max(0, stop - self.window + 1):] = np.inf
+        if isinstance(query, (int, np.integer)):
+            own: int = query - self.window + 1
+            lower[max(0, own - exclusion):own + exclusion + 1] = np.inf
+        starts, distances = self._select(lower, exact, k, exclusion)
+        return pd.DataFrame(dict(bar=starts + self.window - 1, distance=distances))
+
+    def outcome(
+            self,
+            matches: pd.DataFrame,
+            type: str,
+            mode: str = 'atr',
+            past_window: int = 10,
+            wl_ratio: float = 1.618
+    ) -> pd.DataFrame:
+        """
+        method to validate the matches like hits of a pattern ending at their bar, see PatternValidator
+        :param matches: pd.DataFrame: result of search
+        :param type: str: 'bullish' or 'bearish'
+        :param mode: str: 'atr' or 'hl'
+        :param past_window: int: see PatternValidator
+        :param wl_ratio: float: see PatternValidator
+        :return: pd.DataFrame: matches with is_valid (1.0 valid, 0.0 invalid, nan unresolved) and v_iv_after
+        """
+        if self.candle_stick_frame is None:
+            raise ValueError("outcome needs a search built with from_frame")
+        frame: CandleStickFrame = self.candle_stick_frame
+        result: dict = outcome(frame.high, frame.low, frame.close, type, mode, past_window, wl_ratio,
+                               matches['bar'].to_numpy())
+        return matches.assign(is_valid=result['is_valid'], v_iv_after=result['v_iv_after'])
@@ -0,0 +1,163 @@
+# import
+import numpy as np
+from techan.core.candle_stick_frame import CandleStickFrame
+
+
+def sliding_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    function to look at the overlapping windows of a matrix without copying it
+    :param values: np.ndarray: matrix, shape (bars, features)
+    :param window: int: bars per window
+    :return: np.ndarray: read-only view, shape (bars - window + 1, window, features), window i ends at bar i + window - 1
+    """
+    values = np.asarray(values)
+    if values.ndim != 2:
+        raise ValueError("values must have the shape (bars, features) not {}".format(values.shape))
+    if not 1 <= window <= values.shape[0]:
+        raise ValueError("window must be in [1, {}] not {}".format(values.shape[0], window))
+    # sliding_window_view appends the window axis, moving it in front of the features keeps the view
+    return np.lib.stride_tricks.sliding_window_view(values, window, axis=0).transpose(0, 2, 1)
+
+
+class WindowDataset:
+    _normalizations: tuple = ('zscore', 'minmax', 'first')
+
+    def __init__(
+            self,
+            values: np.ndarray,
+            window: int,
+            target: np.ndarray or None = None,
+            normalize: str or None = None,
+            dtype: type = np.float32
+    ):
+        """
+        overlapping windows of a matrix for sequence models, the windows are a view of the matrix, only the
+        requested batches are copied (and normalized)
+        :param values: np.ndarray: matrix, shape (bars, features), e.g. of FeatureBuilder.build
+        :param window: int: bars per window
+        :param target: np.ndarray or None: one target per bar, the window ending at a bar gets its target
+        :param normalize: str or None: per window and feature, 'zscore' (mean 0, std 1), 'minmax' (range [0, 1]),
+                          'first' (relative change to the first bar of the window) or None
+        :param dtype: type: dtype of the batches
+        """
+        if normalize is not None and normalize not in self._normalizations:
+            raise ValueError('Invalid normalize: normalize must be "zscore", "minmax", "first" or None')
+        self.windows: np.ndarray = sliding_windows(values, window)
+        self.window: int = window
+        if target is not None:
+            target = np.asarray(target)
+            if len(target) != len(values):
+                raise ValueError("target must have one value per bar ({}) not {}".format(len(values), len(target)))
+            target = target[window - 1:]
+        self.target: np.ndarray or None = target
+        self.normalize: str or None = normalize
+        self.dtype: np.dtype = np.dtype(dtype)
+
+    @classmethod
+    def from_frame(
+            cls,
+            candle_stick_frame: CandleStickFrame,
+            window: int,
+            fields: tuple or list = ('open', 'high', 'low', 'close'),
+            target: np.ndarray or None = None,
+            normalize: str or None = None,
+            dtype: type = np.float32
+    ):
+        """
+        method to look at the windows of the columns of a frame, fields in the order of CandleStickFrame._fields
+        with equal steps (e.g. open, high, low, close) are a view of the frame, other selections are copied once
+        :param candle_stick_frame: CandleStickFrame: candle sticks
+        :param window: int: bars per window
+        :param fields: tuple or list: fields of the frame
+        :param target: np.ndarray or None: see WindowDataset
+        :param normalize: str or None: see WindowDataset
+        :param dtype: type: see WindowDataset
+        :return: WindowDataset: windows of the fields
+        """
+        unknown: set = set(fields) - set(CandleStickFrame._fields)
+        if unknown or not fields:
+            raise ValueError("fields must be of {} not {}".format(CandleStickFrame._fields, list(fields)))
+        rows: list = [CandleStickFrame._fields.index(field) for field in fields]
+        steps: set = set(np.diff(rows).tolist())
+        if len(rows) == 1 or (len(steps) == 1 and steps.pop() > 0):
+            step: int = rows[1] - rows[0] if len(rows) > 1 else 1
+            values: np.ndarray = candle_stick_frame.values[rows[0]:rows[-1] + 1:step]
+        else:
+            values: np.ndarray = candle_stick_frame.values[rows]
+        return cls(values.T, window, target, normalize, dtype)
+
+    def __repr__(self):
+        return f'WindowDataset(shape={self.shape}, normalize={self.normalize})'
+
+    def __len__(self):
+        return self.windows.shape[0]
+
+    @property
+    def shape(self) -> tuple:
+        """
+        forwards the shape of the windows
+        :return: tuple: windows, bars per window, features
+        """
+        return self.windows.shape
+
+    def _normalize(self, batch: np.ndarray) -> np.ndarray:
+        """
+        method to normalize every window of a batch per feature
+        :param batch: np.ndarray: windows, shape (windows, window, features), normalized in place
+        :return: np.ndarray: batch
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.normalize == 'zscore':
+                batch -= batch.mean(axis=1, keepdims=True)
+                std: np.ndarray = batch.std(axis=1, keepdims=True)
+                np.divide(batch, std, out=batch, where=std > 0)
+            elif self.normalize == 'minmax':
+                low: np.ndarray = batch.min(axis=1, keepdims=True)
+                batch -= low
+                span: np.ndarray = batch.max(axis=1, keepdims=True)
+                np.divide(batch, span, out=batch, where=span > 0)
+            elif self.normalize == 'first':
+                first: np.ndarray = batch[:, :1].copy()
+                batch /= first
+                batch -= 1
+        return batch
+
+    def __getitem__(self, index: int or slice or np.ndarray) -> np.ndarray:
+        """
+        method to copy and normalize windows
+        :param index: int, slice or np.ndarray: windows
+        :return: np.ndarray: windows, shape (window, features) for an int else (windows, window, features)
+        """
+        single: bool = isinstance(index, (int, np.integer))
+        # the statistics of the windows are computed in float64, the batch is cast afterwards
+        batch: np.ndarray = np.array(self.windows[[index] if single else index],
+                                     dtype=self.dtype if self.normalize is None else np.float64)
+        batch = self._normalize(batch).astype(self.dtype, copy=False)
+        return batch[0] if single else batch
+
+    def batches(self, batch_size: int = 256, shuffle: bool = False, seed: int or None = None,
+                drop_last: bool = False):
+        """
+        method to iterate over the windows in batches, e.g. for a training loop
+        :param batch_size: int: windows per batch
+        :param shuffle: bool: random order of the windows
+        :param seed: int or None: seed of the random order
+        :param drop_last: bool: skip the last batch if it has less than batch_size windows
+        :return: generator: (bars the windows end at, windows) or (bars, windows, targets) with a target
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than 0")
+        order: np.ndarray = np.arange(len(self))
+        if shuffle:
+            order = np.random.default_rng(seed).permutation(len(self))
+        stop: int = len(self) - len(self) % batch_size if drop_last else len(self)
+        for start in range(0, stop, batch_size):
+            index: np.ndarray = order[start:start + batch_size]
+            if not shuffle:
+                index = slice(start, min(stop, start + batch_size))
+            batch: np.ndarray = self[index]
+            bars: np.ndarray = order[start:start + batch_size] + self.window - 1
+            if self.target is None:
+                yield bars, batch
+            else:
+                yield bars, batch, self.target[index]
@@ -1 +1,9 @@
-from techan.indicator.time import Time
\ No newline at end of file
+from techan.indicator.time import Time
+from techan.indicator.moving_average import sma, ema
+from techan.indicator.rsi import rsi
+from techan.indicator.macd import macd
+from techan.indicator.bollinger import bollinger_bands
+from techan.indicator.vwap import vwap
+from techan.indicator.stochastic import stochastic
+from techan.indicator.graph import IndicatorGraph
+from techan.indicator.incremental import IncrementalATR, IncrementalPercentageChange, IncrementalTrend
@@ -1,10 +1,13 @@
+import numpy as np
 from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.kernel import float_dtype, rolling_sum, shift
 
 
 class ATR:
     def __init__(self, csf: CandleStickFrame, time_steps: int = 15):
         self.csf: CandleStickFrame = csf
         self.time_steps: int = time_steps
+        self._values: np.ndarray or None = None
 
     def compute(self, index: int) -> float:
         """
@@ -14,17 +17,41 @@ class ATR:
         """
         if index < self.time_steps:
             return None
-        index_counter: int = index - self.time_steps + 1
-        true_ranges: list = list()
-        for cs in self.csf[index - self.time_steps + 1:index + 1]:
-            variant_1: float = cs.cs_size()
-            variant_2: float = abs(cs.high - self.csf[index_counter - 1].close)
-            variant_3: float = abs(cs.low - self.csf[index_counter - 1].close)
-            true_ranges.append(max(variant_1, variant_2, variant_3))
-            index_counter -= 1
-        if self.time_steps != len(true_ranges):
-            raise Exception("ATR: time_steps != len(true_ranges)")
-        return sum(true_ranges) / self.time_steps
+        if self._values is None or len(self._values) != len(self.csf):
+            self._values = average_true_range(self.csf.high, self.csf.low, self.csf.close, self.time_steps)
+        return float(self._values[index])
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    function to compute the true range, the first bar has no previous close and is nan
+    :param high: np.ndarray: highs, time is the last axis
+    :param low: np.ndarray: lows, time is the last axis
+    :param close: np.ndarray: close prices, time is the last axis
+    :return: np.ndarray: true range, float32 for float32 prices
+    """
+    dtype: np.dtype = float_dtype(high, low, close)
+    high = np.asarray(high, dtype=dtype)
+    low = np.asarray(low, dtype=dtype)
+    previous_close: np.ndarray = shift(np.asarray(close, dtype=dtype), 1)
+    variant_1: np.ndarray = high - low
+    variant_2: np.ndarray = np.abs(high - previous_close)
+    variant_3: np.ndarray = np.abs(low - previous_close)
+    return np.maximum(variant_1, np.maximum(variant_2, variant_3))
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, time_steps: int = 15) -> np.ndarray:
+    """
+    function to compute the ATR as mean of the last time_steps true ranges
+    :param high: np.ndarray: highs, time is the last axis
+    :param low: np.ndarray: lows, time is the last axis
+    :param close: np.ndarray: close prices, time is the last axis
+    :param time_steps: int: time_steps to consider
+    :return: np.ndarray: ATR, float32 for float32 prices, nan for the first time_steps bars and windows with
+                         missing bars
+    """
+    return rolling_sum(true_range(high, low, close), time_steps) / time_steps
+
 
 def atr(csf: CandleStickFrame, time_steps: int = 15) -> list:
     """
@@ -33,10 +60,5 @@ def atr(csf: CandleStickFrame, time_steps: int = 15) -> list:
     :param time_steps: int: time_steps to consider
     :return: list: list of ATR values
     """
-    res: list = list()
-    atr_obj: ATR = ATR(csf, time_steps)
-    for index in range(len(csf)):
-        print(index)
-        res.append(atr_obj.compute(index))
-    return res
-
+    values: np.ndarray = average_true_range(csf.high, csf.low, csf.close, time_steps)
+    return [None if np.isnan(value) else value for value in values.tolist()]
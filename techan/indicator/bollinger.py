@@ -0,0 +1,20 @@
+# import
+import numpy as np
+from techan.indicator.kernel import float_dtype, rolling_std
+from techan.indicator.moving_average import sma
+
+
+def bollinger_bands(close: np.ndarray, window: int = 20, k: float = 2.0) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    function to compute the Bollinger bands, the SMA plus / minus k population standard deviations
+    :param close: np.ndarray: close prices, time is the last axis
+    :param window: int: number of bars
+    :param k: float: width of the bands in standard deviations
+    :return: tuple: middle, upper and lower band, float32 for float32 prices, nan for the first window - 1 bars and
+                    windows with missing bars
+    """
+    dtype: np.dtype = float_dtype(close)
+    close = np.asarray(close, dtype=np.float64)
+    middle: np.ndarray = sma(close, window)
+    width: np.ndarray = k * rolling_std(close, window)
+    return tuple(value.astype(dtype, copy=False) for value in (middle, middle + width, middle - width))
@@ -0,0 +1,228 @@
+# import
+import numpy as np
+from collections import OrderedDict
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.atr import true_range
+from techan.indicator.kernel import exponential_average, rolling_max, rolling_min, rolling_std, rolling_sum
+from techan.indicator.moving_average import sma
+from techan.indicator.rsi import rsi
+from techan.indicator.stochastic import stochastic_from_range
+from techan.indicator.vwap import vwap
+
+
+def _atr(tr: np.ndarray, window: int, wilder: bool) -> np.ndarray:
+    # simple ATR like average_true_range or Wilder's smoothing of the true range
+    return exponential_average(tr, window, 1 / window) if wilder else rolling_sum(tr, window) / window
+
+
+def _macd(fast: np.ndarray, slow: np.ndarray, signal: int) -> tuple:
+    # MACD line, signal line and histogram like macd
+    line: np.ndarray = fast - slow
+    signal_line: np.ndarray = exponential_average(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def _bands(middle: np.ndarray, width: np.ndarray, multiplier: float) -> tuple:
+    # middle, upper and lower band of Bollinger / Keltner channels
+    return middle, middle + multiplier * width, middle - multiplier * width
+
+
+def _past_high_low(highest: np.ndarray, lowest: np.ndarray, past_window: int) -> tuple:
+    # the validator starts one bar later than the rolling window, see validation_kernel.past_high_low
+    past_high: np.ndarray = np.array(highest, dtype=np.float64)
+    past_low: np.ndarray = np.array(lowest, dtype=np.float64)
+    past_high[..., :past_window + 1] = np.nan
+    past_low[..., :past_window + 1] = np.nan
+    return past_high, past_low
+
+
+# name -> (default parameters, inputs (name, parameters) of the parameters, function of the inputs and the parameters)
+# the columns of the frame (CandleStickFrame._fields) are inputs without a node
+NODES: dict = {
+    'true_range': (dict(), lambda p: [('high', {}), ('low', {}), ('close', {})],
+                   lambda high, low, close: true_range(high, low, close)),
+    'atr': (dict(window=14, wilder=False), lambda p: [('true_range', {})],
+            lambda tr, window, wilder: _atr(tr, window, wilder)),
+    'sma': (dict(window=20, source='close'), lambda p: [(p['source'], {})],
+            lambda values, window, source: sma(values, window)),
+    'ema': (dict(window=20, wilder=False, source='close'), lambda p: [(p['source'], {})],
+            lambda values, window, wilder, source: exponential_average(values, window, 1 / window if wilder else None)),
+    'rolling_std': (dict(window=20, source='close'), lambda p: [(p['source'], {})],
+                    lambda values, window, source: rolling_std(values, window)),
+    'rolling_max': (dict(window=14, source='high'), lambda p: [(p['source'], {})],
+                    lambda values, window, source: rolling_max(values, window)),
+    'rolling_min': (dict(window=14, source='low'), lambda p: [(p['source'], {})],
+                    lambda values, window, source: rolling_min(values, window)),
+    'rsi': (dict(window=14), lambda p: [('close', {})], lambda close, window: rsi(close, window)),
+    'macd': (dict(fast=12, slow=26, signal=9), lambda p: [('ema', dict(window=p['fast'])),
+                                                          ('ema', dict(window=p['slow']))],
+             lambda fast_ema, slow_ema, fast, slow, signal: _macd(fast_ema, slow_ema, signal)),
+    'bollinger_bands': (dict(window=20, k=2.0), lambda p: [('sma', dict(window=p['window'])),
+                                                           ('rolling_std', dict(window=p['window']))],
+                        lambda middle, std, window, k: _bands(middle, std, k)),
+    'keltner': (dict(window=20, atr_window=10, multiplier=2.0), lambda p: [('ema', dict(window=p['window'])),
+                                                                           ('atr', dict(window=p['atr_window']))],
+                lambda middle, atr, window, atr_window, multiplier: _bands(middle, atr, multiplier)),
+    'stochastic': (dict(k_window=14, d_window=3, smooth=1),
+                   lambda p: [('rolling_max', dict(window=p['k_window'])), ('rolling_min', dict(window=p['k_window'])),
+                              ('close', {})],
+                   lambda highest, lowest, close, k_window, d_window, smooth:
+                   stochastic_from_range(highest, lowest, close, d_window, smooth)),
+    'vwap': (dict(window=None), lambda p: [('high', {}), ('low', {}), ('close', {}), ('volume', {})],
+             lambda high, low, close, volume, window: vwap(high, low, close, volume, window)),
+    'past_high_low': (dict(past_window=10), lambda p: [('rolling_max', dict(window=p['past_window'])),
+                                                       ('rolling_min', dict(window=p['past_window']))],
+                      lambda highest, lowest, past_window: _past_high_low(highest, lowest, past_window)),
+}
+
+
+class IndicatorGraph:
+    def __init__(self, candle_stick_frame: CandleStickFrame, max_bytes: int = 1 << 28):
+        """
+        memoized indicators of a frame, every node declares its inputs, so nodes shared by several indicators (true
+        range, EMAs, rolling high / low, ...) are computed once, the results are cached keyed by name and parameters
+        and the least recently used ones are evicted above max_bytes, use IndicatorGraph.of to share one graph per frame
+        :param candle_stick_frame: CandleStickFrame: candle sticks
+        :param max_bytes: int: memory budget of the cached results
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be positive not {}".format(max_bytes))
+        self.candle_stick_frame: CandleStickFrame = candle_stick_frame
+        self.max_bytes: int = max_bytes
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._cache: OrderedDict = OrderedDict()  # (name, parameters) -> (result, bytes)
+        self._length: int = len(candle_stick_frame)
+
+    @classmethod
+    def of(cls, candle_stick_frame: CandleStickFrame, max_bytes: int or None = None):
+        """
+        method to forward the graph cached on a frame, it is dropped when the frame grows
+        :param candle_stick_frame: CandleStickFrame: candle sticks
+        :param max_bytes: int or None: memory budget, None keeps the budget of an existing graph
+        :return: IndicatorGraph: graph of the frame
+        """
+        graph: IndicatorGraph or None = candle_stick_frame._indicators
+        if graph is None:
+            graph = cls(candle_stick_frame) if max_bytes is None else cls(candle_stick_frame, max_bytes)
+            candle_stick_frame._indicators = graph
+        elif max_bytes is not None:
+            graph.max_bytes = max_bytes
+            graph._evict()
+        return graph
+
+    @staticmethod
+    def register(name: str, defaults: dict, inputs: callable, function: callable) -> None:
+        """
+        method to declare an indicator
+        :param name: str: name of the node
+        :param defaults: dict: default parameters
+        :param inputs: callable: parameters -> list of (input name, input parameters)
+        :param function: callable: (input results..., **parameters) -> np.ndarray or tuple of np.ndarray
+        :return: None
+        """
+        if name in CandleStickFrame._fields:
+            raise ValueError("{} is a column of the frame".format(name))
+        NODES[name] = (dict(defaults), inputs, function)
+        return None
+
+    def __repr__(self):
+        return f'IndicatorGraph(nodes={len(self._cache)}, nbytes={self.nbytes}, max_bytes={self.max_bytes})'
+
+    def __contains__(self, request: tuple) -> bool:
+        name, parameters = request
+        return self._key(name, parameters) in self._cache
+
+    @staticmethod
+    def _key(name: str, parameters: dict) -> tuple:
+        """
+        method to complete the parameters of a node and to build its cache key
+        :param name: str: name of the node
+        :param parameters: dict: parameters, missing ones are taken from the defaults
+        :return: tuple: name and sorted (parameter, value) pairs
+        """
+        if name not in NODES:
+            raise ValueError("unknown indicator {}".format(name))
+        defaults: dict = NODES[name][0]
+        unknown: set = set(parameters) - set(defaults)
+        if unknown:
+            raise ValueError("unknown parameters {} for indicator {}".format(sorted(unknown), name))
+        return name, tuple(sorted(dict(defaults, **parameters).items()))
+
+    def get(self, name: str, **parameters) -> np.ndarray or tuple:
+        """
+        method to compute an indicator and its inputs, cached results are reused
+        :param name: str: name of the node (see NODES) or column of the frame
+        :param parameters: any: parameters of the node, e.g. window=14
+        :return: np.ndarray or tuple: read-only result, time is the last axis
+        """
+        if len(self.candle_stick_frame) != self._length:
+            self.clear()
+            self._length = len(self.candle_stick_frame)
+        if name in CandleStickFrame._fields:
+            return getattr(self.candle_stick_frame, name)
+        key: tuple = self._key(name, parameters)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key][0]
+        self.misses += 1
+        _, inputs, function = NODES[name]
+        complete: dict = dict(key[1])
+        values: list = [self.get(input_name, **input_parameters) for input_name, input_parameters in inputs(complete)]
+        result: np.ndarray or tuple = function(*values, **complete)
+        arrays: tuple = result if isinstance(result, tuple) else (result,)
+        for array in arrays:
+            array.flags.writeable = False
+        size: int = sum(array.nbytes for array in arrays)
+        if size <= self.max_bytes:
+            self._cache[key] = (result, size)
+            self.nbytes += size
+            self._evict()
+        return result
+
+    def levels(self, mode: str, past_window: int) -> tuple or np.ndarray:
+        """
+        method to forward the levels of the barriers of PatternValidator, see validation_kernel.barriers
+        :param mode: str: 'atr' or 'hl'
+        :param past_window: int: bars of the ATR or of the past high / low
+        :return: tuple or np.ndarray: past high and low ('hl') or ATR ('atr')
+        """
+        if mode not in ['atr', 'hl']:
+            raise ValueError('Invalid mode: mode must be "atr" or "hl"')
+        if mode == 'hl':
+            return self.get('past_high_low', past_window=past_window)
+        return self.get('atr', window=past_window)
+
+    def compute(self, requests: list) -> dict:
+        """
+        method to compute several indicators, their shared inputs are computed once
+        :param requests: list: names or (name, parameters)
+        :return: dict: request (name or (name, sorted parameter tuple)) -> result
+        """
+        result: dict = dict()
+        for request in requests:
+            name, parameters = (request, dict()) if isinstance(request, str) else request
+            result[name if isinstance(request, str) else (name, tuple(sorted(parameters.items())))] = \
+                self.get(name, **parameters)
+        return result
+
+    def _evict(self) -> None:
+        """
+        method to drop the least recently used results until the cache fits into max_bytes
+        :return: None
+        """
+        while self.nbytes > self.max_bytes and self._cache:
+            _, (_, size) = self._cache.popitem(last=False)
+            self.nbytes -= size
+        return None
+
+    def clear(self) -> None:
+        """
+        method to drop all cached results
+        :return: None
+        """
+        self._cache.clear()
+        self.nbytes = 0
+        return None
@@ -0,0 +1,177 @@
+# import
+import math
+import numpy as np
+from collections import deque
+from techan.core.candle_stick_frame import CandleStickFrame
+
+
+class _RollingSum:
+    def __init__(self, window: int):
+        # running prefix sum and the prefixes of the last window bars, the same float64 operations as rolling_sum
+        if window < 1:
+            raise ValueError("window must be greater than 0")
+        self.window: int = window
+        self._prefix: float = 0.0
+        self._missing: int = 0
+        self._prefixes: deque = deque([(0.0, 0)], maxlen=window + 1)
+
+    def push(self, value: float) -> float:
+        """
+        method to add the value of the next bar
+        :param value: float: value, nan if missing
+        :return: float: sum of the last window bars, nan before window bars and for windows with missing bars
+        """
+        if math.isnan(value):
+            self._missing += 1
+        else:
+            self._prefix += value
+        self._prefixes.append((self._prefix, self._missing))
+        if len(self._prefixes) <= self.window:
+            return math.nan
+        (first, first_missing), (last, last_missing) = self._prefixes[0], self._prefixes[-1]
+        return math.nan if last_missing > first_missing else last - first
+
+
+class _Incremental:
+    def __init__(self, warm_up: int, dtype: type = np.float64):
+        # bars until the first value and dtype of the values like the batch version on a frame of that dtype
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise TypeError("dtype must be np.float32 or np.float64 not {}".format(dtype))
+        self.warm_up: int = warm_up
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.count: int = 0
+        self.value: float = math.nan
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(count={self.count}, value={self.value}, is_ready={self.is_ready})'
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        forwards whether the warm up is over, later values can still be nan for missing bars
+        :return: bool: True after warm_up bars
+        """
+        return self.count >= self.warm_up
+
+    def _push(self, open: float, high: float, low: float, close: float) -> float:
+        raise NotImplementedError
+
+    def update(self, candle_stick: any) -> float:
+        """
+        method to add the next bar in O(1)
+        :param candle_stick: CandleStick: next bar (or any object with open, high, low and close)
+        :return: float: value at the bar, equal to the batch version at the same index, nan during the warm up
+        """
+        self.value = self._push(candle_stick.open, candle_stick.high, candle_stick.low, candle_stick.close)
+        self.count += 1
+        return self.value
+
+    def extend(self, candle_stick_frame: CandleStickFrame) -> np.ndarray:
+        """
+        method to add all bars of a frame, e.g. the history before a live feed
+        :param candle_stick_frame: CandleStickFrame: next bars
+        :return: np.ndarray: value at every bar
+        """
+        values: list = []
+        for open, high, low, close in zip(candle_stick_frame.open.tolist(), candle_stick_frame.high.tolist(),
+                                          candle_stick_frame.low.tolist(), candle_stick_frame.close.tolist()):
+            self.value = self._push(open, high, low, close)
+            self.count += 1
+            values.append(self.value)
+        return np.array(values, dtype=self.dtype)
+
+
+class IncrementalATR(_Incremental):
+    def __init__(self, time_steps: int = 15, wilder: bool = False, dtype: type = np.float64):
+        """
+        ATR updated bar by bar with constant state
+        the simple ATR keeps the prefix sums of the last time_steps true ranges and equals average_true_range exactly,
+        Wilder's ATR is seeded with the mean of the first time_steps true ranges and equals
+        IndicatorGraph.get('atr', wilder=True) up to the rounding of the batch recurrence
+        :param time_steps: int: number of bars
+        :param wilder: bool: Wilder's smoothing instead of the simple mean
+        :param dtype: type: dtype of the frame the batch version runs on
+        """
+        super().__init__(time_steps + 1, dtype)
+        self.time_steps: int = time_steps
+        self.wilder: bool = wilder
+        self._sum: _RollingSum = _RollingSum(time_steps)
+        self._previous_close: float = math.nan
+        self._seed: list = []  # true ranges until Wilder's average is seeded
+        self._average: float = math.nan
+
+    def _true_range(self, high: float, low: float, close: float) -> float:
+        """
+        method to compute the true range of the next bar in the dtype of the frame like true_range
+        :return: float: true range, nan for the first bar
+        """
+        scalar: type = self.dtype.type
+        high, low, previous_close = scalar(high), scalar(low), scalar(self._previous_close)
+        self._previous_close = close
+        return float(np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close))))
+
+    def _push(self, open: float, high: float, low: float, close: float) -> float:
+        true_range: float = self._true_range(high, low, close)
+        scalar: type = self.dtype.type
+        if not self.wilder:
+            return float(scalar(self._sum.push(true_range)) / scalar(self.time_steps))
+        if math.isnan(true_range):
+            # missing bars are skipped like in exponential_average
+            return math.nan
+        if len(self._seed) < self.time_steps:
+            self._seed.append(true_range)
+            if len(self._seed) < self.time_steps:
+                return math.nan
+            self._average = float(np.mean(self._seed))
+        else:
+            alpha: float = 1 / self.time_steps
+            self._average = (1 - alpha) * self._average + alpha * true_range
+        return float(scalar(self._average))
+
+    @property
+    def is_ready(self) -> bool:
+        if self.wilder:
+            return len(self._seed) >= self.time_steps
+        return self.count >= self.warm_up
+
+
+class IncrementalPercentageChange(_Incremental):
+    def __init__(self, dtype: type = np.float64):
+        """
+        percentual change of the close prices updated bar by bar, equals percentage_change
+        :param dtype: type: dtype of the frame the batch version runs on
+        """
+        super().__init__(2, dtype)
+        self._previous_close: float = math.nan
+
+    def _push(self, open: float, high: float, low: float, close: float) -> float:
+        scalar: type = self.dtype.type
+        close, previous_close = scalar(close), scalar(self._previous_close)
+        self._previous_close = float(close)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float((close - previous_close) / previous_close)
+
+
+class IncrementalTrend(_Incremental):
+    def __init__(self, window: int = 10, dtype: type = np.float64):
+        """
+        trend of the bodies (see body_trend and CandleStickPattern.trend) updated bar by bar with the prefix sums of the
+        last window bodies, equals body_trend exactly
+        the value of a bar is the trend over the window bars before it, upcoming is the trend including the last bar
+        :param window: int: number of bars
+        :param dtype: type: dtype of the frame the batch version runs on
+        """
+        super().__init__(window + 1, dtype)
+        self.window: int = window
+        self._body: _RollingSum = _RollingSum(window)
+        self._size: _RollingSum = _RollingSum(window)
+        self.upcoming: float = math.nan
+
+    def _push(self, open: float, high: float, low: float, close: float) -> float:
+        value: float = self.upcoming
+        body: float = float(close) - float(open)
+        total: float = self._body.push(body)
+        size: float = self._size.push(abs(body))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.upcoming = float(self.dtype.type(np.float64(total) / np.float64(size)))
+        return value
@@ -0,0 +1,201 @@
+# import
+import numpy as np
+
+
+def float_dtype(*values: np.ndarray) -> np.dtype:
+    """
+    function to determine the dtype of a series derived from the given ones
+    float32 inputs give a float32 series, everything else float64
+    :param values: np.ndarray: input series
+    :return: np.dtype: float32 or float64
+    """
+    if all(np.asarray(value).dtype == np.float32 for value in values):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def shift(values: np.ndarray, steps: int, fill_value: float = np.nan) -> np.ndarray:
+    """
+    function to shift a series along the last axis, the freed bars are filled with fill_value
+    :param values: np.ndarray: series, time is the last axis
+    :param steps: int: bars to shift, positive moves values to later bars
+    :param fill_value: float: value of the freed bars
+    :return: np.ndarray: shifted series
+    """
+    values = np.asarray(values)
+    result: np.ndarray = np.full(values.shape, fill_value, dtype=np.result_type(values, fill_value))
+    if steps == 0:
+        result[...] = values
+    elif 0 < steps < values.shape[-1]:
+        result[..., steps:] = values[..., :-steps]
+    elif -values.shape[-1] < steps < 0:
+        result[..., :steps] = values[..., -steps:]
+    return result
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    function to compute the rolling sum over the last window bars with prefix sums
+    the first window - 1 bars and every window containing nan are nan
+    the prefix sums are accumulated in float64, the result has the dtype of float_dtype(values)
+    :param values: np.ndarray: series, time is the last axis
+    :param window: int: number of bars
+    :return: np.ndarray: rolling sum
+    """
+    if window < 1:
+        raise ValueError("window must be greater than 0")
+    dtype: np.dtype = float_dtype(values)
+    values = np.asarray(values, dtype=np.float64)
+    missing: np.ndarray = np.isnan(values)
+    shape: tuple = values.shape[:-1] + (1,)
+    prefix: np.ndarray = np.concatenate(
+        [np.zeros(shape), np.cumsum(np.where(missing, 0.0, values), axis=-1)], axis=-1
+    )
+    missing_prefix: np.ndarray = np.concatenate(
+        [np.zeros(shape, dtype=np.int64), np.cumsum(missing, axis=-1)], axis=-1
+    )
+    result: np.ndarray = np.full(values.shape, np.nan)
+    if window <= values.shape[-1]:
+        total: np.ndarray = prefix[..., window:] - prefix[..., :-window]
+        incomplete: np.ndarray = (missing_prefix[..., window:] - missing_prefix[..., :-window]) > 0
+        result[..., window - 1:] = np.where(incomplete, np.nan, total)
+    return result.astype(dtype, copy=False)
+
+
+def _rolling_reduce(values: np.ndarray, window: int, function: np.ufunc) -> np.ndarray:
+    """
+    function to reduce the last window bars with an associative ufunc in O(n) independent of the window (van Herk /
+    Gil-Werman), the bars are split into blocks of window bars, a window is the suffix of one block combined with the
+    prefix of the next one
+    :param values: np.ndarray: series (float64), time is the last axis
+    :param window: int: number of bars
+    :param function: np.ufunc: e.g. np.maximum, np.fmin or np.add
+    :return: np.ndarray: reduction of the window ending at every bar, nan for the first window - 1 bars
+    """
+    if window < 1:
+        raise ValueError("window must be greater than 0")
+    n: int = values.shape[-1]
+    result: np.ndarray = np.full(values.shape, np.nan)
+    if window > n:
+        return result
+    blocks: int = -(-n // window)
+    padded: np.ndarray = np.zeros(values.shape[:-1] + (blocks * window,))
+    padded[..., :n] = values
+    padded = padded.reshape(values.shape[:-1] + (blocks, window))
+    prefix: np.ndarray = function.accumulate(padded, axis=-1).reshape(values.shape[:-1] + (-1,))
+    suffix: np.ndarray = function.accumulate(padded[..., ::-1], axis=-1)[..., ::-1].reshape(values.shape[:-1] + (-1,))
+    head: np.ndarray = suffix[..., :n - window + 1]
+    tail: np.ndarray = prefix[..., window - 1:n]
+    # a window starting at a block start is the whole block
+    aligned: np.ndarray = np.arange(n - window + 1) % window == 0
+    result[..., window - 1:] = np.where(aligned, tail, function(head, tail))
+    return result
+
+
+def rolling_max(values: np.ndarray, window: int, skipna: bool = False) -> np.ndarray:
+    """
+    function to compute the maximum over the last window bars in O(n) independent of the window
+    :param values: np.ndarray: series, time is the last axis
+    :param window: int: number of bars
+    :param skipna: bool: ignore missing bars (nan only if the whole window is missing), else windows with nan are nan
+    :return: np.ndarray: rolling maximum, dtype of float_dtype(values), nan for the first window - 1 bars
+    """
+    dtype: np.dtype = float_dtype(values)
+    values = np.asarray(values, dtype=np.float64)
+    return _rolling_reduce(values, window, np.fmax if skipna else np.maximum).astype(dtype, copy=False)
+
+
+def rolling_min(values: np.ndarray, window: int, skipna: bool = False) -> np.ndarray:
+    """
+    function to compute the minimum over the last window bars in O(n) independent of the window
+    :param values: np.ndarray: series, time is the last axis
+    :param window: int: number of bars
+    :param skipna: bool: ignore missing bars (nan only if the whole window is missing), else windows with nan are nan
+    :return: np.ndarray: rolling minimum, dtype of float_dtype(values), nan for the first window - 1 bars
+    """
+    dtype: np.dtype = float_dtype(values)
+    values = np.asarray(values, dtype=np.float64)
+    return _rolling_reduce(values, window, np.fmin if skipna else np.minimum).astype(dtype, copy=False)
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """
+    function to compute the standard deviation over the last window bars in O(n)
+    the sums only run over the bars of a window (see _rolling_reduce) and the series is centered first, so flat
+    windows of long series keep their precision unlike with prefix sums
+    :param values: np.ndarray: series, time is the last axis
+    :param window: int: number of bars
+    :param ddof: int: delta degrees of freedom, 0 population, 1 sample standard deviation
+    :return: np.ndarray: rolling standard deviation, dtype of float_dtype(values), nan for the first window - 1 bars
+             and windows with missing bars
+    """
+    if window - ddof < 1:
+        raise ValueError("window must be greater than ddof")
+    dtype: np.dtype = float_dtype(values)
+    values = np.asarray(values, dtype=np.float64)
+    if values.size and not np.isnan(values).all():
+        values = values - np.nanmean(values, axis=-1, keepdims=True)
+    mean: np.ndarray = _rolling_reduce(values, window, np.add) / window
+    squares: np.ndarray = _rolling_reduce(values * values, window, np.add)
+    variance: np.ndarray = np.maximum(squares - window * mean * mean, 0.0) / (window - ddof)
+    return np.sqrt(variance).astype(dtype, copy=False)
+
+
+def _linear_recurrence(values: np.ndarray, decay: float) -> np.ndarray:
+    """
+    function to solve y[t] = decay * y[t - 1] + values[t] (y[-1] = 0) along the last axis in O(n)
+    blocks are solved in closed form with powers of decay not below 1e-2, the values at the block ends form the same
+    recurrence with decay ** block, which is solved recursively
+    :param values: np.ndarray: 2d inputs (float64), time is the last axis
+    :param decay: float: decay in [0, 1)
+    :return: np.ndarray: y
+    """
+    n: int = values.shape[-1]
+    if decay == 0 or n < 2:
+        return values.copy()
+    block: int = int(np.log(1e-2) / np.log(decay))
+    if block < 2:
+        # decay ** k is below the float64 resolution after a few terms
+        result: np.ndarray = values.copy()
+        for k in range(1, min(n, int(np.ceil(np.log(1e-17) / np.log(decay))))):
+            result[:, k:] += decay ** k * values[:, :-k]
+        return result
+    blocks: int = -(-n // block)
+    padded: np.ndarray = np.zeros((values.shape[0], blocks * block))
+    padded[:, :n] = values
+    padded = padded.reshape(values.shape[0], blocks, block)
+    powers: np.ndarray = decay ** np.arange(block)
+    local: np.ndarray = np.cumsum(padded / powers, axis=-1) * powers
+    end: np.ndarray = _linear_recurrence(local[..., -1], decay ** block)
+    previous: np.ndarray = np.zeros(end.shape)
+    previous[:, 1:] = end[:, :-1]
+    local += previous[..., None] * (decay * powers)
+    return local.reshape(values.shape[0], -1)[:, :n]
+
+
+def exponential_average(values: np.ndarray, window: int, alpha: float or None = None) -> np.ndarray:
+    """
+    function to compute the exponential moving average in O(n), seeded with the mean of the first window bars
+    missing bars are skipped (the average carries over them) and are nan
+    :param values: np.ndarray: series, time is the last axis
+    :param window: int: number of bars of the seed
+    :param alpha: float or None: smoothing factor, None is 2 / (window + 1), 1 / window is Wilder's smoothing
+    :return: np.ndarray: exponential moving average, dtype of float_dtype(values), nan until window bars are present
+    """
+    if window < 1:
+        raise ValueError("window must be greater than 0")
+    alpha = 2 / (window + 1) if alpha is None else alpha
+    if not 0 < alpha <= 1:
+        raise ValueError("alpha must be in (0, 1] not {}".format(alpha))
+    dtype: np.dtype = float_dtype(values)
+    values = np.asarray(values, dtype=np.float64)
+    result: np.ndarray = np.full(values.shape, np.nan)
+    rows: np.ndarray = values.reshape(-1, values.shape[-1]) if values.size else values.reshape(0, 0)
+    for row, out in zip(rows, result.reshape(rows.shape)):
+        present: np.ndarray = np.flatnonzero(~np.isnan(row))
+        if len(present) < window:
+            continue
+        inputs: np.ndarray = alpha * row[present[window - 1:]]
+        inputs[0] = row[present[:window]].mean()
+        out[present[window - 1:]] = _linear_recurrence(inputs[None], 1 - alpha)[0]
+    return result.astype(dtype, copy=False)
@@ -0,0 +1,22 @@
+# import
+import numpy as np
+from techan.indicator.kernel import exponential_average, float_dtype
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    function to compute the moving average convergence divergence
+    :param close: np.ndarray: close prices, time is the last axis
+    :param fast: int: bars of the fast EMA
+    :param slow: int: bars of the slow EMA
+    :param signal: int: bars of the EMA of the MACD line
+    :return: tuple: MACD line (fast - slow EMA, nan for the first slow - 1 bars), signal line (nan for the first
+                    slow + signal - 2 bars) and histogram (MACD - signal), float32 for float32 prices
+    """
+    if fast >= slow:
+        raise ValueError("fast must be less than slow not {} >= {}".format(fast, slow))
+    dtype: np.dtype = float_dtype(close)
+    close = np.asarray(close, dtype=np.float64)
+    line: np.ndarray = exponential_average(close, fast) - exponential_average(close, slow)
+    signal_line: np.ndarray = exponential_average(line, signal)
+    return tuple(value.astype(dtype, copy=False) for value in (line, signal_line, line - signal_line))
@@ -0,0 +1,26 @@
+# import
+import numpy as np
+from techan.indicator.kernel import exponential_average, float_dtype, rolling_sum
+
+
+def sma(values: np.ndarray, window: int = 20) -> np.ndarray:
+    """
+    function to compute the simple moving average over the last window bars
+    :param values: np.ndarray: series, e.g. close prices, time is the last axis
+    :param window: int: number of bars
+    :return: np.ndarray: SMA, float32 for float32 prices, nan for the first window - 1 bars and windows with missing
+                         bars
+    """
+    return (rolling_sum(values, window) / window).astype(float_dtype(values), copy=False)
+
+
+def ema(values: np.ndarray, window: int = 20, wilder: bool = False) -> np.ndarray:
+    """
+    function to compute the exponential moving average, seeded with the SMA of the first window bars
+    :param values: np.ndarray: series, e.g. close prices, time is the last axis
+    :param window: int: number of bars, the smoothing factor is 2 / (window + 1)
+    :param wilder: bool: Wilder's smoothing with the factor 1 / window (RSI, Wilder ATR)
+    :return: np.ndarray: EMA, float32 for float32 prices, nan until window bars are present, missing bars are skipped
+                         and nan
+    """
+    return exponential_average(values, window, 1 / window if wilder else None)
@@ -1,5 +1,19 @@
+import numpy as np
 from techan.core.candle_stick_frame import CandleStickFrame
-from techan.core.candle_stick import CandleStick
+from techan.indicator.kernel import float_dtype, shift
+
+
+def percentage_change(close: np.ndarray) -> np.ndarray:
+    """
+    function to calculate the percentual change of the close prices from one bar to the next
+    :param close: np.ndarray: close prices, time is the last axis
+    :return: np.ndarray: percentual changes, float32 for float32 prices, the first bar is nan
+    """
+    close = np.asarray(close, dtype=float_dtype(close))
+    previous_close: np.ndarray = shift(close, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close - previous_close) / previous_close
+
 
 def p_change(csf: CandleStickFrame) -> list:
     """
@@ -7,15 +21,7 @@ def p_change(csf: CandleStickFrame) -> list:
     :param csf: CandleStickFrame: CandleStickFrame of interest
     :return: list: list of percentual changes
     """
-    cs_m1: CandleStick or None = None
-    res: list = list()
-    for cs in csf:
-        if cs_m1 is not None:
-            change = cs.close - cs_m1.close
-            percentual_change = change / cs_m1.close
-            res.append(percentual_change)
-        else:
-            res.append(None)
-        cs_m1 = cs
+    res: list = percentage_change(csf.close).tolist()
+    if res:
+        res[0] = None
     return res
-
@@ -0,0 +1,24 @@
+# import
+import numpy as np
+from techan.indicator.kernel import exponential_average, float_dtype, shift
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    function to compute the relative strength index with Wilder's smoothing of the gains and losses
+    :param close: np.ndarray: close prices, time is the last axis
+    :param window: int: number of bars
+    :return: np.ndarray: RSI in [0, 100] (100 without losses, 50 without any change), float32 for float32 prices,
+                         nan for the first window bars and bars with a missing close
+    """
+    dtype: np.dtype = float_dtype(close)
+    close = np.asarray(close, dtype=np.float64)
+    change: np.ndarray = close - shift(close, 1)
+    # clip keeps the missing changes nan, the averages skip them
+    gain: np.ndarray = exponential_average(np.clip(change, 0.0, None), window, 1 / window)
+    loss: np.ndarray = exponential_average(np.clip(-change, 0.0, None), window, 1 / window)
+    total: np.ndarray = gain + loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result: np.ndarray = np.where(total > 0, 100 * gain / total, 50.0)
+    result[np.isnan(total)] = np.nan
+    return result.astype(dtype, copy=False)
@@ -0,0 +1,58 @@
+# import
+import numpy as np
+from techan.indicator.kernel import float_dtype, rolling_max, rolling_min
+from techan.indicator.moving_average import sma
+
+
+def stochastic(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        k_window: int = 14,
+        d_window: int = 3,
+        smooth: int = 1
+) -> (np.ndarray, np.ndarray):
+    """
+    function to compute the stochastic oscillator, the position of the close in the range of the last k_window bars
+    :param high: np.ndarray: highs, time is the last axis
+    :param low: np.ndarray: lows, time is the last axis
+    :param close: np.ndarray: close prices, time is the last axis
+    :param k_window: int: bars of the highest high and lowest low
+    :param d_window: int: bars of the SMA of %K
+    :param smooth: int: bars of the SMA smoothing %K, 1 is the fast and 3 the slow stochastic
+    :return: tuple: %K and %D in [0, 100] (50 for a flat range), float32 for float32 prices, nan for the first
+                    k_window + smooth - 2 (%K) and k_window + smooth + d_window - 3 (%D) bars and windows with missing
+                    bars
+    """
+    dtype: np.dtype = float_dtype(high, low, close)
+    highest: np.ndarray = rolling_max(np.asarray(high, dtype=np.float64), k_window)
+    lowest: np.ndarray = rolling_min(np.asarray(low, dtype=np.float64), k_window)
+    k, d = stochastic_from_range(highest, lowest, close, d_window, smooth)
+    return k.astype(dtype, copy=False), d.astype(dtype, copy=False)
+
+
+def stochastic_from_range(
+        highest: np.ndarray,
+        lowest: np.ndarray,
+        close: np.ndarray,
+        d_window: int = 3,
+        smooth: int = 1
+) -> (np.ndarray, np.ndarray):
+    """
+    function to compute the stochastic oscillator from a rolling highest high and lowest low computed before, e.g.
+    shared with other indicators by IndicatorGraph
+    :param highest: np.ndarray: highest high of the last k_window bars
+    :param lowest: np.ndarray: lowest low of the last k_window bars
+    :param close: np.ndarray: close prices, time is the last axis
+    :param d_window: int: see stochastic
+    :param smooth: int: see stochastic
+    :return: tuple: %K and %D (float64), see stochastic
+    """
+    close = np.asarray(close, dtype=np.float64)
+    span: np.ndarray = np.asarray(highest, dtype=np.float64) - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k: np.ndarray = np.where(span > 0, 100 * (close - lowest) / span, 50.0)
+    k[np.isnan(span) | np.isnan(close)] = np.nan
+    if smooth > 1:
+        k = sma(k, smooth)
+    return k, sma(k, d_window)
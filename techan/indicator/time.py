@@ -5,7 +5,9 @@ import pandas as pd
 
 
 class Time:
-    def __init__(self, candle_stick_frame: CandleStickFrame, date_time_format: str = 'YYYY%MM%DD'):
+    def __init__(self, candle_stick_frame: CandleStickFrame, date_time_format: str = 'YYYY%MM%DD',
+                 dtype: type = np.float64):
+        self.dtype: np.dtype = np.dtype(dtype)  # dtype of the sine / cosine encodings
         self.df_date_time = pd.DataFrame([candle_stick.date_time for candle_stick in candle_stick_frame])
         self.date_time_format = self._strip_datetime_format(date_time_format)
         self._seperate_datetime()
@@ -57,10 +59,10 @@ class Time:
         return list(2 * math.pi * x / x.max())
 
     def _sine(self, x_normal: pd.Series) -> np.array:
-        return np.sin(self._normalize(x_normal))
+        return np.sin(self._normalize(x_normal)).astype(self.dtype, copy=False)
 
     def _cosine(self, x_normal: pd.Series) -> np.array:
-        return np.cos(self._normalize(x_normal))
+        return np.cos(self._normalize(x_normal)).astype(self.dtype, copy=False)
 
     def _transform(self, x: pd.Series, name) -> np.array:
         sine = self._sine(x)
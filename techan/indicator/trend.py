@@ -0,0 +1,30 @@
+# import
+import numpy as np
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.kernel import float_dtype, rolling_sum, shift
+
+
+def body_trend(open: np.ndarray, close: np.ndarray, window: int = 10) -> np.ndarray:
+    """
+    function to compute the trend of the bodies over the window bars before every bar
+    weighted average of the body directions in range [-1, 1] with -1 being down and 1 being up
+    :param open: np.ndarray: open prices, time is the last axis
+    :param close: np.ndarray: close prices, time is the last axis
+    :param window: int: window to calculate the trend over
+    :return: np.ndarray: trend (float32 for float32 prices, sums in float64), nan for the first window bars
+                         and windows with missing bars
+    """
+    body: np.ndarray = np.asarray(close, dtype=np.float64) - np.asarray(open, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend: np.ndarray = rolling_sum(body, window) / rolling_sum(np.abs(body), window)
+    return shift(trend.astype(float_dtype(open, close), copy=False), 1)
+
+
+def trend(csf: CandleStickFrame, window: int = 10) -> list:
+    """
+    function to compute the trend for the given CandleStickFrame
+    :param csf: CandleStickFrame: CandleStickFrame of interest
+    :param window: int: window to calculate the trend over
+    :return: list: list of trend values
+    """
+    return [None if np.isnan(value) else value for value in body_trend(csf.open, csf.close, window).tolist()]
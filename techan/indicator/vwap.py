@@ -0,0 +1,52 @@
+# import
+import numpy as np
+from techan.indicator.kernel import float_dtype, rolling_sum
+
+
+def vwap(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        window: int or None = None,
+        reset: np.ndarray or None = None
+) -> np.ndarray:
+    """
+    function to compute the volume weighted average of the typical price (high + low + close) / 3
+    :param high: np.ndarray: highs, time is the last axis
+    :param low: np.ndarray: lows, time is the last axis
+    :param close: np.ndarray: close prices, time is the last axis
+    :param volume: np.ndarray: volumes, time is the last axis
+    :param window: int or None: rolling VWAP over the last window bars, None accumulates from the first bar
+    :param reset: np.ndarray or None: bool per bar, the accumulation restarts at True bars (e.g. session starts),
+                  only without window
+    :return: np.ndarray: VWAP, float32 for float32 prices, nan for bars without volume so far, missing bars and
+                         (rolling) the first window - 1 bars and windows with missing bars
+    """
+    dtype: np.dtype = float_dtype(high, low, close)
+    price: np.ndarray = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64) +
+                         np.asarray(close, dtype=np.float64)) / 3
+    volume = np.asarray(volume, dtype=np.float64)
+    weighted: np.ndarray = price * volume
+    if window is not None:
+        if reset is not None:
+            raise ValueError("reset can not be combined with window")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result: np.ndarray = rolling_sum(weighted, window) / rolling_sum(volume, window)
+        return result.astype(dtype, copy=False)
+    missing: np.ndarray = np.isnan(weighted)
+    totals: list = []
+    for values in (np.where(missing, 0.0, weighted), np.where(missing, 0.0, volume)):
+        total: np.ndarray = np.cumsum(values, axis=-1)
+        if reset is not None:
+            # the total before every restart is subtracted from the bars up to the next restart
+            reset = np.broadcast_to(np.asarray(reset, dtype=bool), total.shape)
+            before: np.ndarray = np.where(reset, total - values, np.nan)
+            before[..., 0] = 0.0
+            index: np.ndarray = np.where(~np.isnan(before), np.arange(total.shape[-1]), 0)
+            np.maximum.accumulate(index, axis=-1, out=index)
+            total = total - np.take_along_axis(before, index, axis=-1)
+        totals.append(total)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result: np.ndarray = np.where(missing, np.nan, totals[0] / totals[1])
+    return result.astype(dtype, copy=False)
@@ -1,3 +1,6 @@
 # import
 from techan.pattern.candle_stick_pattern import CandleStickPattern
 from techan.pattern.pattern_validator import PatternValidator
+from techan.pattern.pattern_optimizer import PatternOptimizer
+from techan.pattern.triple_barrier_labeler import TripleBarrierLabeler
+from techan.pattern.backtester import Backtester
@@ -0,0 +1,220 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.graph import IndicatorGraph
+from techan.pattern.pattern_kernel import pattern_type
+from techan.pattern.validation_kernel import triple_barrier
+
+
+class Backtester:
+    _rule_keys: tuple = ('size', 'overlap', 'max_holding')
+
+    def __init__(
+            self,
+            candle_stick_frame: CandleStickFrame,
+            pattern_df: pd.DataFrame,
+            mode: str = 'atr',
+            past_window: int = 10,
+            wl_ratio: float = 1.618,
+            max_holding: int or None = None,
+            rules: dict or None = None,
+            point: float = 0.0,
+            commission: float = 0.0,
+            impact: float = 0.0
+    ):
+        """
+        backtest of the hits of find, a bullish hit opens a long and a bearish hit a short position at its close
+        that is closed at the take profit / stop loss barrier of PatternValidator, the time barrier or the last bar
+        :param candle_stick_frame: CandleStickFrame: candle sticks the patterns were searched on
+        :param pattern_df: pd.DataFrame: result of CandleStickPattern.find, pattern objects or booleans
+        :param mode: str: 'atr' or 'hl', see PatternValidator
+        :param past_window: int: see PatternValidator
+        :param wl_ratio: float: see PatternValidator
+        :param max_holding: int or None: bars until the time barrier, None holds until a barrier is touched
+        :param rules: dict or None: pattern -> position rules, 'size' (float, default 1.0), 'overlap' (bool, False
+                      skips hits while a position of the pattern is open, default True) and 'max_holding'
+        :param point: float: price of one unit of the spread column, the spread is paid once per trade
+        :param commission: float: fraction of the price paid on entry and on exit
+        :param impact: float: fraction of the price paid per unit of size / volume of the bar, on entry and on exit
+        """
+        if mode not in ['atr', 'hl']:
+            raise ValueError('Invalid mode: mode must be "atr" or "hl"')
+        self.candle_stick_frame: CandleStickFrame = candle_stick_frame
+        self.pattern_df: pd.DataFrame = pattern_df
+        self.mode: str = mode
+        self.past_window: int = past_window
+        self.wl_ratio: float = wl_ratio
+        self.max_holding: int or None = max_holding
+        self.rules: dict = self._validate_rules(rules)
+        self.point: float = point
+        self.commission: float = commission
+        self.impact: float = impact
+        self.trades: pd.DataFrame or None = None
+        self.equity: pd.Series or None = None
+        self.report: pd.DataFrame or None = None
+
+    def __repr__(self):
+        return f'Backtester(mode={self.mode}, past_window={self.past_window}, wl_ratio={self.wl_ratio}, ' \
+               f'max_holding={self.max_holding})'
+
+    def _validate_rules(self, rules: dict or None) -> dict:
+        """
+        method to validate the position rules and to fill in the defaults
+        :param rules: dict or None: pattern -> position rules
+        :return: dict: pattern -> complete position rules for every column of pattern_df
+        """
+        rules = dict() if rules is None else rules
+        unknown: set = set(rules) - set(self.pattern_df.columns)
+        if unknown:
+            raise ValueError("unknown patterns {} in rules".format(sorted(unknown)))
+        result: dict = dict()
+        for name in self.pattern_df.columns:
+            rule: dict = rules.get(name, dict())
+            unknown = set(rule) - set(self._rule_keys)
+            if unknown:
+                raise ValueError("unknown position rules {} for pattern {}".format(sorted(unknown), name))
+            result[name] = dict(size=float(rule.get('size', 1.0)), overlap=bool(rule.get('overlap', True)),
+                                max_holding=rule.get('max_holding', self.max_holding))
+        return result
+
+    @staticmethod
+    def _non_overlapping(entry: np.ndarray, exit: np.ndarray) -> np.ndarray:
+        """
+        method to select the trades that open after the last selected trade was closed
+        :param entry: np.ndarray: sorted entry bars
+        :param exit: np.ndarray: exit bars
+        :return: np.ndarray: bool mask of the selected trades
+        """
+        keep: np.ndarray = np.zeros(len(entry), dtype=bool)
+        following: np.ndarray = np.searchsorted(entry, exit, side='right')
+        k: int = 0
+        while k < len(entry):
+            keep[k] = True
+            k = following[k]
+        return keep
+
+    def _hits(self) -> dict:
+        """
+        method to forward the hit bars of every pattern
+        :return: dict: pattern -> sorted int bars
+        """
+        hits: dict = dict()
+        for name in self.pattern_df.columns:
+            values: np.ndarray = self.pattern_df[name].to_numpy()
+            if values.dtype != bool:
+                # pattern objects or booleans with None from find
+                values = np.array([bool(getattr(cell, 'is_pattern', cell)) for cell in values], dtype=bool)
+            hits[name] = np.flatnonzero(values)
+        return hits
+
+    def _trades(self) -> pd.DataFrame:
+        """
+        method to open and close the trades of every pattern
+        :return: pd.DataFrame: one row per trade
+        """
+        frame: CandleStickFrame = self.candle_stick_frame
+        n: int = len(frame)
+        close: np.ndarray = np.asarray(frame.close, dtype=np.float64)
+        spread: np.ndarray = np.nan_to_num(np.asarray(frame.spread, dtype=np.float64))
+        volume: np.ndarray = np.asarray(frame.volume, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_volume: np.ndarray = np.where(volume > 0, 1 / volume, 0.0)
+        hits: dict = self._hits()
+        # the barriers are computed once for all patterns of a type with the same time barrier
+        groups: dict = dict()
+        for name in self.pattern_df.columns:
+            groups.setdefault((pattern_type(name), self.rules[name]['max_holding']), []).append(name)
+        outcomes: dict = dict()
+        levels: tuple or np.ndarray = IndicatorGraph.of(frame).levels(self.mode, self.past_window)
+        for (type, max_holding), names in groups.items():
+            result: dict = triple_barrier(frame.high, frame.low, frame.close, type, self.mode, self.past_window,
+                                          self.wl_ratio, max_holding, np.concatenate([hits[name] for name in names]),
+                                          levels=levels)
+            bounds: np.ndarray = np.cumsum([0] + [len(hits[name]) for name in names])
+            for name, begin, end in zip(names, bounds[:-1], bounds[1:]):
+                outcomes[name] = {key: value[begin:end] for key, value in result.items()}
+        trades: list = []
+        for name in self.pattern_df.columns:
+            rule: dict = self.rules[name]
+            type: str = pattern_type(name)
+            result: dict = outcomes[name]
+            # hits without barriers are not traded, unresolved positions are closed on the last bar
+            known: np.ndarray = ~np.isnan(result['upper']) & ~np.isnan(result['lower']) & (hits[name] + 1 < n)
+            entry: np.ndarray = hits[name][known]
+            exit: np.ndarray = np.minimum(result['touch'][known], n - 1)
+            label: np.ndarray = result['label'][known]
+            if not rule['overlap']:
+                keep: np.ndarray = self._non_overlapping(entry, exit)
+                entry, exit, label = entry[keep], exit[keep], label[keep]
+            direction: float = 1.0 if type == 'bullish' else -1.0
+            gross: np.ndarray = direction * (close[exit] / close[entry] - 1)
+            # long positions buy at the ask on entry, short positions on exit
+            cost: np.ndarray = spread[entry if type == 'bullish' else exit] * self.point / close[entry]
+            cost += 2 * self.commission + self.impact * rule['size'] * (per_volume[entry] + per_volume[exit])
+            trades.append(pd.DataFrame(dict(
+                pattern=name, entry=entry, exit=exit, direction=direction, size=rule['size'], label=label,
+                gross=gross * rule['size'], cost=cost * rule['size'], net=(gross - cost) * rule['size']
+            )))
+        columns: list = ['pattern', 'entry', 'exit', 'direction', 'size', 'label', 'gross', 'cost', 'net']
+        return pd.concat(trades, ignore_index=True) if trades else pd.DataFrame(columns=columns)
+
+    def _equity(self, trades: pd.DataFrame) -> np.ndarray:
+        """
+        method to mark the open positions to market, the costs are booked on the exit bar
+        :param trades: pd.DataFrame: trades
+        :return: np.ndarray: equity in units of the entry price after every bar
+        """
+        n: int = len(self.candle_stick_frame)
+        close: np.ndarray = np.asarray(self.candle_stick_frame.close, dtype=np.float64)
+        entry: np.ndarray = trades['entry'].to_numpy(dtype=np.int64)
+        exit: np.ndarray = trades['exit'].to_numpy(dtype=np.int64)
+        # units held on the bars (entry, exit], added up with a difference array
+        units: np.ndarray = (trades['direction'] * trades['size']).to_numpy(dtype=np.float64) / close[entry]
+        held: np.ndarray = np.cumsum(np.bincount(entry + 1, units, n + 1) - np.bincount(exit + 1, units, n + 1))[:n]
+        pnl: np.ndarray = np.zeros(n)
+        pnl[1:] = held[1:] * np.diff(close)
+        pnl -= np.bincount(exit, trades['cost'].to_numpy(dtype=np.float64), n)
+        return np.cumsum(pnl)
+
+    @staticmethod
+    def _max_drawdown(equity: np.ndarray) -> float:
+        """
+        method to compute the largest fall of the equity from its running peak
+        :param equity: np.ndarray: equity after every bar
+        :return: float: maximum drawdown (positive)
+        """
+        if not len(equity):
+            return 0.0
+        return float(np.max(np.maximum.accumulate(np.maximum(equity, 0.0)) - equity))
+
+    def _summary(self, trades: pd.DataFrame) -> dict:
+        """
+        method to summarize trades
+        :param trades: pd.DataFrame: trades
+        :return: dict: trades, hit_rate, expectancy, total_return, max_drawdown and turnover
+        """
+        count: int = len(trades)
+        return dict(
+            trades=count,
+            hit_rate=float((trades['label'] == 1).mean()) if count else np.nan,
+            expectancy=float(trades['net'].mean()) if count else np.nan,
+            total_return=float(trades['net'].sum()),
+            max_drawdown=self._max_drawdown(self._equity(trades)),
+            # traded size (entry and exit) per bar
+            turnover=float(2 * trades['size'].sum() / len(self.candle_stick_frame))
+        )
+
+    def run(self) -> pd.DataFrame:
+        """
+        method to run the backtest
+        :return: pd.DataFrame: trades, hit_rate, expectancy (mean net return per trade), total_return, max_drawdown
+                               and turnover of every pattern and of all patterns together ('all')
+        """
+        trades: pd.DataFrame = self._trades()
+        rows: dict = {name: self._summary(trades[trades['pattern'] == name]) for name in self.pattern_df.columns}
+        rows['all'] = self._summary(trades)
+        self.trades = trades
+        self.equity = pd.Series(self._equity(trades), name='equity')
+        self.report = pd.DataFrame.from_dict(rows, orient='index')
+        return self.report
@@ -1,16 +1,40 @@
 # import
+import gc
+import re
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
+from typing import NamedTuple
 from techan.core.candle_stick import CandleStick
+from techan.core.candle_stick_array import CandleStickArray
 from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.kernel import shift
+from techan.indicator.trend import body_trend
+from techan.pattern.pattern_kernel import PATTERNS, evaluate, parameter_grid, pattern_names, pattern_type, sweep
+from techan.util.cache import ResultCache
 from techan.util.param import Parameter
-from techan.util.scaler import StandardScaler
+from techan.util.scaler import MinMaxScaler, StandardScaler
 
 
 class CandleStickPattern:
-    def __init__(self, candle_stick_frame: CandleStickFrame):
+    def __init__(
+            self,
+            candle_stick_frame: CandleStickFrame,
+            scaler: StandardScaler or MinMaxScaler or str or None = None,
+            cache: ResultCache or str or None = None
+    ):
+        """
+        :param candle_stick_frame: CandleStickFrame: candle sticks to search for patterns
+        :param scaler: StandardScaler, MinMaxScaler, str or None: fitted scaler of the candle stick sizes or path of a
+                       saved StandardScaler, None fits a StandardScaler on the frame
+        :param cache: ResultCache, str or None: cache (or its directory) of the results of find, None disables it
+        """
         self.candle_stick_frame: CandleStickFrame = self._validate_csf(candle_stick_frame)
-        self._scaler: StandardScaler = StandardScaler([cs.cs_size() for cs in self.candle_stick_frame])
+        self._scaler: StandardScaler or MinMaxScaler = self._validate_scaler(scaler)
+        self._cache: ResultCache or None = ResultCache(cache) if isinstance(cache, str) else cache
+        self._trends: dict = dict()  # window -> trend of every index in [0, len(frame)]
+        self._candle_stick_array: CandleStickArray or None = None
+        self._found: dict = dict()  # type -> (scaler state and parameter digests, bars, hits) of the last find
 
     @staticmethod
     def _validate_csf(candle_stick_frame: CandleStickFrame):
@@ -25,6 +49,47 @@ class CandleStickPattern:
             raise ValueError("candle_stick_frame must have at least 1 candle stick")
         return candle_stick_frame
 
+    def _validate_scaler(self, scaler: StandardScaler or MinMaxScaler or str or None) -> StandardScaler or MinMaxScaler:
+        """
+        method to validate the scaler or to fit one on the candle stick sizes of the frame
+        :param scaler: StandardScaler, MinMaxScaler, str or None: scaler, path of a saved StandardScaler or None
+        :return: StandardScaler or MinMaxScaler: fitted scaler
+        """
+        if scaler is None:
+            return StandardScaler(np.abs(np.asarray(self.candle_stick_frame.high, dtype=np.float64) -
+                                         np.asarray(self.candle_stick_frame.low, dtype=np.float64)))
+        if isinstance(scaler, str):
+            loaded: StandardScaler = StandardScaler()
+            loaded.load(scaler)
+            return loaded
+        if not isinstance(scaler, (StandardScaler, MinMaxScaler)):
+            raise TypeError("scaler must be StandardScaler, MinMaxScaler, str or None not {}".format(type(scaler)))
+        if np.ndim(scaler.mean if isinstance(scaler, StandardScaler) else scaler.min) > 0:
+            raise ValueError("scaler must be fitted on all candle stick sizes (axis=None)")
+        return scaler
+
+    def _scaler_key(self) -> tuple:
+        """
+        method to forward the fitted state of the scaler as part of a cache key
+        :return: tuple: class name and the bytes of its statistics
+        """
+        if isinstance(self._scaler, StandardScaler):
+            state: tuple = (self._scaler.mean, self._scaler.std)
+        else:
+            state: tuple = (self._scaler.min, self._scaler.max)
+        return (type(self._scaler).__name__,) + tuple(np.asarray(value, dtype=np.float64).tobytes() for value in state)
+
+    def _bars(self, start: int = 0) -> range or list:
+        """
+        method to forward the bars to search from start on
+        the first two bars are always included, the candle sticks before them wrap around to the end of the frame
+        :param start: int: first bar to search
+        :return: range or list: indices of the bars
+        """
+        if start <= 0:
+            return range(len(self.candle_stick_frame))
+        return list(range(min(2, start))) + list(range(start, len(self.candle_stick_frame)))
+
     def _prepare_window(self, index: int, window: int) -> CandleStickFrame:
         """
         method to prepare the window for the candle stick frame
@@ -46,30 +111,69 @@ class CandleStickPattern:
         :param window: int: window to calculate the trend over
         :return: float or None: trend of the candle stick at index [-1, 1]
         """
-        cs_window = self._prepare_window(index, window)
-        if len(cs_window) < window or index < 0:
+        self._prepare_window(index, window)
+        trends: np.ndarray = self._trend_series(window)
+        if index < 0 or index >= len(trends) or np.isnan(trends[index]):
             return None
-        trend, sum = 0, 0
-        for cs in cs_window:
-            sum += cs.body_size()
-            if cs.type() == 'bullish':
-                trend += cs.body_size()
-            elif cs.type() == 'bearish':
-                trend -= cs.body_size()
         # weighted average of the trend
-        return trend / sum
+        return float(trends[index])
+
+    def _trend_series(self, window: int) -> np.ndarray:
+        """
+        method to calculate the trend of every index in [0, len(frame)] once per window
+        :param window: int: window to calculate the trend over
+        :return: np.ndarray: trend, nan where undefined
+        """
+        trends: np.ndarray or None = self._trends.get(window)
+        if trends is None or len(trends) != len(self.candle_stick_frame) + 1:
+            # one extra bar so that the trend over the last window candle sticks is available as well
+            trends = body_trend(np.append(self.candle_stick_frame.open, np.nan),
+                                np.append(self.candle_stick_frame.close, np.nan), window)
+            self._trends[window] = trends
+        return trends
+
+    def candle_stick_array(self) -> CandleStickArray:
+        """
+        method to forward the candle sticks of the frame as arrays, scaled with the scaler of the pattern
+        :return: CandleStickArray: candle sticks
+        """
+        if self._candle_stick_array is None or len(self._candle_stick_array) != len(self.candle_stick_frame):
+            self._candle_stick_array = CandleStickArray(
+                self.candle_stick_frame.open,
+                self.candle_stick_frame.high,
+                self.candle_stick_frame.low,
+                self.candle_stick_frame.close,
+                self._scaler
+            )
+        return self._candle_stick_array
+
+    def sweep(self, name: str, grid: dict or list) -> (list, np.ndarray):
+        """
+        method to search a pattern with many parameter sets at once, see pattern_kernel.sweep
+        row i equals is_<name>(param=records[i], is_boolean=True) with None as False
+        :param name: str: pattern name, e.g. 'hammer'
+        :param grid: dict or list: parameter -> list of values (every combination is used) or list of parameters
+        :return: tuple: list of parameter records, bool array of hits (parameter sets x bars)
+        """
+        records: list = parameter_grid(name, grid)
+        trends: dict = {record.trend_window: self._trend_series(record.trend_window)[:-1] for record in records}
+        hits, _ = sweep(name, self.candle_stick_array(), records, trends)
+        return records, hits
 
     class PatternTemplate:
         def __init__(
                 self,
-                param: dict,
+                param: NamedTuple or dict,
                 scaler: any,
                 pattern_name: str,
                 pattern_type: str,
                 trend_strength: float,
                 pattern: list
         ):
-            self.param: dict = param
+            if not isinstance(param, tuple):
+                # templates created directly with a dict get the compiled parameters of the pattern
+                param = Parameter.compile(re.sub(r'(?<!^)(?=[A-Z])', '_', pattern_name).lower(), param)
+            self.param: NamedTuple = param
             self.scaler: any = scaler
             self.pattern_name: str = pattern_name
             self.pattern_type: str = pattern_type
@@ -82,6 +186,37 @@ class CandleStickPattern:
             self.wl_ratio: float or None = None
             self.v_iv_after: int or None = None
 
+        @classmethod
+        def _searched(
+                cls,
+                param: NamedTuple,
+                scaler: any,
+                pattern_type: str,
+                trend_strength: float or None,
+                pattern: list,
+                is_pattern: bool or None
+        ):
+            """
+            method to create the template of a bar that was already searched without checking its conditions again
+            :param param: NamedTuple: compiled parameters
+            :param scaler: any: scaler of the candle stick sizes
+            :param pattern_type: str: 'bullish' or 'bearish'
+            :param trend_strength: float or None: trend before the pattern
+            :param pattern: list: candle sticks of the pattern, oldest first
+            :param is_pattern: bool or None: result of the search
+            :return: PatternTemplate: template of the subclass
+            """
+            template = cls.__new__(cls)
+            CandleStickPattern.PatternTemplate.__init__(template, param, scaler, cls.__name__, pattern_type,
+                                                        trend_strength, pattern)
+            template._cs = pattern[-1]
+            if len(pattern) > 1:
+                template._cs_m1 = pattern[-2]
+            if len(pattern) > 2:
+                template._cs_m2 = pattern[-3]
+            template.is_pattern = is_pattern
+            return template
+
         def __str__(self):
             return f'{self.pattern_name} -> ({self.is_pattern})'
 
@@ -93,7 +228,7 @@ class CandleStickPattern:
     # Bullish Reversal Candlestick Patterns classes:
     # Hammer (1)
     class Hammer(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'Hammer', 'bullish', trend, [cs])
             self._cs: CandleStick = cs
             self.is_pattern = self._is_hammer()
@@ -105,18 +240,18 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bullish'
-            con_03: bool = self._cs.body_position() >= self.param['cs_body_position']
-            con_04: bool = self._cs.body_lower_shadow_ratio() >= self.param['body_ls_ratio']
-            con_05: bool = self._cs.body_upper_shadow_ratio() <= self.param['body_us_ratio']
+            con_03: bool = self._cs.body_position() >= self.param.cs_body_position
+            con_04: bool = self._cs.body_lower_shadow_ratio() >= self.param.body_ls_ratio
+            con_05: bool = self._cs.body_upper_shadow_ratio() <= self.param.body_us_ratio
             if con_01 and con_02 and con_03 and con_04 and con_05:
                 return True
             return False
 
     # Bullish Piercing (2)
     class Piercing(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'Piercing', 'bullish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -129,7 +264,7 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bullish'
             con_03: bool = self._cs_m1.type() == 'bearish'
             con_04: bool = self._cs.open < self._cs_m1.close
@@ -140,7 +275,7 @@ class CandleStickPattern:
 
     # Bullish Engulfing (3)
     class BullishEngulfing(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'BullishEngulfing', 'bullish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -153,7 +288,7 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bullish'
             con_03: bool = self._cs_m1.type() == 'bearish'
             con_04: bool = self._cs.open < self._cs_m1.close
@@ -171,7 +306,7 @@ class CandleStickPattern:
                 cs: CandleStick,
                 cs_m1: CandleStick,
                 cs_m2: CandleStick,
-                param: dict
+                param: NamedTuple
         ):
             super().__init__(param, scaler, 'MorningStar', 'bullish', trend, [cs_m2, cs_m1, cs])
             self._cs: CandleStick = cs
@@ -186,14 +321,14 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs_m2.type() == 'bearish'
-            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param['cs_m2_body_ratio']
-            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param['cs_m2_relative_size']
-            con_05: bool = self._cs_m1.cs_body_ratio() <= self.param['cs_m1_body_ratio']
+            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param.cs_m2_body_ratio
+            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param.cs_m2_relative_size
+            con_05: bool = self._cs_m1.cs_body_ratio() <= self.param.cs_m1_body_ratio
             con_06: bool = self._cs.type() == 'bullish'
-            con_07: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_08: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_07: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_08: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08:
                 return True
             return False
@@ -207,7 +342,7 @@ class CandleStickPattern:
                 cs: CandleStick,
                 cs_m1: CandleStick,
                 cs_m2: CandleStick,
-                param: dict
+                param: NamedTuple
         ):
             super().__init__(param, scaler, 'ThreeWhiteSoldiers', 'bullish', trend, [cs_m2, cs_m1, cs])
             self._cs: CandleStick = cs
@@ -222,23 +357,23 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_1: bool = self.trend_strength <= self.param['trend_strength']
+            con_1: bool = self.trend_strength <= self.param.trend_strength
             con_2: bool = self._cs_m2.type() == 'bullish'
-            con_3: bool = self._cs_m2.cs_body_ratio() >= self.param['cs_m2_body_ratio']
-            con_4: bool = self.scaler(self._cs_m2.cs_size()) >= self.param['cs_m2_relative_size']
+            con_3: bool = self._cs_m2.cs_body_ratio() >= self.param.cs_m2_body_ratio
+            con_4: bool = self.scaler(self._cs_m2.cs_size()) >= self.param.cs_m2_relative_size
             con_5: bool = self._cs_m1.type() == 'bullish'
-            con_6: bool = self._cs_m1.cs_body_ratio() >= self.param['cs_m1_body_ratio']
-            con_7: bool = self.scaler(self._cs_m1.cs_size()) >= self.param['cs_m1_relative_size']
+            con_6: bool = self._cs_m1.cs_body_ratio() >= self.param.cs_m1_body_ratio
+            con_7: bool = self.scaler(self._cs_m1.cs_size()) >= self.param.cs_m1_relative_size
             con_8: bool = self._cs.type() == 'bullish'
-            con_9: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_10: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_9: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_10: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             if con_1 and con_2 and con_3 and con_4 and con_5 and con_6 and con_7 and con_8 and con_9 and con_10:
                 return True
             return False
 
     # Bullish Marubozu (6)
     class BullishMarubozu(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'BullishMarubozu', 'bullish', trend, [cs])
             self._cs: CandleStick = cs
             self.is_pattern = self._is_bullish_marubozu()
@@ -250,10 +385,10 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bullish'
-            con_03: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_04: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_03: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_04: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             if con_01 and con_02 and con_03 and con_04:
                 return True
             return False
@@ -267,7 +402,7 @@ class CandleStickPattern:
                 cs: CandleStick,
                 cs_m1: CandleStick,
                 cs_m2: CandleStick,
-                param: dict
+                param: NamedTuple
         ):
             super().__init__(param, scaler, 'ThreeInsideUp', 'bullish', trend, [cs_m2, cs_m1, cs])
             self._cs: CandleStick = cs
@@ -282,15 +417,15 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs_m2.type() == 'bearish'
-            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param['cs_m2_body_ratio']
-            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param['cs_m2_relative_size']
+            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param.cs_m2_body_ratio
+            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param.cs_m2_relative_size
             con_05: bool = self._cs_m1.type() == 'bullish'
             con_06: bool = self._cs_m1.open <= self._cs_m2.close
             con_07: bool = self._cs.type() == 'bullish'
-            con_08: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_09: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_08: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_09: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             con_10: bool = self._cs.open >= self._cs_m1.close
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08 and con_09 and con_10:
                 return True
@@ -298,7 +433,7 @@ class CandleStickPattern:
 
     # Bullish Harami (8)
     class BullishHarami(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'BullishHarami', 'bullish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -311,13 +446,13 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs_m1.type() == 'bearish'
-            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param['cs_m1_body_ratio']
-            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param['cs_m1_relative_size']
+            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param.cs_m1_body_ratio
+            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param.cs_m1_relative_size
             con_05: bool = self._cs.type() == 'bullish'
-            con_06: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_07: bool = self.scaler(self._cs.cs_size()) <= self.param['cs_relative_size']
+            con_06: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_07: bool = self.scaler(self._cs.cs_size()) <= self.param.cs_relative_size
             con_08: bool = self._cs.open >= self._cs_m1.close
             con_09: bool = self._cs.close <= self._cs_m1.open
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08 and con_09:
@@ -326,8 +461,8 @@ class CandleStickPattern:
 
     # Tweezer Bottom (9)
     class TweezerBottom(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
-            super().__init__(param, scaler, 'TweezerBottom', 'bullish', trend, [cs, cs_m1])
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
+            super().__init__(param, scaler, 'TweezerBottom', 'bullish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
             self.is_pattern = self._is_tweezer_bottom()
@@ -339,13 +474,13 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength <= self.param['trend_strength']
+            con_01: bool = self.trend_strength <= self.param.trend_strength
             con_02: bool = self._cs_m1.type() == 'bearish'
-            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param['cs_m1_body_ratio']
-            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param['cs_m1_relative_size']
+            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param.cs_m1_body_ratio
+            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param.cs_m1_relative_size
             con_05: bool = self._cs.type() == 'bullish'
-            con_06: bool = self._cs.cs_body_ratio() <= self.param['cs_body_ratio']
-            con_07: bool = self._cs.body_position() <= self.param['cs_body_position']
+            con_06: bool = self._cs.cs_body_ratio() <= self.param.cs_body_ratio
+            con_07: bool = self._cs.body_position() <= self.param.cs_body_position
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07:
                 return True
             return False
@@ -354,7 +489,7 @@ class CandleStickPattern:
     # Bearish Reversal Candlestick Patterns Classes:
     # Hanging Man (14)
     class HangingMan(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'HangingMan', 'bearish', trend, [cs])
             self._cs: CandleStick = cs
             self.is_pattern = self._is_hanging_man()
@@ -366,18 +501,18 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bearish'
-            con_03: bool = self._cs.body_position() <= self.param['cs_body_position']
-            con_04: bool = self._cs.body_lower_shadow_ratio() <= self.param['body_ls_ratio']
-            con_05: bool = self._cs.body_upper_shadow_ratio() >= self.param['body_us_ratio']
+            con_03: bool = self._cs.body_position() <= self.param.cs_body_position
+            con_04: bool = self._cs.body_lower_shadow_ratio() <= self.param.body_ls_ratio
+            con_05: bool = self._cs.body_upper_shadow_ratio() >= self.param.body_us_ratio
             if con_01 and con_02 and con_03 and con_04 and con_05:
                 return True
             return False
 
     # Dark Cloud (15)
     class DarkCloud(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'DarkCloud', 'bearish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -390,7 +525,7 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bearish'
             con_03: bool = self._cs_m1.type() == 'bullish'
             con_04: bool = self._cs.open > self._cs_m1.close
@@ -401,7 +536,7 @@ class CandleStickPattern:
 
     # Bearish Engulfing (16)
     class BearishEngulfing(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'BearishEngulfing', 'bearish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -414,7 +549,7 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bearish'
             con_03: bool = self._cs_m1.type() == 'bullish'
             con_04: bool = self._cs.open > self._cs_m1.close
@@ -432,7 +567,7 @@ class CandleStickPattern:
                 cs: CandleStick,
                 cs_m1: CandleStick,
                 cs_m2: CandleStick,
-                param: dict
+                param: NamedTuple
         ):
             super().__init__(param, scaler, 'EveningStar', 'bearish', trend, [cs_m2, cs_m1, cs])
             self._cs: CandleStick = cs
@@ -447,14 +582,14 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs_m2.type() == 'bullish'
-            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param['cs_m2_body_ratio']
-            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param['cs_m2_relative_size']
-            con_05: bool = self._cs_m1.cs_body_ratio() <= self.param['cs_m1_body_ratio']
+            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param.cs_m2_body_ratio
+            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param.cs_m2_relative_size
+            con_05: bool = self._cs_m1.cs_body_ratio() <= self.param.cs_m1_body_ratio
             con_06: bool = self._cs.type() == 'bearish'
-            con_07: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_08: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_07: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_08: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08:
                 return True
             return False
@@ -468,7 +603,7 @@ class CandleStickPattern:
                 cs: CandleStick,
                 cs_m1: CandleStick,
                 cs_m2: CandleStick,
-                param: dict
+                param: NamedTuple
         ):
             super().__init__(param, scaler, 'ThreeBlackCrows', 'bearish', trend, [cs_m2, cs_m1, cs])
             self._cs: CandleStick = cs
@@ -483,23 +618,23 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs_m2.type() == 'bearish'
-            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param['cs_m2_body_ratio']
-            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param['cs_m2_relative_size']
+            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param.cs_m2_body_ratio
+            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param.cs_m2_relative_size
             con_05: bool = self._cs_m1.type() == 'bearish'
-            con_06: bool = self._cs_m1.cs_body_ratio() >= self.param['cs_m1_body_ratio']
-            con_07: bool = self.scaler(self._cs_m1.cs_size()) >= self.param['cs_m1_relative_size']
+            con_06: bool = self._cs_m1.cs_body_ratio() >= self.param.cs_m1_body_ratio
+            con_07: bool = self.scaler(self._cs_m1.cs_size()) >= self.param.cs_m1_relative_size
             con_08: bool = self._cs.type() == 'bearish'
-            con_09: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_10: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_09: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_10: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08 and con_09 and con_10:
                 return True
             return False
 
     # Bearish Marubozu (19)
     class BearishMarubozu(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'BearishMarubozu', 'bearish', trend, [cs])
             self._cs: CandleStick = cs
             self.is_pattern = self._is_bearish_marubozu()
@@ -511,10 +646,10 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs.type() == 'bearish'
-            con_03: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_04: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_03: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_04: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             if con_01 and con_02 and con_03 and con_04:
                 return True
             return False
@@ -528,7 +663,7 @@ class CandleStickPattern:
                 cs: CandleStick,
                 cs_m1: CandleStick,
                 cs_m2: CandleStick,
-                param: dict
+                param: NamedTuple
         ):
             super().__init__(param, scaler, 'ThreeInsideDown', 'bearish', trend, [cs_m2, cs_m1, cs])
             self._cs: CandleStick = cs
@@ -543,15 +678,15 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs_m2.type() == 'bullish'
-            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param['cs_m2_body_ratio']
-            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param['cs_m2_relative_size']
+            con_03: bool = self._cs_m2.cs_body_ratio() >= self.param.cs_m2_body_ratio
+            con_04: bool = self.scaler(self._cs_m2.cs_size()) >= self.param.cs_m2_relative_size
             con_05: bool = self._cs_m1.type() == 'bearish'
             con_06: bool = self._cs_m1.open <= self._cs_m2.close
             con_07: bool = self._cs.type() == 'bearish'
-            con_08: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_09: bool = self.scaler(self._cs.cs_size()) >= self.param['cs_relative_size']
+            con_08: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_09: bool = self.scaler(self._cs.cs_size()) >= self.param.cs_relative_size
             con_10: bool = self._cs.open >= self._cs_m1.close
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08 and con_09 and con_10:
                 return True
@@ -559,7 +694,7 @@ class CandleStickPattern:
 
     # BearishHarami (21)
     class BearishHarami(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'BearishHarami', 'bearish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -572,13 +707,13 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs_m1.type() == 'bullish'
-            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param['cs_m1_body_ratio']
-            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param['cs_m1_relative_size']
+            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param.cs_m1_body_ratio
+            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param.cs_m1_relative_size
             con_05: bool = self._cs.type() == 'bearish'
-            con_06: bool = self._cs.cs_body_ratio() >= self.param['cs_body_ratio']
-            con_07: bool = self.scaler(self._cs.cs_size()) <= self.param['cs_relative_size']
+            con_06: bool = self._cs.cs_body_ratio() >= self.param.cs_body_ratio
+            con_07: bool = self.scaler(self._cs.cs_size()) <= self.param.cs_relative_size
             con_08: bool = self._cs.close >= self._cs_m1.open
             con_09: bool = self._cs.open <= self._cs_m1.close
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07 and con_08 and con_09:
@@ -587,7 +722,7 @@ class CandleStickPattern:
 
     # Tweezer Top (22)
     class TweezerTop(PatternTemplate):
-        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: dict):
+        def __init__(self, trend: float, scaler: any, cs: CandleStick, cs_m1: CandleStick, param: NamedTuple):
             super().__init__(param, scaler, 'TweezerTop', 'bearish', trend, [cs_m1, cs])
             self._cs: CandleStick = cs
             self._cs_m1: CandleStick = cs_m1
@@ -600,13 +735,13 @@ class CandleStickPattern:
             """
             if self.trend_strength is None:
                 return None
-            con_01: bool = self.trend_strength >= self.param['trend_strength']
+            con_01: bool = self.trend_strength >= self.param.trend_strength
             con_02: bool = self._cs_m1.type() == 'bullish'
-            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param['cs_m1_body_ratio']
-            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param['cs_m1_relative_size']
+            con_03: bool = self._cs_m1.cs_body_ratio() >= self.param.cs_m1_body_ratio
+            con_04: bool = self.scaler(self._cs_m1.cs_size()) >= self.param.cs_m1_relative_size
             con_05: bool = self._cs.type() == 'bearish'
-            con_06: bool = self._cs.cs_body_ratio() <= self.param['cs_body_ratio']
-            con_07: bool = self._cs.body_position() >= self.param['cs_body_position']
+            con_06: bool = self._cs.cs_body_ratio() <= self.param.cs_body_ratio
+            con_07: bool = self._cs.body_position() >= self.param.cs_body_position
             if con_01 and con_02 and con_03 and con_04 and con_05 and con_06 and con_07:
                 return True
             return False
@@ -614,18 +749,23 @@ class CandleStickPattern:
 
     # Bullish Reversal Candlestick Patterns methods:
     # Hammer (1)
-    def is_hammer(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_hammer(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for hammer candle stick pattern
-        :param param: dict: parameters for the hammer candle stick pattern
+        :param param: dict, record or None: parameters for the hammer candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of Hammer objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or Hammer objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['hammer']
+        param = Parameter.compile('hammer', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i, param.trend_window)
             if is_boolean:
                 result.append(self.Hammer(trend, self._scaler, self.candle_stick_frame[i], param).is_pattern)
             else:
@@ -633,18 +773,23 @@ class CandleStickPattern:
         return result
 
     # Piercing (2)
-    def is_piercing(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_piercing(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for piercing candle stick pattern
-        :param param: dict: parameters for the piercing candle stick pattern
+        :param param: dict, record or None: parameters for the piercing candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of Piercing objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or Piercing objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['piercing']
+        param = Parameter.compile('piercing', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.Piercing(
                     trend,
@@ -664,18 +809,23 @@ class CandleStickPattern:
         return result
 
     # Bullish Engulfing (3)
-    def is_bullish_engulfing(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_bullish_engulfing(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for bullish engulfing candle stick pattern
-        :param param: dict: parameters for the bullish engulfing candle stick pattern
+        :param param: dict, record or None: parameters for the bullish engulfing candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of BullishEngulfing objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or BullishEngulfing objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['bullish_engulfing']
+        param = Parameter.compile('bullish_engulfing', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.BullishEngulfing(
                     trend,
@@ -695,18 +845,23 @@ class CandleStickPattern:
         return result
 
     # Morning Star (4)
-    def is_morning_star(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_morning_star(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for morning star candle stick pattern
-        :param param: dict: parameters for the morning star candle stick pattern
+        :param param: dict, record or None: parameters for the morning star candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of MorningStar objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or MorningStar objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['morning_star']
+        param = Parameter.compile('morning_star', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-2, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-2, param.trend_window)
             if is_boolean:
                 result.append(self.MorningStar(
                     trend,
@@ -728,18 +883,23 @@ class CandleStickPattern:
         return result
 
     # Tree White Soldiers (5)
-    def is_three_white_soldiers(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_three_white_soldiers(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for three white soldiers candle stick pattern
-        :param param: dict: parameters for the three white soldiers candle stick pattern
+        :param param: dict, record or None: parameters for the three white soldiers candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of ThreeWhiteSoldiers objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or ThreeWhiteSoldiers objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['three_white_soldiers']
+        param = Parameter.compile('three_white_soldiers', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-2, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-2, param.trend_window)
             if is_boolean:
                 result.append(self.ThreeWhiteSoldiers(
                     trend,
@@ -761,18 +921,23 @@ class CandleStickPattern:
         return result
 
     # Bullish Marubozu (6)
-    def is_bullish_marubozu(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_bullish_marubozu(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for bullish marubozu candle stick pattern
-        :param param: parameters for the bullish marubozu candle stick pattern
+        :param param: dict, record or None: parameters for the bullish marubozu candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of BullishMarubozu objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or BullishMarubozu objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['bullish_marubozu']
+        param = Parameter.compile('bullish_marubozu', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i, param.trend_window)
             if is_boolean:
                 result.append(self.BullishMarubozu(trend, self._scaler, self.candle_stick_frame[i], param).is_pattern)
             else:
@@ -780,18 +945,23 @@ class CandleStickPattern:
         return result
 
     # Tree Inside Up (7)
-    def is_three_inside_up(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_three_inside_up(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for three inside up candle stick pattern
-        :param param: parameters for the three inside up candle stick pattern
+        :param param: dict, record or None: parameters for the three inside up candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of ThreeInsideUp objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or ThreeInsideUp objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['three_inside_up']
+        param = Parameter.compile('three_inside_up', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-2, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-2, param.trend_window)
             if is_boolean:
                 result.append(self.ThreeInsideUp(
                     trend,
@@ -813,18 +983,23 @@ class CandleStickPattern:
         return result
 
     # Bullish Harami (8)
-    def is_bullish_harami(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_bullish_harami(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for bullish harami candle stick pattern
-        :param param: dict: parameters for the bullish harami candle stick pattern
+        :param param: dict, record or None: parameters for the bullish harami candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of BullishHarami objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or BullishHarami objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['bullish_harami']
+        param = Parameter.compile('bullish_harami', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.BullishHarami(
                     trend,
@@ -844,18 +1019,23 @@ class CandleStickPattern:
         return result
 
     # Tweezer Bottom (9)
-    def is_tweezer_bottom(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_tweezer_bottom(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for tweezer bottom candle stick pattern
-        :param param: dict: parameters for the tweezer bottom candle stick pattern
+        :param param: dict, record or None: parameters for the tweezer bottom candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of TweezerBottom objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or TweezerBottom objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bullish']['tweezer_bottom']
+        param = Parameter.compile('tweezer_bottom', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i, param.trend_window)
             if is_boolean:
                 result.append(self.TweezerBottom(
                     trend,
@@ -877,18 +1057,23 @@ class CandleStickPattern:
 
     # Bearish Reversal Candlestick Patterns Classes:
     # Hanging Man (14)
-    def is_hanging_man(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_hanging_man(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for hanging man candle stick pattern
-        :param param: dict: parameters for the hanging man candle stick pattern
+        :param param: dict, record or None: parameters for the hanging man candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of HangingMan objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or HangingMan objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['hanging_man']
+        param = Parameter.compile('hanging_man', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i, param.trend_window)
             if is_boolean:
                 result.append(self.HangingMan(trend, self._scaler, self.candle_stick_frame[i], param).is_pattern)
             else:
@@ -896,18 +1081,23 @@ class CandleStickPattern:
         return result
 
     # Dark Cloud Cover (15)
-    def is_dark_cloud(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_dark_cloud(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for dark cloud candle stick pattern
-        :param param: dict: parameters for the dark cloud candle stick pattern
+        :param param: dict, record or None: parameters for the dark cloud candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of DarkCloud objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or DarkCloud objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['dark_cloud']
+        param = Parameter.compile('dark_cloud', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.DarkCloud(
                     trend,
@@ -927,18 +1117,23 @@ class CandleStickPattern:
         return result
 
     # Bearish Engulfing (16)
-    def is_bearish_engulfing(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_bearish_engulfing(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for bearish engulfing candle stick pattern
-        :param param: dict: parameters for the bearish engulfing candle stick pattern
+        :param param: dict, record or None: parameters for the bearish engulfing candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of BearishEngulfing objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or BearishEngulfing objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['bearish_engulfing']
+        param = Parameter.compile('bearish_engulfing', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.BearishEngulfing(
                     trend,
@@ -958,18 +1153,23 @@ class CandleStickPattern:
         return result
 
     # Evening Star (17)
-    def is_evening_star(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_evening_star(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for evening star candle stick pattern
-        :param param: dict: parameters for the evening star candle stick pattern
+        :param param: dict, record or None: parameters for the evening star candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of EveningStar objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or EveningStar objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['evening_star']
+        param = Parameter.compile('evening_star', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.EveningStar(
                     trend,
@@ -991,18 +1191,23 @@ class CandleStickPattern:
         return result
 
     # Three Black Crows (18)
-    def is_three_black_crows(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_three_black_crows(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for three black crows candle stick pattern
-        :param param: dict: parameters for the three black crows candle stick pattern
+        :param param: dict, record or None: parameters for the three black crows candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of ThreeBlackCrows objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or ThreeBlackCrows objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['three_black_crows']
+        param = Parameter.compile('three_black_crows', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.ThreeBlackCrows(
                     trend,
@@ -1024,18 +1229,23 @@ class CandleStickPattern:
         return result
 
     # Bearish Marubozu (19)
-    def is_bearish_marubozu(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_bearish_marubozu(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for bearish marubozu candle stick pattern
-        :param param: dict: parameters for the bearish marubozu candle stick pattern
+        :param param: dict, record or None: parameters for the bearish marubozu candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of BearishMarubozu objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or BearishMarubozu objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['bearish_marubozu']
+        param = Parameter.compile('bearish_marubozu', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.BearishMarubozu(trend, self._scaler, self.candle_stick_frame[i], param).is_pattern)
             else:
@@ -1043,18 +1253,23 @@ class CandleStickPattern:
         return result
 
     # Three Inside Down (20)
-    def is_three_inside_down(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_three_inside_down(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for three inside down candle stick pattern
-        :param param: dict: parameters for the three inside down candle stick pattern
+        :param param: dict, record or None: parameters for the three inside down candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of ThreeInsideDown objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or ThreeInsideDown objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['three_inside_down']
+        param = Parameter.compile('three_inside_down', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.ThreeInsideDown(
                     trend,
@@ -1076,18 +1291,23 @@ class CandleStickPattern:
         return result
 
     # Bearish Harami (21)
-    def is_bearish_harami(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_bearish_harami(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for bearish harami candle stick pattern
-        :param param: dict: parameters for the bearish harami candle stick pattern
+        :param param: dict, record or None: parameters for the bearish harami candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of BearishHarami objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or BearishHarami objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['bearish_harami']
+        param = Parameter.compile('bearish_harami', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.BearishHarami(
                     trend,
@@ -1107,18 +1327,23 @@ class CandleStickPattern:
         return result
 
     # Tweezer Top (22)
-    def is_tweezer_top(self, param: dict = None, is_boolean: bool = False) -> list:
+    def is_tweezer_top(
+            self,
+            param: dict or NamedTuple or None = None,
+            is_boolean: bool = False,
+            start: int = 0
+    ) -> list:
         """
         method search for tweezer top candle stick pattern
-        :param param: dict: parameters for the tweezer top candle stick pattern
+        :param param: dict, record or None: parameters for the tweezer top candle stick pattern
         :param is_boolean: bool: if True, return a list of boolean, if False, return a list of TweezerTop objects
+        :param start: int: search only the bars from start on (see _bars), 0 searches every bar
         :return: list: list of boolean or TweezerTop objects
         """
-        if param is None:
-            param = Parameter.candle_stick_pattern['bearish']['tweezer_top']
+        param = Parameter.compile('tweezer_top', param)
         result = []
-        for i in range(len(self.candle_stick_frame)):
-            trend = self.trend(i-1, param['trend_window'])
+        for i in self._bars(start):
+            trend = self.trend(i-1, param.trend_window)
             if is_boolean:
                 result.append(self.TweezerTop(
                     trend,
@@ -1137,55 +1362,134 @@ class CandleStickPattern:
                 ))
         return result
 
-    def find(self, type: str = 'all', is_boolean: bool = False) -> pd.DataFrame:
+    def find(self, type: str = 'all', is_boolean: bool = False, param: dict or None = None) -> pd.DataFrame:
         """
         Method to search for candle stick pattern
+        the hits of the last search of every type are kept, after the frame was extended only the last
+        trend_window + 2 bars of every pattern are searched again
+        with a cache only the hits are stored (a few bits per bar and pattern)
+        every call builds new booleans or pattern objects from the hits, which takes most of the time of a repeated
+        search with is_boolean=False
         :param type: str: 'all', 'bullish' or 'bearish' (default: 'all')
         :param is_boolean: Boolean: True or False (default: True)
+        :param param: dict or None: pattern name -> parameters, missing patterns use Parameter.candle_stick_pattern
         :return: pd.DataFrame: DataFrame of candle stick pattern
         """
-        if type not in ['all', 'bullish', 'bearish']:
-            raise Exception('Invalid type: type must be "all", "bullish" or "bearish"')
-        pattern_dict = {
-            'bullish': {
-                'hammer': self.is_hammer,
-                'piercing': self.is_piercing,
-                'bullish_engulfing': self.is_bullish_engulfing,
-                'morning_star': self.is_morning_star,
-                'three_white_soldiers': self.is_three_white_soldiers,
-                'bullish_marubozu': self.is_bullish_marubozu,
-                'three_inside_up': self.is_three_inside_up,
-                'bullish_harami': self.is_bullish_harami,
-                'tweezer_bottom': self.is_tweezer_bottom,
-            },
-            'bearish': {
-                'hanging_man': self.is_hanging_man,
-                'dark_cloud': self.is_dark_cloud,
-                'bearish_engulfing': self.is_bearish_engulfing,
-                'evening_star': self.is_evening_star,
-                'three_black_crows': self.is_three_black_crows,
-                'bearish_marubozu': self.is_bearish_marubozu,
-                'three_inside_down': self.is_three_inside_down,
-                'bearish_harami': self.is_bearish_harami,
-                'tweezer_top': self.is_tweezer_top,
-            }
-        }
-        if type == 'all':
-            pattern_list = list(pattern_dict['bullish'].values()) + list(pattern_dict['bearish'].values())
-            columns = list(pattern_dict['bullish'].keys()) + list(pattern_dict['bearish'].keys())
-        elif type == 'bullish':
-            pattern_list = list(pattern_dict['bullish'].values())
-            columns = list(pattern_dict['bullish'].keys())
-        elif type == 'bearish':
-            pattern_list = list(pattern_dict['bearish'].values())
-            columns = list(pattern_dict['bearish'].keys())
-        result = []
-        for pattern in tqdm(pattern_list, desc='Finding Candle Stick Pattern'):
-            result.append(pattern(is_boolean=is_boolean))
-        result = pd.DataFrame(result).T
-        result.columns = columns
-        result.reset_index(drop=True, inplace=True)
-        return result
+        if param is None:
+            param = dict()
+        columns: list = pattern_names(type)
+        records: dict = {name: Parameter.compile(name, param.get(name)) for name in columns}
+        n: int = len(self.candle_stick_frame)
+        for record in records.values():
+            # same errors as the search of every bar in is_<name>
+            self._prepare_window(n, record.trend_window)
+        found_key: tuple = (*self._scaler_key(), tuple(record.digest() for record in records.values()))
+        previous: tuple or None = self._found.get(type)
+        if previous is not None and (previous[0] != found_key or previous[1] > n):
+            previous = None
+        if previous is not None and previous[1] == n:
+            return self._build(columns, records, previous[2], is_boolean)
+        key = None
+        if previous is None and self._cache is not None:
+            # the hits depend only on the candle sticks, the scaler and the compiled parameters, the pattern objects
+            # are rebuilt from them, so both modes share an entry of a few bits per bar and pattern
+            key = self._cache.key('find-hits', self.candle_stick_frame.fingerprint(), *self._scaler_key(), type,
+                                  *[record.digest() for record in records.values()])
+            cached = self._cache.get(key)
+            if cached is not None and cached['n'] == n:
+                masks: dict = self._unpack(cached)
+                self._found[type] = (found_key, n, masks)
+                return self._build(columns, records, masks, is_boolean)
+        masks: dict = dict()
+        for name in tqdm(columns, desc='Finding Candle Stick Pattern'):
+            masks[name] = self._search(name, records[name], None if previous is None else previous[1:])
+        self._found[type] = (found_key, n, masks)
+        if key is not None:
+            self._cache.set(key, self._pack(masks, records, n))
+        return self._build(columns, records, masks, is_boolean)
+
+    def _search(self, name: str, record: NamedTuple, previous: tuple or None = None) -> tuple:
+        """
+        method to search a pattern on every bar with pattern_kernel.evaluate, the hits equal is_<name>
+        :param name: str: pattern name, e.g. 'hammer'
+        :param record: NamedTuple: compiled parameters
+        :param previous: tuple or None: number of bars and masks of an earlier search on a shorter frame
+        :return: tuple: bool arrays of hits and of bars where the pattern is defined
+        """
+        window: int = record.trend_window
+        trends: np.ndarray = self._trend_series(window)[:-1]
+        start: int = 0 if previous is None else max(0, previous[0] - window - 2)
+        if start < 2:
+            return evaluate(name, self.candle_stick_array(), record, {window: trends})
+        # the frame was extended, with the scaler fixed only the bars whose trend window or candle sticks reach into
+        # the new bars can change, the two bars before start are the candle sticks of the patterns at start
+        frame: CandleStickFrame = self.candle_stick_frame
+        tail: CandleStickArray = CandleStickArray(frame.open[start - 2:], frame.high[start - 2:], frame.low[start - 2:],
+                                                  frame.close[start - 2:], self._scaler)
+        hits, defined = evaluate(name, tail, record, {window: trends[start - 2:]})
+        before_hits, before_defined = previous[1][name]
+        return (np.concatenate([before_hits[:start], hits[2:]]),
+                np.concatenate([before_defined[:start], defined[2:]]))
+
+    @staticmethod
+    def _pack(masks: dict, records: dict, n: int) -> dict:
+        """
+        method to compress the hits of find into bit masks for the cache
+        :param masks: dict: pattern name -> (hits, defined) bool arrays
+        :param records: dict: pattern name -> compiled parameters
+        :param n: int: number of bars
+        :return: dict: number of bars, records and per pattern the packed hits and bars where it is defined
+        """
+        return dict(n=n, records=records,
+                    masks={name: (np.packbits(hits), np.packbits(defined)) for name, (hits, defined) in masks.items()})
+
+    @staticmethod
+    def _unpack(cached: dict) -> dict:
+        """
+        method to restore the masks packed with _pack
+        :param cached: dict: cache entry
+        :return: dict: pattern name -> (hits, defined) bool arrays
+        """
+        return {name: (np.unpackbits(hits, count=cached['n']).astype(bool),
+                       np.unpackbits(defined, count=cached['n']).astype(bool))
+                for name, (hits, defined) in cached['masks'].items()}
+
+    def _build(self, columns: list, records: dict, masks: dict, is_boolean: bool) -> pd.DataFrame:
+        """
+        method to build the result of find from the hits of every pattern, new pattern objects on every call
+        :param columns: list: pattern names
+        :param records: dict: pattern name -> compiled parameters
+        :param masks: dict: pattern name -> (hits, defined) bool arrays
+        :param is_boolean: bool: booleans (True) or pattern objects (False)
+        :return: pd.DataFrame: True / False / None or pattern objects, one column per pattern
+        """
+        n: int = len(self.candle_stick_frame)
+        values: np.ndarray = np.empty((n, len(columns)), dtype=object)
+        candles: list = [] if is_boolean else list(self.candle_stick_frame)
+        # the candle sticks before the bar, like negative indices the first bars wrap around to the end of the frame
+        lagged: list = [candles, candles[-1:] + candles[:-1], candles[-2:] + candles[:-2]]
+        for j, name in enumerate(columns):
+            hits, defined = masks[name]
+            states: np.ndarray = np.where(defined, hits.astype(object), None)
+            if is_boolean:
+                values[:, j] = states
+                continue
+            direction: str = pattern_type(name)
+            _, length, offset = PATTERNS[direction][name]
+            trends: list = [None if trend != trend else trend for trend in
+                            shift(self._trend_series(records[name].trend_window)[:-1], offset).tolist()]
+            template: any = getattr(self, ''.join(word.capitalize() for word in name.split('_')))
+            enabled: bool = gc.isenabled()
+            # the templates hold no reference cycles, collecting while allocating them only costs time
+            gc.disable()
+            try:
+                values[:, j] = [template._searched(records[name], self._scaler, direction, trend,
+                                                   list(pattern)[::-1], state)
+                                for trend, state, *pattern in zip(trends, states.tolist(), *lagged[:length])]
+            finally:
+                if enabled:
+                    gc.enable()
+        return pd.DataFrame(values, columns=columns)
 
     def save_scaler(self, name: str, path: str) -> None:
         """
@@ -1205,5 +1509,9 @@ class CandleStickPattern:
         :return: None
         """
         self._scaler.load(path)
+        # the candle sticks and the results of find depend on the scaler
+        self._found.clear()
+        self._candle_stick_array = None
+        self._trends.clear()
         print('Scaler loaded')
         return None
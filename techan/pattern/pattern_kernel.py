@@ -0,0 +1,360 @@
+# import
+import numpy as np
+from itertools import product
+from typing import NamedTuple
+from techan.core.candle_stick_array import CandleStickArray
+from techan.indicator.kernel import float_dtype, shift
+from techan.indicator.trend import body_trend
+from techan.util.param import Parameter
+
+
+# vectorized counterparts of the CandleStickPattern classes
+# every rule gets the candle sticks at the bar (cs, lags give cs_m1 and cs_m2), the trend before the pattern and the
+# compiled parameters (see Parameter.compile), and returns the conditions of the pattern class as bool array
+def _hammer(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    return ((trend <= param.trend_strength) &
+            cs.is_bullish() &
+            (cs.body_position() >= param.cs_body_position) &
+            (cs.body_lower_shadow_ratio() >= param.body_ls_ratio) &
+            (cs.body_upper_shadow_ratio() <= param.body_us_ratio))
+
+
+def _piercing(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend <= param.trend_strength) &
+            cs.is_bullish() &
+            cs_m1.is_bearish() &
+            (cs.open < cs_m1.close) &
+            (cs_m1.open - cs_m1.body_size() / 2 < cs.close) & (cs.close < cs_m1.open))
+
+
+def _bullish_engulfing(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend <= param.trend_strength) &
+            cs.is_bullish() &
+            cs_m1.is_bearish() &
+            (cs.open < cs_m1.close) &
+            (cs.close > cs_m1.open))
+
+
+def _morning_star(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    cs_m2: CandleStickArray = cs.lag(2)
+    return ((trend <= param.trend_strength) &
+            cs_m2.is_bearish() &
+            (cs_m2.cs_body_ratio() >= param.cs_m2_body_ratio) &
+            (cs_m2.relative_size() >= param.cs_m2_relative_size) &
+            (cs_m1.cs_body_ratio() <= param.cs_m1_body_ratio) &
+            cs.is_bullish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size))
+
+
+def _three_white_soldiers(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    cs_m2: CandleStickArray = cs.lag(2)
+    return ((trend <= param.trend_strength) &
+            cs_m2.is_bullish() &
+            (cs_m2.cs_body_ratio() >= param.cs_m2_body_ratio) &
+            (cs_m2.relative_size() >= param.cs_m2_relative_size) &
+            cs_m1.is_bullish() &
+            (cs_m1.cs_body_ratio() >= param.cs_m1_body_ratio) &
+            (cs_m1.relative_size() >= param.cs_m1_relative_size) &
+            cs.is_bullish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size))
+
+
+def _bullish_marubozu(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    return ((trend <= param.trend_strength) &
+            cs.is_bullish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size))
+
+
+def _three_inside_up(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    cs_m2: CandleStickArray = cs.lag(2)
+    return ((trend <= param.trend_strength) &
+            cs_m2.is_bearish() &
+            (cs_m2.cs_body_ratio() >= param.cs_m2_body_ratio) &
+            (cs_m2.relative_size() >= param.cs_m2_relative_size) &
+            cs_m1.is_bullish() &
+            (cs_m1.open <= cs_m2.close) &
+            cs.is_bullish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size) &
+            (cs.open >= cs_m1.close))
+
+
+def _bullish_harami(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend <= param.trend_strength) &
+            cs_m1.is_bearish() &
+            (cs_m1.cs_body_ratio() >= param.cs_m1_body_ratio) &
+            (cs_m1.relative_size() >= param.cs_m1_relative_size) &
+            cs.is_bullish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() <= param.cs_relative_size) &
+            (cs.open >= cs_m1.close) &
+            (cs.close <= cs_m1.open))
+
+
+def _tweezer_bottom(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend <= param.trend_strength) &
+            cs_m1.is_bearish() &
+            (cs_m1.cs_body_ratio() >= param.cs_m1_body_ratio) &
+            (cs_m1.relative_size() >= param.cs_m1_relative_size) &
+            cs.is_bullish() &
+            (cs.cs_body_ratio() <= param.cs_body_ratio) &
+            (cs.body_position() <= param.cs_body_position))
+
+
+def _hanging_man(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    return ((trend >= param.trend_strength) &
+            cs.is_bearish() &
+            (cs.body_position() <= param.cs_body_position) &
+            (cs.body_lower_shadow_ratio() <= param.body_ls_ratio) &
+            (cs.body_upper_shadow_ratio() >= param.body_us_ratio))
+
+
+def _dark_cloud(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend >= param.trend_strength) &
+            cs.is_bearish() &
+            cs_m1.is_bullish() &
+            (cs.open > cs_m1.close) &
+            (cs_m1.open + cs_m1.body_size() / 2 > cs.close) & (cs.close > cs_m1.open))
+
+
+def _bearish_engulfing(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend >= param.trend_strength) &
+            cs.is_bearish() &
+            cs_m1.is_bullish() &
+            (cs.open > cs_m1.close) &
+            (cs.close < cs_m1.open))
+
+
+def _evening_star(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    cs_m2: CandleStickArray = cs.lag(2)
+    return ((trend >= param.trend_strength) &
+            cs_m2.is_bullish() &
+            (cs_m2.cs_body_ratio() >= param.cs_m2_body_ratio) &
+            (cs_m2.relative_size() >= param.cs_m2_relative_size) &
+            (cs_m1.cs_body_ratio() <= param.cs_m1_body_ratio) &
+            cs.is_bearish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size))
+
+
+def _three_black_crows(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    cs_m2: CandleStickArray = cs.lag(2)
+    return ((trend >= param.trend_strength) &
+            cs_m2.is_bearish() &
+            (cs_m2.cs_body_ratio() >= param.cs_m2_body_ratio) &
+            (cs_m2.relative_size() >= param.cs_m2_relative_size) &
+            cs_m1.is_bearish() &
+            (cs_m1.cs_body_ratio() >= param.cs_m1_body_ratio) &
+            (cs_m1.relative_size() >= param.cs_m1_relative_size) &
+            cs.is_bearish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size))
+
+
+def _bearish_marubozu(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    return ((trend >= param.trend_strength) &
+            cs.is_bearish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size))
+
+
+def _three_inside_down(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    cs_m2: CandleStickArray = cs.lag(2)
+    return ((trend >= param.trend_strength) &
+            cs_m2.is_bullish() &
+            (cs_m2.cs_body_ratio() >= param.cs_m2_body_ratio) &
+            (cs_m2.relative_size() >= param.cs_m2_relative_size) &
+            cs_m1.is_bearish() &
+            (cs_m1.open <= cs_m2.close) &
+            cs.is_bearish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() >= param.cs_relative_size) &
+            (cs.open >= cs_m1.close))
+
+
+def _bearish_harami(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend >= param.trend_strength) &
+            cs_m1.is_bullish() &
+            (cs_m1.cs_body_ratio() >= param.cs_m1_body_ratio) &
+            (cs_m1.relative_size() >= param.cs_m1_relative_size) &
+            cs.is_bearish() &
+            (cs.cs_body_ratio() >= param.cs_body_ratio) &
+            (cs.relative_size() <= param.cs_relative_size) &
+            (cs.close >= cs_m1.open) &
+            (cs.open <= cs_m1.close))
+
+
+def _tweezer_top(cs: CandleStickArray, trend: np.ndarray, param: NamedTuple) -> np.ndarray:
+    cs_m1: CandleStickArray = cs.lag(1)
+    return ((trend >= param.trend_strength) &
+            cs_m1.is_bullish() &
+            (cs_m1.cs_body_ratio() >= param.cs_m1_body_ratio) &
+            (cs_m1.relative_size() >= param.cs_m1_relative_size) &
+            cs.is_bearish() &
+            (cs.cs_body_ratio() <= param.cs_body_ratio) &
+            (cs.body_position() >= param.cs_body_position))
+
+
+# pattern -> (rule, number of candle sticks, bars between the pattern and the end of its trend window)
+PATTERNS: dict = {
+    'bullish': {
+        'hammer': (_hammer, 1, 0),
+        'piercing': (_piercing, 2, 1),
+        'bullish_engulfing': (_bullish_engulfing, 2, 1),
+        'morning_star': (_morning_star, 3, 2),
+        'three_white_soldiers': (_three_white_soldiers, 3, 2),
+        'bullish_marubozu': (_bullish_marubozu, 1, 0),
+        'three_inside_up': (_three_inside_up, 3, 2),
+        'bullish_harami': (_bullish_harami, 2, 1),
+        'tweezer_bottom': (_tweezer_bottom, 2, 0),
+    },
+    'bearish': {
+        'hanging_man': (_hanging_man, 1, 0),
+        'dark_cloud': (_dark_cloud, 2, 1),
+        'bearish_engulfing': (_bearish_engulfing, 2, 1),
+        'evening_star': (_evening_star, 3, 1),
+        'three_black_crows': (_three_black_crows, 3, 1),
+        'bearish_marubozu': (_bearish_marubozu, 1, 1),
+        'three_inside_down': (_three_inside_down, 3, 1),
+        'bearish_harami': (_bearish_harami, 2, 1),
+        'tweezer_top': (_tweezer_top, 2, 1),
+    }
+}
+
+
+def pattern_names(type: str = 'all') -> list:
+    """
+    function to list the patterns of a type in the column order of CandleStickPattern.find
+    :param type: str: 'all', 'bullish' or 'bearish'
+    :return: list: pattern names
+    """
+    if type not in ['all', 'bullish', 'bearish']:
+        raise Exception('Invalid type: type must be "all", "bullish" or "bearish"')
+    if type == 'all':
+        return list(PATTERNS['bullish']) + list(PATTERNS['bearish'])
+    return list(PATTERNS[type])
+
+
+def pattern_type(name: str) -> str:
+    """
+    function to look up the type of a pattern
+    :param name: str: pattern name, e.g. 'hammer'
+    :return: str: 'bullish' or 'bearish'
+    """
+    for type, patterns in PATTERNS.items():
+        if name in patterns:
+            return type
+    raise ValueError("unknown pattern {}".format(name))
+
+
+def evaluate(
+        name: str,
+        candle_stick_array: CandleStickArray,
+        param: dict or NamedTuple or None = None,
+        trends: dict = None
+) -> (np.ndarray, np.ndarray):
+    """
+    function to search a pattern on every bar at once
+    :param name: str: pattern name, e.g. 'hammer'
+    :param candle_stick_array: CandleStickArray: candle sticks, time is the last axis
+    :param param: dict, record or None: parameters of the pattern, compiled with Parameter.compile
+    :param trends: dict or None: trend_window -> body_trend, shared between calls
+    :return: tuple: bool array of hits, bool array of bars where the pattern is defined (None in CandleStickPattern)
+    """
+    type: str = pattern_type(name)
+    rule, length, offset = PATTERNS[type][name]
+    param = Parameter.compile(name, param)
+    if trends is None:
+        trends = dict()
+    window: int = param.trend_window
+    if window not in trends:
+        trends[window] = body_trend(candle_stick_array.open, candle_stick_array.close, window)
+    trend: np.ndarray = shift(trends[window], offset)
+    defined: np.ndarray = ~np.isnan(trend)
+    for steps in range(length):
+        defined &= shift(candle_stick_array.is_valid(), steps, False)
+    return rule(candle_stick_array, trend, param) & defined, defined
+
+
+def parameter_grid(name: str, grid: dict or list) -> list:
+    """
+    function to compile a grid of parameters of a pattern
+    :param name: str: pattern name, e.g. 'hammer'
+    :param grid: dict or list: parameter -> list of values (every combination is used, missing parameters are
+                 taken from Parameter.candle_stick_pattern) or list of parameters (dict or record)
+    :return: list: records of Parameter.compile, for a dict in the order of itertools.product
+    """
+    if isinstance(grid, dict):
+        keys: list = list(grid)
+        grid = [dict(zip(keys, values)) for values in product(*(grid[key] for key in keys))]
+    return [Parameter.compile(name, param) for param in grid]
+
+
+def sweep(
+        name: str,
+        candle_stick_array: CandleStickArray,
+        grid: dict or list,
+        trends: dict = None,
+        chunk_size: int = 2 ** 24
+) -> (np.ndarray, np.ndarray):
+    """
+    function to search a pattern with many parameter sets at once
+    the geometry and the trend of every trend_window are computed once, the thresholds of all parameter sets are
+    compared against them in one broadcast (in chunks of about chunk_size values)
+    :param name: str: pattern name, e.g. 'hammer'
+    :param candle_stick_array: CandleStickArray: candle sticks, time is the last axis
+    :param grid: dict or list: parameter sets, see parameter_grid
+    :param trends: dict or None: trend_window -> body_trend, shared between calls
+    :param chunk_size: int: number of values compared at once, bounds the memory of the intermediates
+    :return: tuple: bool array of hits and bool array of bars where the pattern is defined,
+                    both parameter sets x the shape of the candle sticks, rows in the order of parameter_grid
+    """
+    rule, length, offset = PATTERNS[pattern_type(name)][name]
+    records: list = parameter_grid(name, grid)
+    if trends is None:
+        trends = dict()
+    shape: tuple = np.shape(candle_stick_array.close)
+    hits: np.ndarray = np.zeros((len(records),) + shape, dtype=bool)
+    defined: np.ndarray = np.zeros((len(records),) + shape, dtype=bool)
+    if not records:
+        return hits, defined
+    valid: np.ndarray = np.ones(shape, dtype=bool)
+    for steps in range(length):
+        valid &= shift(candle_stick_array.is_valid(), steps, False)
+    # thresholds in the dtype of the series so that the comparisons match evaluate
+    dtype: np.dtype = float_dtype(candle_stick_array.close)
+    thresholds: np.ndarray = np.array(records, dtype=np.float64).astype(dtype)
+    record_type: type = type(records[0])
+    windows: np.ndarray = np.array([record.trend_window for record in records])
+    rows_per_chunk: int = max(1, chunk_size // max(1, int(np.prod(shape))))
+    for window in np.unique(windows).tolist():
+        if window not in trends:
+            trends[window] = body_trend(candle_stick_array.open, candle_stick_array.close, window)
+        trend: np.ndarray = shift(trends[window], offset)
+        window_defined: np.ndarray = ~np.isnan(trend) & valid
+        rows: np.ndarray = np.flatnonzero(windows == window)
+        defined[rows] = window_defined
+        for start in range(0, len(rows), rows_per_chunk):
+            chunk: np.ndarray = rows[start:start + rows_per_chunk]
+            # one record holding a column of thresholds per parameter that broadcasts against the bars
+            stacked: NamedTuple = record_type(*(
+                column.reshape((-1,) + (1,) * len(shape)) for column in thresholds[chunk].T
+            ))
+            hits[chunk] = rule(candle_stick_array, trend, stacked) & window_defined
+    return hits, defined
@@ -0,0 +1,235 @@
+# import
+import math
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from techan.core.candle_stick_array import CandleStickArray
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.graph import IndicatorGraph
+from techan.pattern.candle_stick_pattern import CandleStickPattern
+from techan.pattern.pattern_kernel import parameter_grid, pattern_type, sweep
+from techan.pattern.validation_kernel import outcome
+from techan.util.param import Parameter
+
+
+class _Evaluator:
+    def __init__(self, name: str, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 scaler: any, is_valid: np.ndarray, reward: np.ndarray):
+        # everything a worker needs to score candidates, the series derived from it are cached per number of bars
+        self.name: str = name
+        self.open: np.ndarray = open
+        self.high: np.ndarray = high
+        self.low: np.ndarray = low
+        self.close: np.ndarray = close
+        self.scaler: any = scaler
+        self.is_valid: np.ndarray = is_valid  # outcome of a hit at every bar: 1 valid, 0 invalid, nan unresolved
+        self.reward: np.ndarray = reward  # outcome in multiples of the risk: wl_ratio, -1 or nan
+        self._cache: dict = dict()  # bars -> (CandleStickArray, trends)
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state['_cache'] = dict()
+        return state
+
+    def score(self, records: list, bars: int) -> list:
+        """
+        method to score parameter sets on the first bars of the frame
+        :param records: list: parameter records of the pattern
+        :param bars: int: number of bars to search the pattern on
+        :return: list: (trades, hit_rate, expectancy) of every record
+        """
+        if bars not in self._cache:
+            self._cache[bars] = (CandleStickArray(self.open[:bars], self.high[:bars], self.low[:bars],
+                                                  self.close[:bars], self.scaler), dict())
+        candle_stick_array, trends = self._cache[bars]
+        resolved: np.ndarray = ~np.isnan(self.is_valid[:bars])
+        wins: np.ndarray = np.where(resolved, self.is_valid[:bars], 0.0)
+        reward: np.ndarray = np.where(resolved, self.reward[:bars], 0.0)
+        result: list = []
+        chunk: int = max(1, (1 << 22) // max(1, bars))
+        for start in range(0, len(records), chunk):
+            hits, _ = sweep(self.name, candle_stick_array, records[start:start + chunk], trends)
+            hits &= resolved
+            trades: np.ndarray = hits.sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                hit_rate: np.ndarray = (hits @ wins) / trades
+                expectancy: np.ndarray = (hits @ reward) / trades
+            result.extend(zip(trades.tolist(), hit_rate.tolist(), expectancy.tolist()))
+        return result
+
+
+_evaluator: _Evaluator or None = None  # evaluator of a worker process
+
+
+def _init_worker(evaluator: _Evaluator) -> None:
+    global _evaluator
+    _evaluator = evaluator
+
+
+def _score(records: list, bars: int) -> list:
+    return _evaluator.score(records, bars)
+
+
+class PatternOptimizer:
+    def __init__(
+            self,
+            candle_stick_frame: CandleStickFrame,
+            name: str,
+            space: dict,
+            mode: str = 'atr',
+            past_window: int = 10,
+            wl_ratio: float = 1.618,
+            metric: str = 'hit_rate',
+            min_trades: int = 10,
+            n_jobs: int or None = None,
+            scaler: any = None
+    ):
+        """
+        search of the parameters of a pattern scored by the outcomes of PatternValidator
+        :param candle_stick_frame: CandleStickFrame: candle sticks to search the pattern on
+        :param name: str: pattern name, e.g. 'hammer'
+        :param space: dict: parameter -> (low, high) to sample uniformly (ints for trend_window) or list of choices,
+                      missing parameters are taken from Parameter.candle_stick_pattern
+        :param mode: str: 'atr' or 'hl', see PatternValidator
+        :param past_window: int: see PatternValidator
+        :param wl_ratio: float: see PatternValidator
+        :param metric: str: 'hit_rate' (valid / resolved hits) or 'expectancy' (mean outcome in multiples of the risk)
+        :param min_trades: int: candidates with less resolved hits are ranked last
+        :param n_jobs: int or None: worker processes, 1 runs in this process, None uses all cpus
+        :param scaler: scaler or None: see CandleStickPattern
+        """
+        if metric not in ['hit_rate', 'expectancy']:
+            raise ValueError('Invalid metric: metric must be "hit_rate" or "expectancy"')
+        unknown: set = set(space) - set(Parameter.compile(name)._fields)
+        if unknown:
+            raise ValueError("unknown parameters {} for pattern {}".format(sorted(unknown), name))
+        self.candle_stick_frame: CandleStickFrame = candle_stick_frame
+        self.name: str = name
+        self.space: dict = space
+        self.metric: str = metric
+        self.min_trades: int = min_trades
+        self.n_jobs: int or None = n_jobs
+        self.result: pd.DataFrame or None = None
+        pattern: CandleStickPattern = CandleStickPattern(candle_stick_frame, scaler)
+        # the outcome of a hit does not depend on the parameters, every bar is validated once
+        validation: dict = outcome(candle_stick_frame.high, candle_stick_frame.low, candle_stick_frame.close,
+                                   pattern_type(name), mode, past_window, wl_ratio,
+                                   levels=IndicatorGraph.of(candle_stick_frame).levels(mode, past_window))
+        reward: np.ndarray = np.where(validation['is_valid'] == 1, validation['wl_ratio'], -1.0)
+        reward[np.isnan(validation['is_valid'])] = np.nan
+        self._evaluator: _Evaluator = _Evaluator(
+            name, candle_stick_frame.open, candle_stick_frame.high, candle_stick_frame.low, candle_stick_frame.close,
+            pattern._scaler, validation['is_valid'], reward
+        )
+
+    def __repr__(self):
+        return f'PatternOptimizer(name={self.name}, metric={self.metric}, space={self.space})'
+
+    def _sample(self, n_candidates: int, rng: np.random.Generator) -> list:
+        """
+        method to draw parameter sets from the space
+        :param n_candidates: int: number of parameter sets
+        :param rng: np.random.Generator: random generator
+        :return: list: parameter records
+        """
+        columns: dict = dict()
+        for key, values in self.space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if key == 'trend_window':
+                    columns[key] = rng.integers(low, high + 1, n_candidates).tolist()
+                else:
+                    columns[key] = rng.uniform(low, high, n_candidates).tolist()
+            else:
+                columns[key] = [values[i] for i in rng.integers(0, len(values), n_candidates)]
+        return parameter_grid(self.name, [{key: columns[key][i] for key in columns} for i in range(n_candidates)])
+
+    def _evaluate(self, records: list, bars: int, executor: ProcessPoolExecutor or None) -> list:
+        """
+        method to score parameter sets, split over the worker processes
+        :param records: list: parameter records
+        :param bars: int: number of bars to search the pattern on
+        :param executor: ProcessPoolExecutor or None: worker processes, None scores in this process
+        :return: list: (trades, hit_rate, expectancy) of every record
+        """
+        if executor is None:
+            return self._evaluator.score(records, bars)
+        chunk: int = math.ceil(len(records) / (self.n_jobs or os.cpu_count()))
+        futures: list = [executor.submit(_score, records[start:start + chunk], bars)
+                         for start in range(0, len(records), chunk)]
+        return [score for future in futures for score in future.result()]
+
+    def search(
+            self,
+            n_candidates: int = 100,
+            method: str = 'random',
+            eta: int = 3,
+            min_fraction: float = 1 / 9,
+            seed: int or None = None
+    ) -> pd.DataFrame:
+        """
+        method to search the parameter space
+        'random' scores every candidate on all bars, 'halving' (successive halving) scores all candidates on the first
+        min_fraction of the bars and keeps the best 1 / eta of them for eta times as many bars until all bars are used
+        :param n_candidates: int: number of parameter sets to draw
+        :param method: str: 'random' or 'halving'
+        :param eta: int: reduction factor of successive halving
+        :param min_fraction: float: fraction of the bars of the first round of successive halving
+        :param seed: int or None: seed of the random generator
+        :return: pd.DataFrame: ranked candidates, parameters, bars scored on, trades, hit_rate, expectancy and score
+        """
+        if method not in ['random', 'halving']:
+            raise ValueError('Invalid method: method must be "random" or "halving"')
+        n: int = len(self.candle_stick_frame)
+        records: list = self._sample(n_candidates, np.random.default_rng(seed))
+        if method == 'random':
+            fractions: list = [1.0]
+        else:
+            rounds: int = max(1, math.ceil(math.log(1 / min_fraction) / math.log(eta) - 1e-9) + 1)
+            fractions: list = [min(1.0, min_fraction * eta ** i) for i in range(rounds)]
+        rows: list = []
+        executor: ProcessPoolExecutor or None = None
+        if self.n_jobs != 1:
+            executor = ProcessPoolExecutor(self.n_jobs, initializer=_init_worker, initargs=(self._evaluator,))
+        try:
+            for i, fraction in enumerate(fractions):
+                bars: int = max(1, int(round(n * fraction)))
+                scores: list = self._evaluate(records, bars, executor)
+                ranked: list = []
+                for record, (trades, hit_rate, expectancy) in zip(records, scores):
+                    score: float = hit_rate if self.metric == 'hit_rate' else expectancy
+                    if trades < self.min_trades:
+                        score = np.nan
+                    ranked.append(dict(record._asdict(), bars=bars, trades=trades, hit_rate=hit_rate,
+                                       expectancy=expectancy, score=score, _record=record))
+                ranked.sort(key=lambda row: -np.inf if np.isnan(row['score']) else row['score'], reverse=True)
+                if i < len(fractions) - 1:
+                    keep: int = max(1, math.ceil(len(ranked) / eta))
+                    rows.extend(ranked[keep:])
+                    records = [row['_record'] for row in ranked[:keep]]
+                else:
+                    rows.extend(ranked)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        result: pd.DataFrame = pd.DataFrame(rows).drop(columns='_record')
+        # candidates that survived more rounds rank first
+        result = result.sort_values(['bars', 'score'], ascending=False, na_position='last', kind='stable')
+        self.result = result.reset_index(drop=True)
+        return self.result
+
+    @property
+    def best_param(self) -> dict:
+        """
+        forwards the parameters of the best candidate of the last search
+        :return: dict: parameters for CandleStickPattern.is_<name>(param=...) or find(param={name: ...})
+        """
+        if self.result is None or self.result.empty:
+            raise ValueError("search must be called before best_param")
+        if np.isnan(self.result['score'].iloc[0]):
+            raise ValueError("no candidate reached min_trades ({}), lower min_trades or search more bars".format(
+                self.min_trades))
+        fields: tuple = Parameter.compile(self.name)._fields
+        best: dict = self.result.iloc[0][list(fields)].to_dict()
+        return dict(Parameter.compile(self.name, best)._asdict())
@@ -1,7 +1,11 @@
 from techan.core.candle_stick_frame import CandleStickFrame
 from tqdm import tqdm
+import numpy as np
 import pandas as pd
 from techan.indicator.atr import ATR
+from techan.indicator.graph import IndicatorGraph
+from techan.pattern.validation_kernel import outcome
+from techan.util.cache import ResultCache
 
 
 class PatternValidator:
@@ -11,6 +15,7 @@ class PatternValidator:
                  mode: str = 'atr',
                  past_window: int = 10,
                  wl_ratio: float = 1.618,
+                 cache: ResultCache or str or None = None
                  ):
         self.candle_stick_frame: CandleStickFrame = candle_stick_frame
         self.pattern_df: pd.DataFrame = pattern_df
@@ -18,11 +23,12 @@ class PatternValidator:
         self.mode: str = mode  # 'atr' or 'hl'
         self.past_window: int = past_window  # how far into the past should the pattern be validated
         self.wl_ratio: float = wl_ratio  # stop loss ratio
+        self._cache: ResultCache or None = ResultCache(cache) if isinstance(cache, str) else cache  # None disables it
 
     def _get_past_high_low(self, index: int) -> (float, float) or (None, None):
-        window: list or None = self.candle_stick_frame[index-self.past_window+1:index+1] if index > self.past_window else None
+        window: CandleStickFrame or None = self.candle_stick_frame[index-self.past_window+1:index+1] if index > self.past_window else None
         if window is not None:
-            return max(candle_stick.high for candle_stick in window), min(candle_stick.low for candle_stick in window)
+            return float(window.high.max()), float(window.low.min())
         else:
             return None, None
 
@@ -99,7 +105,26 @@ class PatternValidator:
         return self._validate_hl(cs_pattern, last_high, last_low, index)
 
 
+    def _cache_key(self) -> str:
+        # the hits and the pattern types stand in for the parameters of find, the outcome depends on nothing else
+        hits: np.ndarray = np.array([[bool(cs_pattern.is_pattern) for cs_pattern in row]
+                                     for row in self.pattern_df.itertuples(index=False)], dtype=bool)
+        types: list = [next((cs_pattern.pattern_type for cs_pattern in self.pattern_df[column]), None)
+                       for column in self.pattern_df.columns]
+        return ResultCache.key('validate', self.candle_stick_frame.fingerprint(), list(self.pattern_df.columns), types,
+                               list(self.pattern_df.index), hits.tobytes(), hits.shape, self.mode, self.past_window,
+                               self.wl_ratio)
+
     def validate(self) -> pd.DataFrame:
+        key: str or None = None
+        if self._cache is not None:
+            key = self._cache_key()
+            cached: tuple or None = self._cache.get(key)
+            if cached is not None:
+                self.validation_df, stats = cached
+                for index, pattern, *values in stats:
+                    self._set_stats(self.pattern_df.loc[index, pattern], *values)
+                return self.validation_df
         atr_obj = ATR(self.candle_stick_frame, self.past_window)
         for index, row in tqdm(self.pattern_df.iterrows(), total=self.pattern_df.shape[0], desc='Validating Candle Stick Pattern'):
             for pattern in self.pattern_df.columns:
@@ -118,5 +143,40 @@ class PatternValidator:
                             self.validation_df.loc[index, pattern] = None
                 else:
                     self.validation_df.loc[index, pattern] = None
+        if key is not None:
+            # the stats set on the pattern objects are restored on a cache hit
+            stats: list = [(index, pattern, cs_pattern.is_valid, cs_pattern.tp, cs_pattern.sl, cs_pattern.wl_ratio,
+                            cs_pattern.v_iv_after)
+                           for pattern in self.pattern_df.columns
+                           for index, cs_pattern in self.pattern_df[pattern].items()
+                           if cs_pattern.is_pattern]
+            self._cache.set(key, (self.validation_df, stats))
         return self.validation_df
-    
\ No newline at end of file
+
+    def validate_grid(self, wl_ratio: list or np.ndarray, atr_multiplier: float or list or np.ndarray = 1.0) -> pd.DataFrame:
+        # outcome of every hit for many win / loss ratios (and ATR multiples of the stop loss in 'atr' mode) at once,
+        # every hit is scanned forward once for all barrier pairs, column (wl_ratio, 1.0) equals validate() with wl_ratio
+        wl_ratio, atr_multiplier = np.broadcast_arrays(np.atleast_1d(np.asarray(wl_ratio, dtype=np.float64)),
+                                                       np.atleast_1d(np.asarray(atr_multiplier, dtype=np.float64)))
+        hits: list = [(index, pattern, cs_pattern.pattern_type)
+                      for index, row in zip(self.pattern_df.index, self.pattern_df.itertuples(index=False))
+                      for pattern, cs_pattern in zip(self.pattern_df.columns, row) if cs_pattern.is_pattern]
+        is_valid: np.ndarray = np.full((len(hits), len(wl_ratio)), np.nan)
+        v_iv_after: np.ndarray = np.full((len(hits), len(wl_ratio)), len(self.candle_stick_frame), dtype=np.int64)
+        # the past high / low or ATR is shared with the other indicators of the frame
+        levels: tuple or np.ndarray = IndicatorGraph.of(self.candle_stick_frame).levels(self.mode, self.past_window)
+        for pattern_type in ['bullish', 'bearish']:
+            rows: np.ndarray = np.array([k for k, hit in enumerate(hits) if hit[2] == pattern_type], dtype=np.int64)
+            if len(rows):
+                result: dict = outcome(self.candle_stick_frame.high, self.candle_stick_frame.low,
+                                       self.candle_stick_frame.close, pattern_type, self.mode, self.past_window,
+                                       wl_ratio, np.array([hits[k][0] for k in rows]), atr_multiplier, levels)
+                is_valid[rows] = result['is_valid'].T
+                v_iv_after[rows] = result['v_iv_after'].T
+        index: pd.MultiIndex = pd.MultiIndex.from_tuples([hit[:2] for hit in hits], names=['index', 'pattern'])
+        columns: pd.MultiIndex = pd.MultiIndex.from_arrays([wl_ratio, atr_multiplier],
+                                                          names=['wl_ratio', 'atr_multiplier'])
+        # 1.0 valid, 0.0 invalid, nan unresolved or without data, the bars that decided are kept next to it
+        self.grid_v_iv_after: pd.DataFrame = pd.DataFrame(v_iv_after, index=index, columns=columns)
+        self.grid_df: pd.DataFrame = pd.DataFrame(is_valid, index=index, columns=columns)
+        return self.grid_df
@@ -0,0 +1,61 @@
+# import
+import numpy as np
+import pandas as pd
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.indicator.graph import IndicatorGraph
+from techan.pattern.validation_kernel import triple_barrier
+
+
+class TripleBarrierLabeler:
+    def __init__(
+            self,
+            candle_stick_frame: CandleStickFrame,
+            type: str = 'bullish',
+            mode: str = 'atr',
+            past_window: int = 10,
+            wl_ratio: float = 1.618,
+            max_holding: int or None = None,
+            chunk_size: int = 1 << 20
+    ):
+        """
+        labels of bars for ML datasets, take profit / stop loss barriers like PatternValidator plus a time barrier
+        :param candle_stick_frame: CandleStickFrame: candle sticks to label
+        :param type: str: 'bullish' (long position, take profit above) or 'bearish' (short position)
+        :param mode: str: 'atr' or 'hl', see PatternValidator
+        :param past_window: int: see PatternValidator
+        :param wl_ratio: float: see PatternValidator
+        :param max_holding: int or None: bars until the time barrier, None holds until a barrier is touched
+        :param chunk_size: int: bars labeled at once, bounds the memory of the sparse tables
+        """
+        if type not in ['bullish', 'bearish']:
+            raise ValueError('Invalid type: type must be "bullish" or "bearish"')
+        if mode not in ['atr', 'hl']:
+            raise ValueError('Invalid mode: mode must be "atr" or "hl"')
+        self.candle_stick_frame: CandleStickFrame = candle_stick_frame
+        self.type: str = type
+        self.mode: str = mode
+        self.past_window: int = past_window
+        self.wl_ratio: float = wl_ratio
+        self.max_holding: int or None = max_holding
+        self.chunk_size: int = chunk_size
+
+    def __repr__(self):
+        return (f'TripleBarrierLabeler(type={self.type}, mode={self.mode}, past_window={self.past_window}, '
+                f'wl_ratio={self.wl_ratio}, max_holding={self.max_holding})')
+
+    def label(self, start: np.ndarray or list or None = None) -> pd.DataFrame:
+        """
+        method to label bars, e.g. every bar or the bars of the hits of a pattern
+        :param start: np.ndarray, list or None: bars to label (default: every bar)
+        :return: pd.DataFrame: label (1.0 take profit, -1.0 stop loss, 0.0 time barrier, nan unresolved or without
+                               data), touch (bar that decided, len(frame) if unresolved), return of the position
+                               and the upper / lower barrier, indexed by the bar
+        """
+        if start is None:
+            start = np.arange(len(self.candle_stick_frame))
+        start = np.asarray(start, dtype=np.int64)
+        result: dict = triple_barrier(self.candle_stick_frame.high, self.candle_stick_frame.low,
+                                      self.candle_stick_frame.close, self.type, self.mode, self.past_window,
+                                      self.wl_ratio, self.max_holding, start, self.chunk_size,
+                                      IndicatorGraph.of(self.candle_stick_frame).levels(self.mode, self.past_window))
+        return pd.DataFrame(result, index=start)
@@ -0,0 +1,327 @@
+# import
+import numpy as np
+from techan.indicator.atr import average_true_range
+from techan.indicator.kernel import rolling_max, rolling_min
+
+
+# vectorized counterpart of PatternValidator, the outcome of a pattern depends only on the bar it ends at, its type
+# and the validation settings, not on the pattern parameters
+def past_high_low(high: np.ndarray, low: np.ndarray, past_window: int = 10) -> (np.ndarray, np.ndarray):
+    """
+    function to compute the highest high and the lowest low of the past_window bars up to and including every bar
+    like PatternValidator, bars with an index less than or equal to past_window are nan
+    :param high: np.ndarray: highs
+    :param low: np.ndarray: lows
+    :param past_window: int: number of bars
+    :return: tuple: past high, past low
+    """
+    if past_window < 1:
+        raise ValueError("past_window must be greater than 0")
+    past_high: np.ndarray = rolling_max(np.asarray(high, dtype=np.float64), past_window)
+    past_low: np.ndarray = rolling_min(np.asarray(low, dtype=np.float64), past_window)
+    # the validator starts one bar later than the rolling window
+    past_high[..., :past_window + 1] = np.nan
+    past_low[..., :past_window + 1] = np.nan
+    return past_high, past_low
+
+
+def barriers(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        type: str,
+        mode: str = 'atr',
+        past_window: int = 10,
+        wl_ratio: float or np.ndarray = 1.618,
+        atr_multiplier: float or np.ndarray = 1.0,
+        levels: tuple or np.ndarray or None = None
+) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    function to compute the take profit / stop loss barriers of a pattern ending at every bar like PatternValidator
+    :param high: np.ndarray: highs
+    :param low: np.ndarray: lows
+    :param close: np.ndarray: close prices
+    :param type: str: 'bullish' or 'bearish'
+    :param mode: str: 'atr' or 'hl'
+    :param past_window: int: bars of the ATR or of the past high / low
+    :param wl_ratio: float or np.ndarray: win / loss ratio, an array broadcasts against the bars, e.g. shape (r, 1)
+                     for r ratios
+    :param atr_multiplier: float or np.ndarray: multiple of the ATR of the stop loss ('atr' mode only), broadcasts
+                           like wl_ratio
+    :param levels: tuple, np.ndarray or None: past high / low ('hl') or ATR ('atr') of past_window bars computed
+                   before, e.g. by IndicatorGraph ('past_high_low' / 'atr'), None computes them
+    :return: tuple: upper barrier, lower barrier, realized win / loss ratio, nan where the validator has no data
+    """
+    if type not in ['bullish', 'bearish']:
+        raise ValueError('Invalid type: type must be "bullish" or "bearish"')
+    if mode == 'hl':
+        if np.any(np.asarray(atr_multiplier) != 1.0):
+            raise ValueError('atr_multiplier is only used in mode "atr"')
+        upper, lower = past_high_low(high, low, past_window) if levels is None else levels
+    elif mode == 'atr':
+        if levels is None:
+            levels = average_true_range(high, low, close, past_window)
+        atr: np.ndarray = np.array(levels, dtype=np.float64)
+        atr[..., :past_window] = np.nan
+        atr = atr * atr_multiplier
+        close = np.asarray(close, dtype=np.float64)
+        if type == 'bullish':
+            lower, upper = close - atr, close + atr * wl_ratio
+        else:
+            lower, upper = close - atr * wl_ratio, close + atr
+    else:
+        raise ValueError('Invalid mode: mode must be "atr" or "hl"')
+    close = np.asarray(close, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if type == 'bullish':
+            p_loss: np.ndarray = close - lower
+            p_win: np.ndarray = upper - close
+            loss_side: np.ndarray = p_loss >= p_win
+            upper = np.where(loss_side, close + p_loss * wl_ratio, upper)
+            lower = np.where(loss_side, lower, close - p_win / wl_ratio)
+            ratio: np.ndarray = (upper - close) / (close - lower)
+        else:
+            p_loss: np.ndarray = upper - close
+            p_win: np.ndarray = close - lower
+            loss_side: np.ndarray = p_loss >= p_win
+            lower = np.where(loss_side, close - p_loss * wl_ratio, lower)
+            upper = np.where(loss_side, upper, close + p_win / wl_ratio)
+            ratio: np.ndarray = (close - lower) / (upper - close)
+    return upper, lower, ratio
+
+
+def first_touch(
+        close: np.ndarray,
+        start: np.ndarray,
+        upper: np.ndarray,
+        lower: np.ndarray,
+        block: int = 64
+) -> (np.ndarray, np.ndarray):
+    """
+    function to scan forward from every start bar for the first close at or above upper or at or below lower
+    all pending starts are scanned at once over blocks of bars, the blocks double until every start is resolved
+    barriers with leading axes (e.g. one row per wl_ratio) are checked in the same pass over the bars of a start
+    :param close: np.ndarray: close prices
+    :param start: np.ndarray: int bars to scan from (the scan begins at the next bar)
+    :param upper: np.ndarray: upper barrier of every start, time is the last axis
+    :param lower: np.ndarray: lower barrier of every start, time is the last axis
+    :param block: int: bars of the first block
+    :return: tuple: index of the touching bar (len(close) if none or a barrier is nan),
+                    bool True where the upper barrier was touched (checked first on a bar like PatternValidator),
+                    both in the broadcast shape of upper and lower
+    """
+    close = np.asarray(close, dtype=np.float64)
+    start = np.asarray(start, dtype=np.int64)
+    upper, lower = np.broadcast_arrays(np.asarray(upper, dtype=np.float64), np.asarray(lower, dtype=np.float64))
+    shape: tuple = upper.shape
+    upper = upper.reshape(int(np.prod(shape[:-1])), len(start))
+    lower = lower.reshape(upper.shape)
+    n: int = len(close)
+    touch: np.ndarray = np.full(upper.shape, n, dtype=np.int64)
+    is_upper: np.ndarray = np.zeros(upper.shape, dtype=bool)
+    scanning: np.ndarray = ~np.isnan(upper) & ~np.isnan(lower) & (start + 1 < n)  # barriers not touched yet
+    pending: np.ndarray = np.flatnonzero(scanning.any(axis=0))
+    offset: int = 1
+    while pending.size:
+        steps: np.ndarray = offset + np.arange(block)
+        bars: np.ndarray = start[pending, None] + steps
+        inside: np.ndarray = bars < n
+        values: np.ndarray = close[np.minimum(bars, n - 1)]
+        hit_upper: np.ndarray = (values >= upper[:, pending, None]) & inside
+        hit: np.ndarray = (hit_upper | ((values <= lower[:, pending, None]) & inside)) & scanning[:, pending, None]
+        first: np.ndarray = hit.argmax(axis=-1)
+        barrier, column = np.nonzero(hit.any(axis=-1))
+        rows: np.ndarray = pending[column]
+        touch[barrier, rows] = start[rows] + offset + first[barrier, column]
+        is_upper[barrier, rows] = hit_upper[barrier, column, first[barrier, column]]
+        scanning[barrier, rows] = False
+        pending = pending[scanning[:, pending].any(axis=0) & (start[pending] + offset + block < n)]
+        offset += block
+        # the blocks are capped so that the comparisons of all pending starts stay within a few million elements
+        block = max(64, min(2 * block, 1 << 16, (1 << 22) // max(1, len(upper) * len(pending))))
+    return touch.reshape(shape), is_upper.reshape(shape)
+
+
+def outcome(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        type: str,
+        mode: str = 'atr',
+        past_window: int = 10,
+        wl_ratio: float or np.ndarray = 1.618,
+        start: np.ndarray or None = None,
+        atr_multiplier: float or np.ndarray = 1.0,
+        levels: tuple or np.ndarray or None = None
+) -> dict:
+    """
+    function to validate a pattern ending at the start bars like PatternValidator.validate
+    a vector of wl_ratio and / or atr_multiplier values (broadcast against each other) validates every start for all
+    of them in one forward scan, the results get a leading axis with one row per value
+    :param high: np.ndarray: highs
+    :param low: np.ndarray: lows
+    :param close: np.ndarray: close prices
+    :param type: str: 'bullish' or 'bearish'
+    :param mode: str: 'atr' or 'hl'
+    :param past_window: int: bars of the ATR or of the past high / low
+    :param wl_ratio: float or np.ndarray: win / loss ratio or 1d array of ratios
+    :param start: np.ndarray or None: int bars of the patterns (default: every bar)
+    :param atr_multiplier: float or np.ndarray: multiple of the ATR of the stop loss or 1d array ('atr' mode only)
+    :param levels: tuple, np.ndarray or None: see barriers
+    :return: dict: is_valid (1.0 valid, 0.0 invalid, nan unresolved or without data), v_iv_after (bar that decided,
+                   len(close) if unresolved), upper and lower barrier (tp and sl of PatternValidator) and wl_ratio
+                   of every start, shape (starts,) or (values, starts)
+    """
+    if start is None:
+        start = np.arange(len(close))
+    start = np.asarray(start, dtype=np.int64)
+    wl_ratio = np.asarray(wl_ratio, dtype=np.float64)
+    atr_multiplier = np.asarray(atr_multiplier, dtype=np.float64)
+    if wl_ratio.ndim > 1 or atr_multiplier.ndim > 1:
+        raise ValueError("wl_ratio and atr_multiplier must be float or 1d array")
+    if wl_ratio.ndim or atr_multiplier.ndim:
+        # one row of barriers per value, time stays the last axis
+        wl_ratio, atr_multiplier = (value.reshape(-1, 1) for value in np.broadcast_arrays(
+            np.atleast_1d(wl_ratio), np.atleast_1d(atr_multiplier)))
+    upper, lower, ratio = barriers(high, low, close, type, mode, past_window, wl_ratio, atr_multiplier, levels)
+    shape: tuple = np.broadcast_shapes(upper.shape, lower.shape, ratio.shape)
+    upper, lower, ratio = (np.broadcast_to(value, shape)[..., start] for value in (upper, lower, ratio))
+    touch, is_upper = first_touch(close, start, upper, lower)
+    is_valid: np.ndarray = np.where(is_upper, 1.0, 0.0) if type == 'bullish' else np.where(is_upper, 0.0, 1.0)
+    is_valid[touch >= len(close)] = np.nan
+    return dict(is_valid=is_valid, v_iv_after=touch, upper=upper, lower=lower, wl_ratio=ratio)
+
+
+def _extreme_levels(values: np.ndarray, levels: int, function: np.ufunc) -> list:
+    """
+    function to build a sparse table, level k holds the maximum (or minimum) of the 2 ** k values from every index on
+    :param values: np.ndarray: values
+    :param levels: int: number of levels
+    :param function: np.ufunc: np.maximum or np.minimum
+    :return: list: one array per level, level k is 2 ** k - 1 values shorter than values
+    """
+    table: list = [values]
+    for k in range(1, levels):
+        half: int = 1 << (k - 1)
+        table.append(function(table[-1][:-half], table[-1][half:]))
+    return table
+
+
+def _first_crossing(
+        table: list,
+        offset: int,
+        position: np.ndarray,
+        stop: np.ndarray,
+        barrier: np.ndarray,
+        above: bool
+) -> np.ndarray:
+    """
+    function to find the first bar in [position, stop) at or above (below) the barrier by binary lifting
+    every start jumps over the longest run of bars that does not cross, one level of the sparse table at a time
+    :param table: list: sparse table of the maxima (above) or minima of the bars from offset on
+    :param offset: int: bar of the first value of the table
+    :param position: np.ndarray: int first bar to check of every start
+    :param stop: np.ndarray: int bar after the last bar to check of every start
+    :param barrier: np.ndarray: barrier of every start (not nan)
+    :param above: bool: True searches close >= barrier, False close <= barrier
+    :return: np.ndarray: int first crossing bar, stop if none
+    """
+    position = position.copy()
+    for k in reversed(range(len(table))):
+        size: int = 1 << k
+        if not len(table[k]):
+            continue
+        # starts whose jump would pass stop read a clipped index and are masked out
+        extreme: np.ndarray = table[k][np.minimum(position - offset, len(table[k]) - 1)]
+        clear: np.ndarray = extreme < barrier if above else extreme > barrier
+        clear &= position + size <= stop
+        np.add(position, size, out=position, where=clear)
+    return position
+
+
+def triple_barrier(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        type: str,
+        mode: str = 'atr',
+        past_window: int = 10,
+        wl_ratio: float = 1.618,
+        max_holding: int or None = None,
+        start: np.ndarray or None = None,
+        chunk_size: int = 1 << 20,
+        levels: tuple or np.ndarray or None = None
+) -> dict:
+    """
+    function to label the start bars with the take profit / stop loss barriers of PatternValidator and a time barrier
+    with max_holding the first touch of every start is found by binary lifting over sparse tables of the close prices,
+    O(n log max_holding) in chunks of chunk_size bars, without it the bars are scanned until a barrier is touched
+    :param high: np.ndarray: highs
+    :param low: np.ndarray: lows
+    :param close: np.ndarray: close prices
+    :param type: str: 'bullish' (take profit is the upper barrier) or 'bearish'
+    :param mode: str: 'atr' or 'hl'
+    :param past_window: int: bars of the ATR or of the past high / low
+    :param wl_ratio: float: win / loss ratio
+    :param max_holding: int or None: bars after the start until the time barrier, None holds until the end
+    :param start: np.ndarray or None: int bars to label (default: every bar)
+    :param chunk_size: int: bars of the starts handled at once
+    :param levels: tuple, np.ndarray or None: see barriers
+    :return: dict: label (1.0 take profit, -1.0 stop loss, 0.0 time barrier, nan unresolved or without data),
+                   touch (bar of the barrier, len(close) if unresolved), return (of the position until touch) and
+                   the upper and lower barrier of every start
+    """
+    if max_holding is not None and max_holding < 1:
+        raise ValueError("max_holding must be greater than 0")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than 0")
+    n: int = len(close)
+    if start is None:
+        start = np.arange(n)
+    start = np.asarray(start, dtype=np.int64)
+    upper, lower, _ = barriers(high, low, close, type, mode, past_window, wl_ratio, levels=levels)
+    upper, lower = upper[start], lower[start]
+    close = np.asarray(close, dtype=np.float64)
+    if max_holding is None:
+        touch, is_upper = first_touch(close, start, upper, lower)
+        resolved: np.ndarray = touch < n
+        timeout: np.ndarray = np.zeros(len(start), dtype=bool)
+    else:
+        touch: np.ndarray = np.full(len(start), n, dtype=np.int64)
+        is_upper: np.ndarray = np.zeros(len(start), dtype=bool)
+        depth: int = max_holding.bit_length()
+        order: np.ndarray = np.argsort(start, kind='stable')
+        sorted_start: np.ndarray = start[order]
+        known: np.ndarray = ~np.isnan(upper) & ~np.isnan(lower)
+        for begin in range(0, n, chunk_size):
+            lo, hi = np.searchsorted(sorted_start, [begin, begin + chunk_size])
+            if lo == hi:
+                continue
+            rows: np.ndarray = order[lo:hi][known[order[lo:hi]]]
+            first: np.ndarray = start[rows] + 1
+            stop: np.ndarray = np.minimum(start[rows] + max_holding + 1, n)
+            # the bars any start of the chunk can reach
+            offset: int = begin + 1
+            values: np.ndarray = close[offset:min(n, begin + chunk_size + max_holding)]
+            touch_upper: np.ndarray = _first_crossing(_extreme_levels(values, depth, np.maximum), offset, first,
+                                                      stop, upper[rows], True)
+            touch_lower: np.ndarray = _first_crossing(_extreme_levels(values, depth, np.minimum), offset, first,
+                                                      stop, lower[rows], False)
+            touched: np.ndarray = np.minimum(touch_upper, touch_lower) < stop
+            touch[rows[touched]] = np.minimum(touch_upper, touch_lower)[touched]
+            # the upper barrier is checked first on a bar like PatternValidator
+            is_upper[rows[touched]] = (touch_upper <= touch_lower)[touched]
+        resolved: np.ndarray = touch < n
+        timeout: np.ndarray = ~resolved & ~np.isnan(upper) & ~np.isnan(lower) & (start + max_holding < n)
+        touch[timeout] = start[timeout] + max_holding
+    if type == 'bullish':
+        label: np.ndarray = np.where(is_upper, 1.0, -1.0)
+    else:
+        label: np.ndarray = np.where(is_upper, -1.0, 1.0)
+    label[timeout] = 0.0
+    label[~resolved & ~timeout] = np.nan
+    decided: np.ndarray = resolved | timeout
+    change: np.ndarray = np.full(len(start), np.nan)
+    change[decided] = close[touch[decided]] / close[start[decided]] - 1
+    return {'label': label, 'touch': touch, 'return': change if type == 'bullish' else -change, 'upper': upper,
+            'lower': lower}
@@ -0,0 +1,124 @@
+# import
+import os
+import pickle
+import tempfile
+from hashlib import blake2b
+
+
+class ResultCache:
+    def __init__(self, path: str, max_bytes: int = 1 << 30):
+        """
+        content addressed cache of results on disk, the least recently used entries are evicted above max_bytes
+        :param path: str: directory of the cache, created if missing
+        :param max_bytes: int: maximum size of all entries
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be positive not {}".format(max_bytes))
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def __repr__(self):
+        return f'ResultCache(path={self.path}, max_bytes={self.max_bytes})'
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._file(key))
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        method to hash the parts of a key, str and bytes are hashed as they are, everything else by its repr
+        :param parts: any: parts of the key, e.g. a frame fingerprint, a parameter digest and settings
+        :return: str: hex digest
+        """
+        digest: blake2b = blake2b(digest_size=20)
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            elif not isinstance(part, bytes):
+                part = repr(part).encode()
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _file(self, key: str) -> str:
+        """
+        method to forward the file of an entry
+        :param key: str: key of the entry
+        :return: str: path of the file
+        """
+        return os.path.join(self.path, key + '.pkl')
+
+    def get(self, key: str, default: any = None) -> any:
+        """
+        method to load an entry and mark it as recently used
+        :param key: str: key of the entry
+        :param default: any: value if the entry is missing
+        :return: any: cached value or default
+        """
+        file: str = self._file(key)
+        try:
+            with open(file, 'rb') as handle:
+                value: any = pickle.load(handle)
+        except Exception:
+            # missing, truncated or stale entries (e.g. pickled before a class was renamed or moved) are misses
+            return default
+        try:
+            os.utime(file)
+        except FileNotFoundError:
+            # evicted by another process after it was loaded
+            pass
+        return value
+
+    def set(self, key: str, value: any) -> None:
+        """
+        method to store an entry (atomically replacing an older one) and to evict the least recently used entries
+        :param key: str: key of the entry
+        :param value: any: picklable value
+        :return: None
+        """
+        handle, temporary = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._file(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        self._evict()
+        return None
+
+    def _evict(self) -> None:
+        """
+        method to remove the least recently used entries until the cache fits into max_bytes
+        :return: None
+        """
+        entries: list = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat: os.stat_result = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        size: int = sum(entry[1] for entry in entries)
+        for _, entry_size, file in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        return None
+
+    def clear(self) -> None:
+        """
+        method to remove all entries
+        :return: None
+        """
+        for entry in os.scandir(self.path):
+            if entry.name.endswith('.pkl'):
+                os.remove(entry.path)
+        return None
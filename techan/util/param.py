@@ -1,3 +1,8 @@
+# import
+from hashlib import sha256
+from typing import NamedTuple
+
+
 class Parameter:
     candle_stick_pattern: dict = dict(
         bullish=dict(
@@ -134,3 +139,90 @@ class Parameter:
         ),
     )
 
+    @classmethod
+    def compile(cls, name: str, param: dict or NamedTuple or None = None) -> NamedTuple:
+        """
+        method to compile the parameters of a pattern into a frozen, hashable record with typed fields
+        missing parameters are taken from candle_stick_pattern
+        :param name: str: pattern name, e.g. 'hammer'
+        :param param: dict, record or None: parameters of the pattern (default: candle_stick_pattern)
+        :return: NamedTuple: record of the pattern, e.g. HammerParameter(trend_window=10, trend_strength=-0.0, ...)
+        """
+        record: type = _record_type(name)
+        if isinstance(param, record):
+            return param
+        if param is None:
+            param = dict()
+        elif isinstance(param, tuple) and hasattr(param, '_asdict'):
+            param = param._asdict()
+        if not isinstance(param, dict):
+            raise TypeError("param must be dict, parameter record or None not {}".format(type(param)))
+        unknown: set = set(param) - set(record._fields)
+        if unknown:
+            raise ValueError("unknown parameters {} for pattern {}".format(sorted(unknown), name))
+        values: dict = dict(cls.candle_stick_pattern[_pattern_type(name)][name], **param)
+        if int(values['trend_window']) != values['trend_window'] or values['trend_window'] < 1:
+            raise ValueError("trend_window must be an int greater than 0 not {}".format(values['trend_window']))
+        return record(**{key: record.types[key](value) for key, value in values.items()})
+
+
+def _pattern_type(name: str) -> str:
+    """
+    function to look up the type of a pattern in Parameter.candle_stick_pattern
+    :param name: str: pattern name, e.g. 'hammer'
+    :return: str: 'bullish' or 'bearish'
+    """
+    for type, patterns in Parameter.candle_stick_pattern.items():
+        if name in patterns:
+            return type
+    raise ValueError("unknown pattern {}".format(name))
+
+
+def _digest(self) -> str:
+    """
+    method to hash a parameter record, stable across processes and sessions (unlike hash)
+    :return: str: hex digest
+    """
+    return sha256(repr((type(self).__name__, tuple(zip(self._fields, self)))).encode()).hexdigest()
+
+
+def _reduce(self) -> tuple:
+    """
+    method to pickle a parameter record (e.g. for process pools) by compiling it again
+    :return: tuple: Parameter.compile and its arguments
+    """
+    return Parameter.compile, (self.pattern, dict(self._asdict()))
+
+
+def _item(self, key: str or int or slice) -> any:
+    """
+    method to read a parameter by name like the dicts of candle_stick_pattern, positions and slices work like a tuple
+    :param key: str, int or slice: parameter name or position
+    :return: any: value
+    """
+    if isinstance(key, str):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+    return tuple.__getitem__(self, key)
+
+
+_record_types: dict = dict()  # pattern name -> record type, built on first use
+
+
+def _record_type(name: str) -> type:
+    """
+    function to build the record type of a pattern from the keys of its default parameters
+    trend_window is an int, every threshold a float
+    :param name: str: pattern name, e.g. 'hammer'
+    :return: type: NamedTuple type with the pattern name, the field types and a digest method
+    """
+    if name not in _record_types:
+        keys: list = list(Parameter.candle_stick_pattern[_pattern_type(name)][name])
+        class_name: str = ''.join(word.capitalize() for word in name.split('_')) + 'Parameter'
+        types: dict = {key: int if key == 'trend_window' else float for key in keys}
+        base: type = NamedTuple(class_name, list(types.items()))
+        _record_types[name] = type(class_name, (base,), {'__slots__': (), 'pattern': name, 'types': types,
+                                                         'digest': _digest, '__reduce__': _reduce,
+                                                         '__getitem__': _item})
+    return _record_types[name]
@@ -1,10 +1,46 @@
 import numpy as np
+from techan.indicator.kernel import rolling_max, rolling_min
+
+
+def _axis_row(axis: int or None, shape: tuple) -> np.ndarray:
+    """
+    function to store the axis of a scaler as a row of its saved statistics
+    :param axis: int or None: axis the scaler is fitted along
+    :param shape: tuple: shape of the statistics
+    :return: np.ndarray: axis (nan for None) broadcast to shape
+    """
+    return np.full(shape, np.nan if axis is None else axis, dtype=np.float64)
+
+
+def _load_axis(row: np.ndarray) -> int or None:
+    """
+    function to restore the axis of a scaler from a row written by _axis_row
+    :param row: np.ndarray: saved row
+    :return: int or None: axis
+    """
+    value: float = float(np.ravel(row)[0]) if np.size(row) else np.nan
+    return None if np.isnan(value) else int(value)
 
 
 class StandardScaler:
-    def __init__(self, values: np.ndarray or list):
-        self.mean: np.ndarray = np.mean(values)
-        self.std: np.ndarray = np.std(values)
+    def __init__(self, values: np.ndarray or list or None = None, axis: int or None = None):
+        # with an axis, one scaler per row / column is fitted (ignoring nan) that broadcasts against values
+        # without values the scaler starts empty and is fitted with partial_fit / update
+        self.axis: int or None = axis
+        if values is None:
+            self.count: np.ndarray = np.float64(0)
+            self.mean: np.ndarray = np.float64(np.nan)
+            self.std: np.ndarray = np.float64(np.nan)
+        elif axis is None:
+            self.count: np.ndarray = np.float64(np.size(values))
+            self.mean: np.ndarray = np.mean(values)
+            self.std: np.ndarray = np.std(values)
+        else:
+            self.count: np.ndarray = np.sum(~np.isnan(values), axis=axis, keepdims=True).astype(np.float64)
+            self.mean: np.ndarray = np.nanmean(values, axis=axis, keepdims=True)
+            self.std: np.ndarray = np.nanstd(values, axis=axis, keepdims=True)
+        # sum of squared differences from the mean (Welford), kept to combine the fit with new values
+        self._m2: np.ndarray = self.std ** 2 * self.count
 
     def __call__(self, value: float) -> float:
         return (value - self.mean) / self.std
@@ -12,29 +48,179 @@ class StandardScaler:
     def __repr__(self):
         return f'StandardScaler(mean={self.mean}, std={self.std})'
 
+    def transform(self, values: np.ndarray or list) -> np.ndarray:
+        """
+        method to scale a whole array at once
+        :param values: np.ndarray or list: values, broadcast against mean and std
+        :return: np.ndarray: scaled values, float32 for float32 values
+        """
+        values = np.asarray(values)
+        if values.dtype != np.float32:
+            values = values.astype(np.float64, copy=False)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ((values - self.mean) / self.std).astype(values.dtype, copy=False)
+
+    @classmethod
+    def _from_moments(cls, count: np.ndarray, mean: np.ndarray, m2: np.ndarray, axis: int or None = None):
+        """
+        method to create a scaler from its moments
+        :param count: np.ndarray: number of values
+        :param mean: np.ndarray: mean of the values
+        :param m2: np.ndarray: sum of squared differences from the mean
+        :param axis: int or None: axis the scaler is fitted along
+        :return: StandardScaler: scaler
+        """
+        scaler: StandardScaler = cls.__new__(cls)
+        scaler.axis = axis
+        scaler.count = count
+        scaler.mean = mean
+        scaler._m2 = m2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaler.std = np.sqrt(m2 / count)
+        return scaler
+
+    def partial_fit(self, values: np.ndarray or list):
+        """
+        method to update the fit with a batch of values (parallel Welford), nan is ignored
+        the result equals a fit on all values seen so far without keeping them
+        :param values: np.ndarray or list: new values, with an axis the other axes must match the fit
+        :return: StandardScaler: self
+        """
+        if np.any(np.isnan(self.count)):
+            raise ValueError("the scaler was loaded without a count and cannot be updated")
+        values = np.asarray(values, dtype=np.float64)
+        keepdims: bool = self.axis is not None
+        valid: np.ndarray = ~np.isnan(values)
+        count: np.ndarray = np.sum(valid, axis=self.axis, keepdims=keepdims).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean: np.ndarray = np.sum(np.where(valid, values, 0.0), axis=self.axis, keepdims=keepdims) / count
+            m2: np.ndarray = np.sum(np.where(valid, values - mean, 0.0) ** 2, axis=self.axis, keepdims=keepdims)
+            total: np.ndarray = self.count + count
+            delta: np.ndarray = mean - self.mean
+            combined_mean: np.ndarray = self.mean + delta * count / total
+            combined_m2: np.ndarray = self._m2 + m2 + delta ** 2 * self.count * count / total
+            self.mean = np.where(self.count == 0, mean, np.where(count == 0, self.mean, combined_mean))
+            self._m2 = np.where(self.count == 0, m2, np.where(count == 0, self._m2, combined_m2))
+            self.count = total
+            self.std = np.sqrt(self._m2 / self.count)
+        return self
+
+    def update(self, value: float):
+        """
+        method to update the fit with one value in O(1) (Welford), nan is ignored
+        :param value: float: new value, with an axis one value per fitted row / column
+        :return: StandardScaler: self
+        """
+        if self.axis is not None or np.ndim(value) > 0:
+            return self.partial_fit(np.expand_dims(value, self.axis if self.axis is not None else 0))
+        if np.isnan(self.count):
+            raise ValueError("the scaler was loaded without a count and cannot be updated")
+        if value != value:
+            return self
+        self.count = self.count + 1
+        if self.count == 1:
+            self.mean, self._m2 = np.float64(value), np.float64(0)
+        else:
+            delta: float = value - self.mean
+            self.mean = self.mean + delta / self.count
+            self._m2 = self._m2 + delta * (value - self.mean)
+        self.std = np.sqrt(self._m2 / self.count)
+        return self
+
+    @classmethod
+    def _accumulate(cls, values: np.ndarray or list, window: int or None, min_count: int):
+        """
+        method to fit a scaler on every bar over the bars before and including it
+        :param values: np.ndarray or list: values, time is the last axis
+        :param window: int or None: number of bars, None for all bars
+        :param min_count: int: minimum number of non nan values, bars with less are nan
+        :return: StandardScaler: scaler with one mean / std per bar
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid: np.ndarray = ~np.isnan(values)
+        # the sums are taken around the mean of every series to keep the sums of squares small
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reference: np.ndarray = np.sum(np.where(valid, values, 0.0), axis=-1, keepdims=True) / np.sum(
+                valid, axis=-1, keepdims=True)
+        reference = np.where(np.isnan(reference), 0.0, reference)
+        shifted: np.ndarray = np.where(valid, values - reference, 0.0)
+        sums: list = []
+        for series in (valid.astype(np.float64), shifted, shifted ** 2):
+            prefix: np.ndarray = np.cumsum(series, axis=-1)
+            if window is not None:
+                prefix[..., window:] = prefix[..., window:] - prefix[..., :-window]
+            sums.append(prefix)
+        count, sum_1, sum_2 = sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean: np.ndarray = sum_1 / count
+            m2: np.ndarray = np.maximum(sum_2 - sum_1 * mean, 0.0)
+        incomplete: np.ndarray = count < min_count
+        mean = np.where(incomplete, np.nan, mean + reference)
+        m2 = np.where(incomplete, np.nan, m2)
+        return cls._from_moments(count, mean, m2, axis=-1)
+
+    @classmethod
+    def expanding(cls, values: np.ndarray or list, min_count: int = 1):
+        """
+        method to fit a scaler on every bar with all bars up to and including it (no look ahead)
+        :param values: np.ndarray or list: values, time is the last axis
+        :param min_count: int: minimum number of non nan values, bars with less are nan
+        :return: StandardScaler: scaler with one mean / std per bar that broadcasts against values
+        """
+        return cls._accumulate(values, None, min_count)
+
+    @classmethod
+    def rolling(cls, values: np.ndarray or list, window: int, min_count: int or None = None):
+        """
+        method to fit a scaler on every bar with the last window bars up to and including it (no look ahead)
+        :param values: np.ndarray or list: values, time is the last axis
+        :param window: int: number of bars
+        :param min_count: int or None: minimum number of non nan values, bars with less are nan (default: window)
+        :return: StandardScaler: scaler with one mean / std per bar that broadcasts against values
+        """
+        if window < 1:
+            raise ValueError("window must be greater than 0")
+        return cls._accumulate(values, window, window if min_count is None else min_count)
+
     def save(self, name: str, path: str) -> None:
         """
-        Saves the mean and std to a file
+        Saves the mean, std, count and axis to a file
         :param name: filename
         :param path: path to save
         :return: None
         """
-        np.save(f'{path}/{name}.npy', np.array([self.mean, self.std]))
+        shape: tuple = np.shape(self.mean)
+        np.save(f'{path}/{name}.npy', np.array([self.mean, self.std, np.broadcast_to(self.count, shape),
+                                                _axis_row(self.axis, shape)]))
 
     def load(self, path: str) -> None:
         """
-        Loads the mean and std from a file
+        Loads the mean, std, count and axis (if saved) from a file
         :param path: path to load from
         :return: None
         """
-        self.mean, self.std = np.load(path)
+        values: np.ndarray = np.load(path)
+        self.mean, self.std = values[0], values[1]
+        self.count = values[2] if len(values) > 2 else np.full(np.shape(self.mean), np.nan)
+        self.axis = _load_axis(values[3]) if len(values) > 3 else None
+        self._m2 = self.std ** 2 * self.count
         return None
 
 
 class MinMaxScaler:
-    def __init__(self, values: np.ndarray or list):
-        self.min: np.ndarray = np.min(values)
-        self.max: np.ndarray = np.max(values)
+    def __init__(self, values: np.ndarray or list or None = None, axis: int or None = None):
+        # with an axis, one scaler per row / column is fitted (ignoring nan) that broadcasts against values
+        # without values the scaler starts empty and is fitted with partial_fit / update
+        self.axis: int or None = axis
+        if values is None:
+            self.min: np.ndarray = np.float64(np.nan)
+            self.max: np.ndarray = np.float64(np.nan)
+        elif axis is None:
+            self.min: np.ndarray = np.min(values)
+            self.max: np.ndarray = np.max(values)
+        else:
+            self.min: np.ndarray = np.nanmin(values, axis=axis, keepdims=True)
+            self.max: np.ndarray = np.nanmax(values, axis=axis, keepdims=True)
 
     def __call__(self, value: float) -> float:
         return (value - self.min) / (self.max - self.min)
@@ -42,21 +228,103 @@ class MinMaxScaler:
     def __repr__(self):
         return f'MinMaxScaler(min={self.min}, max={self.max})'
 
+    def transform(self, values: np.ndarray or list) -> np.ndarray:
+        """
+        method to scale a whole array at once
+        :param values: np.ndarray or list: values, broadcast against min and max
+        :return: np.ndarray: scaled values, float32 for float32 values
+        """
+        values = np.asarray(values)
+        if values.dtype != np.float32:
+            values = values.astype(np.float64, copy=False)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ((values - self.min) / (self.max - self.min)).astype(values.dtype, copy=False)
+
+    @classmethod
+    def _from_bounds(cls, min: np.ndarray, max: np.ndarray, axis: int or None = None):
+        """
+        method to create a scaler from its bounds
+        :param min: np.ndarray: minimum
+        :param max: np.ndarray: maximum
+        :param axis: int or None: axis the scaler is fitted along
+        :return: MinMaxScaler: scaler
+        """
+        scaler: MinMaxScaler = cls.__new__(cls)
+        scaler.axis = axis
+        scaler.min = min
+        scaler.max = max
+        return scaler
+
+    def partial_fit(self, values: np.ndarray or list):
+        """
+        method to update the fit with a batch of values, nan is ignored
+        :param values: np.ndarray or list: new values, with an axis the other axes must match the fit
+        :return: MinMaxScaler: self
+        """
+        values = np.asarray(values, dtype=np.float64)
+        keepdims: bool = self.axis is not None
+        if values.size:
+            self.min = np.fmin(self.min, np.fmin.reduce(values, axis=self.axis, keepdims=keepdims))
+            self.max = np.fmax(self.max, np.fmax.reduce(values, axis=self.axis, keepdims=keepdims))
+        return self
+
+    def update(self, value: float):
+        """
+        method to update the fit with one value in O(1), nan is ignored
+        :param value: float: new value, with an axis one value per fitted row / column
+        :return: MinMaxScaler: self
+        """
+        if self.axis is not None or np.ndim(value) > 0:
+            return self.partial_fit(np.expand_dims(value, self.axis if self.axis is not None else 0))
+        self.min = np.fmin(self.min, value)
+        self.max = np.fmax(self.max, value)
+        return self
+
+    @classmethod
+    def expanding(cls, values: np.ndarray or list):
+        """
+        method to fit a scaler on every bar with all bars up to and including it (no look ahead)
+        :param values: np.ndarray or list: values, time is the last axis
+        :return: MinMaxScaler: scaler with one min / max per bar that broadcasts against values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        return cls._from_bounds(np.fmin.accumulate(values, axis=-1), np.fmax.accumulate(values, axis=-1), axis=-1)
+
+    @classmethod
+    def rolling(cls, values: np.ndarray or list, window: int):
+        """
+        method to fit a scaler on every bar with the last window bars up to and including it (no look ahead)
+        the first window - 1 bars are nan
+        :param values: np.ndarray or list: values, time is the last axis
+        :param window: int: number of bars
+        :return: MinMaxScaler: scaler with one min / max per bar that broadcasts against values
+        """
+        if window < 1:
+            raise ValueError("window must be greater than 0")
+        values = np.asarray(values, dtype=np.float64)
+        min: np.ndarray = rolling_min(values, window, skipna=True)
+        max: np.ndarray = rolling_max(values, window, skipna=True)
+        return cls._from_bounds(min, max, axis=-1)
+
     def save(self, name: str, path: str) -> None:
         """
-        Saves the min and max to a file
+        Saves the min, max and axis to a file
         :param name: filename
         :param path: path to save
         :return: None
         """
-        np.save(f'{path}/{name}.npy', np.array([self.min, self.max]))
+        shape: tuple = np.broadcast_shapes(np.shape(self.min), np.shape(self.max))
+        np.save(f'{path}/{name}.npy', np.array([np.broadcast_to(self.min, shape), np.broadcast_to(self.max, shape),
+                                                _axis_row(self.axis, shape)]))
         return None
 
     def load(self, path) -> None:
         """
-        Loads the min and max from a file
+        Loads the min, max and axis (if saved) from a file
         :param path: path to load from
         :return: None
         """
-        self.min, self.max = np.load(path)
+        values: np.ndarray = np.load(path)
+        self.min, self.max = values[0], values[1]
+        self.axis = _load_axis(values[2]) if len(values) > 2 else None
         return None
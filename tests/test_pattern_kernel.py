@@ -0,0 +1,61 @@
+# import
+import numpy as np
+import pytest
+from benchmarks.synthetic import synthetic_frame, synthetic_ohlcv
+from techan.core.candle_stick_frame import CandleStickFrame
+from techan.pattern.candle_stick_pattern import CandleStickPattern
+from techan.pattern.pattern_kernel import evaluate, pattern_names, sweep
+from techan.util.param import Parameter
+
+
+def _gapped(n: int, seed: int, dtype: type) -> CandleStickFrame:
+    # synthetic bars open at the previous close, the gaps of piercing, engulfing, ... need opens of their own
+    data: dict = synthetic_ohlcv(n, seed)
+    data['open'][1:] = np.round(data['close'][:-1] * np.exp(np.random.default_rng(seed).normal(0, 0.004, n - 1)), 2)
+    data['high'] = np.maximum(data['high'], data['open'])
+    data['low'] = np.minimum(data['low'], data['open'])
+    return CandleStickFrame(data['date_time'], data['open'], data['high'], data['low'], data['close'], data['volume'],
+                            data['spread'], dtype=dtype)
+
+
+@pytest.fixture(scope='module', params=[(synthetic_frame, np.float64), (synthetic_frame, np.float32),
+                                        (_gapped, np.float64), (_gapped, np.float32)],
+                ids=['float64', 'float32', 'gapped-float64', 'gapped-float32'])
+def pattern(request) -> CandleStickPattern:
+    frame, dtype = request.param
+    return CandleStickPattern(frame(2000, seed=1, dtype=dtype))
+
+
+def _states(pattern: CandleStickPattern, name: str, param: dict or None = None) -> (np.ndarray, np.ndarray):
+    # True / False / None of the object path as hits and bars where the pattern is defined
+    states: list = getattr(pattern, 'is_' + name)(param=param, is_boolean=True)
+    return np.array([state is True for state in states]), np.array([state is not None for state in states])
+
+
+@pytest.mark.parametrize('name', pattern_names())
+@pytest.mark.parametrize('param', [None, {'trend_window': 3, 'trend_strength': 0.0}], ids=['default', 'window_3'])
+def test_evaluate_equals_is_pattern(pattern: CandleStickPattern, name: str, param: dict or None):
+    window: int = Parameter.compile(name, param).trend_window
+    hits, defined = evaluate(name, pattern.candle_stick_array(), param, {window: pattern._trend_series(window)[:-1]})
+    expected_hits, expected_defined = _states(pattern, name, param)
+    np.testing.assert_array_equal(defined, expected_defined)
+    np.testing.assert_array_equal(hits, expected_hits)
+
+
+@pytest.mark.parametrize('name', ['hammer', 'morning_star', 'tweezer_top'])
+def test_sweep_equals_evaluate(pattern: CandleStickPattern, name: str):
+    grid: dict = {'trend_window': [5, 10], 'trend_strength': [-0.5, 0.0, 0.5]}
+    hits, defined = sweep(name, pattern.candle_stick_array(), grid)
+    for row, (window, strength) in enumerate([(5, -0.5), (5, 0.0), (5, 0.5), (10, -0.5), (10, 0.0), (10, 0.5)]):
+        expected_hits, expected_defined = evaluate(name, pattern.candle_stick_array(),
+                                                   {'trend_window': window, 'trend_strength': strength})
+        np.testing.assert_array_equal(hits[row], expected_hits)
+        np.testing.assert_array_equal(defined[row], expected_defined)
+
+
+def test_find_equals_is_pattern(pattern: CandleStickPattern):
+    result = pattern.find(is_boolean=True)
+    for name in pattern_names():
+        expected_hits, expected_defined = _states(pattern, name)
+        np.testing.assert_array_equal(result[name].to_numpy() == True, expected_hits)  # noqa: E712
+        np.testing.assert_array_equal(result[name].notna().to_numpy(), expected_defined)
@@ -0,0 +1,122 @@
+# import
+import numpy as np
+import pytest
+from benchmarks.synthetic import synthetic_frame
+from techan.pattern.candle_stick_pattern import CandleStickPattern
+from techan.pattern.pattern_validator import PatternValidator
+from techan.pattern.validation_kernel import first_touch, outcome, triple_barrier
+
+
+@pytest.fixture(scope='module', params=[(np.float64, 'atr'), (np.float32, 'atr'), (np.float64, 'hl'),
+                                        (np.float32, 'hl')],
+                ids=['float64-atr', 'float32-atr', 'float64-hl', 'float32-hl'])
+def validated(request) -> tuple:
+    # frame, mode and the pattern objects of every hit after PatternValidator.validate
+    dtype, mode = request.param
+    frame = synthetic_frame(1500, seed=2, dtype=dtype)
+    result = CandleStickPattern(frame).find()
+    PatternValidator(frame, result, mode=mode, past_window=10, wl_ratio=1.618).validate()
+    hits: list = [(index, cs_pattern) for index, row in zip(result.index, result.itertuples(index=False))
+                  for cs_pattern in row if cs_pattern.is_pattern]
+    return frame, mode, hits
+
+
+def _expected(hits: list) -> dict:
+    # stats of the validator as arrays, nan where it had no past high / low or ATR
+    def value(stat: any) -> float:
+        return np.nan if stat is None else float(stat)
+    return dict(start=np.array([index for index, _ in hits], dtype=np.int64),
+                is_valid=np.array([value(cs_pattern.is_valid) for _, cs_pattern in hits]),
+                upper=np.array([value(cs_pattern.tp) for _, cs_pattern in hits]),
+                lower=np.array([value(cs_pattern.sl) for _, cs_pattern in hits]),
+                wl_ratio=np.array([value(cs_pattern.wl_ratio) for _, cs_pattern in hits]),
+                v_iv_after=np.array([-1 if cs_pattern.tp is None else cs_pattern.v_iv_after for _, cs_pattern in hits]))
+
+
+@pytest.mark.parametrize('type', ['bullish', 'bearish'])
+def test_outcome_equals_validator(validated: tuple, type: str):
+    frame, mode, hits = validated
+    expected: dict = _expected([hit for hit in hits if hit[1].pattern_type == type])
+    assert len(expected['start']) > 50
+    result: dict = outcome(frame.high, frame.low, frame.close, type, mode, 10, 1.618, expected['start'])
+    known: np.ndarray = ~np.isnan(expected['upper'])
+    assert known.sum() > 50
+    np.testing.assert_array_equal(result['is_valid'], expected['is_valid'])
+    np.testing.assert_array_equal(result['v_iv_after'][known], expected['v_iv_after'][known])
+    for name in ['upper', 'lower', 'wl_ratio']:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize('type', ['bullish', 'bearish'])
+def test_triple_barrier_equals_validator(validated: tuple, type: str):
+    frame, mode, hits = validated
+    expected: dict = _expected([hit for hit in hits if hit[1].pattern_type == type])
+    result: dict = triple_barrier(frame.high, frame.low, frame.close, type, mode, 10, 1.618, None, expected['start'])
+    known: np.ndarray = ~np.isnan(expected['upper'])
+    # label 1.0 is the take profit of either type, the validator calls it valid
+    np.testing.assert_array_equal(np.where(np.isnan(result['label']), np.nan, result['label'] == 1.0),
+                                  expected['is_valid'])
+    np.testing.assert_array_equal(result['touch'][known], expected['v_iv_after'][known])
+    np.testing.assert_allclose(result['upper'], expected['upper'], rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(result['lower'], expected['lower'], rtol=1e-12, equal_nan=True)
+
+
+def _scan(close: np.ndarray, start: int, upper: float, lower: float, stop: int) -> (int, bool):
+    # first bar after start up to stop with a close at or beyond a barrier, the upper barrier is checked first
+    for index in range(start + 1, stop):
+        if close[index] >= upper:
+            return index, True
+        if close[index] <= lower:
+            return index, False
+    return len(close), False
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32], ids=['float64', 'float32'])
+@pytest.mark.parametrize('type', ['bullish', 'bearish'])
+@pytest.mark.parametrize('chunk_size', [97, 1 << 20])
+def test_triple_barrier_max_holding_equals_scan(dtype: type, type: str, chunk_size: int):
+    frame = synthetic_frame(3000, seed=4, dtype=dtype)
+    close: np.ndarray = np.asarray(frame.close, dtype=np.float64)
+    max_holding: int = 50
+    result: dict = triple_barrier(frame.high, frame.low, frame.close, type, 'atr', 10, 1.0, max_holding,
+                                  chunk_size=chunk_size)
+    for start in range(len(close)):
+        upper, lower = result['upper'][start], result['lower'][start]
+        if np.isnan(upper) or np.isnan(lower):
+            assert np.isnan(result['label'][start])
+            continue
+        touch, is_upper = _scan(close, start, upper, lower, min(start + max_holding + 1, len(close)))
+        if touch < len(close):
+            assert result['touch'][start] == touch
+            assert result['label'][start] == (1.0 if is_upper == (type == 'bullish') else -1.0)
+        elif start + max_holding < len(close):
+            assert (result['touch'][start], result['label'][start]) == (start + max_holding, 0.0)
+        else:
+            assert np.isnan(result['label'][start])
+
+
+def test_first_touch_equals_scan():
+    close: np.ndarray = np.asarray(synthetic_frame(2000, seed=5).close, dtype=np.float64)
+    rng: np.random.Generator = np.random.default_rng(5)
+    start: np.ndarray = rng.integers(0, len(close), 300)
+    # two rows of barriers per start, a few of them unknown
+    upper: np.ndarray = close[start] * (1 + rng.uniform(0.001, 0.05, (2, len(start))))
+    lower: np.ndarray = close[start] * (1 - rng.uniform(0.001, 0.05, (2, len(start))))
+    upper[0, :10] = np.nan
+    touch, is_upper = first_touch(close, start, upper, lower, block=8)
+    for row in range(2):
+        for column, bar in enumerate(start):
+            expected: tuple = (len(close), False)
+            if not np.isnan(upper[row, column]):
+                expected = _scan(close, bar, upper[row, column], lower[row, column], len(close))
+            assert (touch[row, column], is_upper[row, column]) == expected
+
+
+def test_outcome_rows_equal_single_ratios():
+    frame = synthetic_frame(2000, seed=6)
+    ratios: list = [1.0, 1.618, 2.0]
+    rows: dict = outcome(frame.high, frame.low, frame.close, 'bullish', 'hl', 10, np.array(ratios))
+    for row, ratio in enumerate(ratios):
+        single: dict = outcome(frame.high, frame.low, frame.close, 'bullish', 'hl', 10, ratio)
+        for name in ['is_valid', 'v_iv_after', 'upper', 'lower', 'wl_ratio']:
+            np.testing.assert_array_equal(rows[name][row], single[name])